@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Сравнение отображения загрузки ядер: индикатор QProgressBar с таблицей
+стилей на каждое ядро (прежний способ) против тепловой карты CoreHeatmap
+
+Запуск из корня репозитория (без дисплея - с QT_QPA_PLATFORM=offscreen):
+    python benchmarks/bench_core_heatmap.py [--cores 256] [--frames 100]
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+BAR_STYLE = """
+    QProgressBar {
+        border: 1px solid #cccccc;
+        border-radius: 4px;
+        text-align: center;
+    }
+    QProgressBar::chunk {
+        background-color: %s;
+        border-radius: 3px;
+    }
+"""
+
+def make_samples(frames, cores):
+    """Отсчеты загрузки ядер"""
+    return [[random.uniform(0, 100) for _ in range(cores)] for _ in range(frames)]
+
+def update_bars(bars, core_usage):
+    """Прежний способ обновления: значение и таблица стилей каждого индикатора"""
+    for bar, usage in zip(bars, core_usage):
+        bar.setValue(int(usage))
+        bar.setStyleSheet(BAR_STYLE % ('#F44336' if usage >= 90 else '#FF9800' if usage >= 70 else '#4CAF50'))
+
+def measure(widget, update, samples):
+    """Миллисекунд на обновление с немедленной перерисовкой"""
+    start = time.perf_counter()
+    for core_usage in samples:
+        update(core_usage)
+        widget.repaint()
+    return (time.perf_counter() - start) / len(samples) * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--cores', type=int, default=256)
+    parser.add_argument('--frames', type=int, default=100)
+    args = parser.parse_args()
+
+    from PyQt5.QtWidgets import QApplication, QWidget, QVBoxLayout, QProgressBar, QScrollArea
+    from src.ui.widgets.core_heatmap import CoreHeatmap
+
+    app = QApplication(sys.argv)
+    samples = make_samples(args.frames, args.cores)
+
+    # Индикатор на каждое ядро в области прокрутки
+    container = QWidget()
+    layout = QVBoxLayout(container)
+    start = time.perf_counter()
+    bars = []
+    for _ in range(args.cores):
+        bar = QProgressBar()
+        bar.setRange(0, 100)
+        layout.addWidget(bar)
+        bars.append(bar)
+    scroll = QScrollArea()
+    scroll.setWidget(container)
+    scroll.resize(400, 600)
+    scroll.show()
+    app.processEvents()
+    bars_build = (time.perf_counter() - start) * 1000
+    bars_update = measure(scroll, lambda core_usage: update_bars(bars, core_usage), samples)
+    scroll.close()
+
+    start = time.perf_counter()
+    heatmap = CoreHeatmap("Загрузка ядер")
+    heatmap.resize(400, 600)
+    heatmap.show()
+    app.processEvents()
+    heatmap_build = (time.perf_counter() - start) * 1000
+    heatmap_update = measure(heatmap, heatmap.add_sample, samples)
+
+    print(f"Ядер: {args.cores}")
+    print(f"Индикаторы:     создание {bars_build:8.1f} мс, обновление {bars_update:8.2f} мс")
+    print(f"Тепловая карта: создание {heatmap_build:8.1f} мс, обновление {heatmap_update:8.2f} мс")
+    print(f"Ускорение обновления: {bars_update / heatmap_update:.0f}x")
+
+if __name__ == "__main__":
+    main()
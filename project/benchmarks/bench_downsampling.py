@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Прореживание рядов LTTB: реализация модуля downsampling против
+последовательной, а также сдвиг окна с кэшем уровней детализации
+
+Запуск из корня репозитория:
+    python benchmarks/bench_downsampling.py [--width 1000]
+"""
+
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.downsampling import lttb_indices, DownsamplingCache
+
+def lttb_sequential(x, y, threshold):
+    """Последовательное LTTB с циклом по корзинам"""
+    n = len(y)
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    selected = [0]
+    anchor = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        if i + 1 < threshold - 2:
+            next_x = x[edges[i + 1]:edges[i + 2]].mean()
+            next_y = y[edges[i + 1]:edges[i + 2]].mean()
+        else:
+            next_x, next_y = x[n - 1], y[n - 1]
+        area = np.abs((x[anchor] - next_x) * (y[start:end] - y[anchor])
+                      - (x[anchor] - x[start:end]) * (next_y - y[anchor]))
+        anchor = start + int(area.argmax())
+        selected.append(anchor)
+    selected.append(n - 1)
+    return np.array(selected)
+
+def best_time(function, repeat=3):
+    """Лучшее время из нескольких запусков, мс"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000, result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--width', type=int, default=1000, help='Ширина графика в пикселях')
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"{'Отсчетов':>10} {'Точек':>8} {'Последоват.':>12} {'Модуль':>9} {'Совпадение':>11}")
+    for n, threshold in ((86400, args.width), (86400 * 7, args.width), (1000000, args.width), (1000000, 100000)):
+        x = np.arange(n, dtype=np.float64)
+        y = np.cumsum(rng.normal(size=n))
+        sequential, expected = best_time(lambda: lttb_sequential(x, y, threshold), repeat=1)
+        vectorized, result = best_time(lambda: lttb_indices(x, y, threshold))
+        print(f"{n:>10} {threshold:>8} {sequential:>9.1f} мс {vectorized:>6.1f} мс {np.mean(result == expected):>10.1%}")
+
+    # Неделя посекундных отсчетов, в окне - сутки; окно сдвигается на час
+    n = 86400 * 7
+    x = np.arange(n, dtype=np.float64)
+    y = np.cumsum(rng.normal(size=n))
+    cache = DownsamplingCache()
+    first, _ = best_time(lambda: cache.downsample('cpu', x, y, args.width, 0, 86400), repeat=1)
+    start = time.perf_counter()
+    for hour in range(1, 24 * 6):
+        cache.downsample('cpu', x, y, args.width, hour * 3600, hour * 3600 + 86400)
+    panning = (time.perf_counter() - start) / (24 * 6 - 1) * 1000
+    print(f"Сдвиг окна: первое прореживание {first:.1f} мс, далее {panning:.3f} мс на сдвиг "
+          f"(попаданий в кэш: {cache.hits}, промахов: {cache.misses})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Сравнение задержки выявления проблем компонента: генерация ответа
+с поиском слов "problem"/"issue" против классификации серьезности
+одним прямым проходом модели
+
+Запуск из корня репозитория:
+    python benchmarks/bench_issue_detection.py [--runs 10] [--mode fp32]
+"""
+
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+COMPONENTS = {
+    'cpu': ({'temperature': 88.0, 'usage': 95.0, 'model': 'Intel Core i7-9700K'}, ['temperature', 'usage']),
+    'gpu': ({'temperature': 84.0, 'usage': 97.0, 'memory_usage_percent': 93.0}, ['temperature', 'usage']),
+    'memory': ({'usage_percent': 91.0, 'free': 1.2}, ['usage_percent'])
+}
+
+def median_ms(function, runs):
+    """Медиана времени выполнения функции, мс"""
+    latencies = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        function()
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    return latencies[len(latencies) // 2] * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--mode', choices=['fp32', 'int8'], default='fp32')
+    args = parser.parse_args()
+
+    from src.ai.llm_engine import LLMDiagnosticsEngine
+
+    engine = LLMDiagnosticsEngine({'ai_inference_mode': args.mode})
+    engine.load_model()
+    if not engine.model_loaded:
+        raise RuntimeError("Модель не загружена")
+
+    generate_prompts = [engine.build_prompt(component, info) for component, (info, _) in COMPONENTS.items()]
+    classify_prompts = [engine.build_classification_prompt(component, info, abnormal)
+                        for component, (info, abnormal) in COMPONENTS.items()]
+
+    # Режим "generate": отдельная генерация для каждого компонента
+    generate_ms = median_ms(lambda: [engine.generate_batch([prompt]) for prompt in generate_prompts], args.runs)
+    # Режим "classify": один прямой проход для всех компонентов
+    classify_ms = median_ms(lambda: engine.classify_batch(classify_prompts), args.runs)
+
+    print(f"Компонентов: {len(COMPONENTS)}, режим модели: {args.mode}")
+    print(f"Генерация:     {generate_ms:10.1f} мс")
+    print(f"Классификация: {classify_ms:10.1f} мс")
+    print(f"Ускорение: {generate_ms / classify_ms:.1f}x\n")
+
+    for (component, _), probabilities in zip(COMPONENTS.items(), engine.classify_batch(classify_prompts)):
+        print(f"{component:>8}: " + ", ".join(f"{label} {p:.2f}" for label, p in probabilities.items()))
+
+if __name__ == "__main__":
+    main()
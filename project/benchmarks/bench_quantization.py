@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Сравнение задержки и потребления памяти модели диагностики в режимах fp32 и int8
+
+Каждый режим запускается в отдельном процессе, чтобы измерение RSS
+не искажалось ранее загруженной моделью.
+
+Запуск из корня репозитория:
+    python benchmarks/bench_quantization.py [--runs 10] [--tokens 40]
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+PROMPT = "Analyze CPU health: Temperature 78.5°C, Usage 93.0%, Model Intel Core i7-9700K"
+
+def rss_mb():
+    """Текущий RSS процесса в МБ"""
+    import psutil
+    return psutil.Process().memory_info().rss / (1024 ** 2)
+
+def run_mode(mode, runs, tokens):
+    """Измерение одного режима инференса в текущем процессе"""
+    import torch
+    from src.ai.llm_engine import LLMDiagnosticsEngine
+
+    rss_before = rss_mb()
+    load_start = time.perf_counter()
+    engine = LLMDiagnosticsEngine({'ai_inference_mode': mode})
+    engine.load_model()
+    load_time = time.perf_counter() - load_start
+    if not engine.model_loaded:
+        raise RuntimeError("Модель не загружена")
+    rss_loaded = rss_mb()
+
+    inputs = engine.tokenizer(PROMPT, return_tensors="pt")
+    latencies = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        with torch.inference_mode():
+            engine.model.generate(
+                inputs["input_ids"],
+                attention_mask=inputs["attention_mask"],
+                max_new_tokens=tokens,
+                min_new_tokens=tokens,
+                do_sample=False,
+                pad_token_id=engine.tokenizer.eos_token_id
+            )
+        latencies.append(time.perf_counter() - start)
+
+    latencies.sort()
+    return {
+        'mode': mode,
+        'load_time_s': round(load_time, 2),
+        'rss_model_mb': round(rss_loaded - rss_before, 1),
+        'rss_peak_mb': round(rss_mb(), 1),
+        'latency_p50_ms': round(latencies[len(latencies) // 2] * 1000, 1),
+        'latency_max_ms': round(latencies[-1] * 1000, 1),
+        'ms_per_token': round(latencies[len(latencies) // 2] * 1000 / tokens, 2)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--tokens', type=int, default=40)
+    parser.add_argument('--mode', choices=['fp32', 'int8'], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    # Дочерний процесс: измерение одного режима
+    if args.mode:
+        print(json.dumps(run_mode(args.mode, args.runs, args.tokens)))
+        return
+
+    results = []
+    for mode in ('fp32', 'int8'):
+        output = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), '--mode', mode,
+             '--runs', str(args.runs), '--tokens', str(args.tokens)],
+            capture_output=True, text=True, check=True
+        ).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+
+    columns = ['mode', 'load_time_s', 'rss_model_mb', 'rss_peak_mb', 'latency_p50_ms', 'latency_max_ms', 'ms_per_token']
+    print(' | '.join(f"{column:>14}" for column in columns))
+    for result in results:
+        print(' | '.join(f"{result[column]:>14}" for column in columns))
+
+    fp32, int8 = results
+    print(f"\nУскорение int8: {fp32['latency_p50_ms'] / int8['latency_p50_ms']:.2f}x, "
+          f"экономия памяти: {fp32['rss_model_mb'] - int8['rss_model_mb']:.1f} МБ")
+
+if __name__ == "__main__":
+    main()
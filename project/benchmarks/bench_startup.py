@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Время запуска главного окна: импорт модуля, создание окна и первая
+отрисовка, а также время создания каждой вкладки при первом открытии
+
+Каждое измерение выполняется в отдельном процессе, чтобы модули не
+были уже загружены. Запуск из корня репозитория (без дисплея - с
+QT_QPA_PLATFORM=offscreen):
+    python benchmarks/bench_startup.py [--runs 5]
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+def measure_once(build_all):
+    """Одно измерение в текущем процессе; результат выводится в формате JSON"""
+    start = time.perf_counter()
+    from PyQt5.QtWidgets import QApplication
+    from PyQt5.QtCore import QEvent, QObject
+    app = QApplication(sys.argv)
+    qt_ready = time.perf_counter()
+
+    from src.ui.main_window import MainWindow, TABS
+    from src.utils.config import load_config
+    imported = time.perf_counter()
+
+    window = MainWindow(load_config(os.path.join(ROOT, 'config.json')))
+    constructed = time.perf_counter()
+
+    # Первая отрисовка: событие Paint вкладки, открытой при запуске
+    painted = []
+
+    class PaintFilter(QObject):
+        def eventFilter(self, obj, event):
+            if event.type() == QEvent.Paint and not painted:
+                painted.append(time.perf_counter())
+            return False
+
+    paint_filter = PaintFilter()
+    window.tab_widget.currentWidget().installEventFilter(paint_filter)
+    window.show()
+    while not painted and time.perf_counter() - constructed < 10:
+        app.processEvents()
+
+    result = {
+        'qt': qt_ready - start,
+        'import': imported - qt_ready,
+        'construct': constructed - imported,
+        'first_paint': (painted[0] if painted else time.perf_counter()) - start,
+        'tabs': {}
+    }
+
+    # Создание остальных вкладок (в прежней версии - при запуске)
+    if build_all:
+        for index, spec in enumerate(TABS[1:], start=1):
+            tab_start = time.perf_counter()
+            window.tab_widget.setCurrentIndex(index)
+            app.processEvents()
+            result['tabs'][spec[0]] = time.perf_counter() - tab_start
+
+    print(json.dumps(result))
+
+def run_child(build_all):
+    """Измерение в отдельном процессе"""
+    command = [sys.executable, os.path.abspath(__file__), '--child']
+    if build_all:
+        command.append('--all')
+    output = subprocess.run(command, cwd=ROOT, capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--all', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        measure_once(args.all)
+        return
+
+    runs = [run_child(build_all=False) for _ in range(args.runs)]
+    for key, title in (('qt', 'Инициализация Qt'), ('import', 'Импорт главного окна'),
+                       ('construct', 'Создание окна'), ('first_paint', 'До первой отрисовки')):
+        print(f"{title:24s} {statistics.median(run[key] for run in runs) * 1000:8.1f} мс")
+
+    tabs = run_child(build_all=True)['tabs']
+    print("Создание вкладок при первом открытии:")
+    for name, seconds in tabs.items():
+        print(f"  {name:22s} {seconds * 1000:8.1f} мс")
+    print(f"  {'всего':22s} {sum(tabs.values()) * 1000:8.1f} мс (не входит во время запуска)")
+
+if __name__ == "__main__":
+    main()
@@ -12,23 +12,22 @@ from PyQt5.QtWidgets import QApplication
 from PyQt5.QtCore import QCoreApplication, Qt
 from PyQt5.QtGui import QIcon, QFont
 
-# Импорт модулей приложения
-from src.ui.main_window import MainWindow
+# Импорт модулей приложения (главное окно импортируется после настройки логирования)
 from src.utils.logger import setup_logger
 from src.utils.config import load_config, create_default_config
 
 def main():
     """Основная функция запуска приложения"""
-    # Настройка логирования
-    logger = setup_logger()
-    logger.info("Запуск приложения PC Hardware Diagnostics AI")
-    
     # Загрузка конфигурации
     config_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'config.json')
     if not os.path.exists(config_path):
         create_default_config(config_path)
     config = load_config(config_path)
     
+    # Настройка логирования
+    logger = setup_logger(config)
+    logger.info("Запуск приложения PC Hardware Diagnostics AI")
+    
     # Настройка приложения Qt
     QCoreApplication.setAttribute(Qt.AA_EnableHighDpiScaling)
     QCoreApplication.setApplicationName("PC Hardware Diagnostics AI")
@@ -43,6 +42,7 @@ def main():
     app.setFont(font)
     
     # Создание и отображение главного окна
+    from src.ui.main_window import MainWindow
     main_window = MainWindow(config)
     main_window.show()
     
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Реестр бэкендов диагностики
+
+Каждый уровень детализации (настройка diagnostics_detail_level) задает
+конвейер бэкендов с известной стоимостью. Модули бэкендов импортируются
+только при первом использовании, поэтому уровни "Базовый" и "Стандартный"
+не загружают torch и transformers.
+"""
+
+import time
+import logging
+import importlib
+import threading
+from datetime import datetime
+
+from src.utils.cancellation import OperationCancelledError
+
+# Бэкенды диагностики: модуль, класс и ориентировочная стоимость одного запуска
+DIAGNOSTICS_BACKENDS = {
+    'rules': {
+        'module': 'src.ai.diagnostics_engine',
+        'class': 'DiagnosticsEngine',
+        'cost': 'менее 1 мс, без загрузки моделей'
+    },
+    'statistical': {
+        'module': 'src.ai.statistical_detector',
+        'class': 'StatisticalAnomalyDetector',
+        'cost': 'около 1 мс, без загрузки моделей'
+    },
+    'forecast': {
+        'module': 'src.ai.forecasting',
+        'class': 'ResourceForecaster',
+        'cost': 'менее 1 мс на все разделы; запись отсчетов в историю'
+    },
+    'llm': {
+        'module': 'src.ai.llm_engine',
+        'class': 'LLMDiagnosticsEngine',
+        'cost': 'загрузка модели при первом запуске, до ai_latency_budget_ms на компонент'
+    },
+    'multivariate': {
+        'module': 'src.ai.multivariate_detector',
+        'class': 'MultivariateAnomalyDetector',
+        'cost': 'запись снимка в историю и оценка за микросекунды; обучение в фоновом потоке'
+    },
+    'retrieval': {
+        'module': 'src.ai.retrieval',
+        'class': 'RetrievalRecommender',
+        'cost': 'около 1 мс: одно умножение матрицы корпуса на вектор запроса'
+    }
+}
+
+# Конвейеры бэкендов по уровням детализации
+DETAIL_LEVELS = {
+    'Базовый': ['rules'],
+    'Стандартный': ['rules', 'statistical', 'forecast'],
+    'Расширенный': ['rules', 'statistical', 'forecast', 'llm']
+}
+
+# Необязательные бэкенды: настройка, ее значение, включающее бэкенд,
+# значение настройки по умолчанию и уровни, к которым бэкенд добавляется
+# в конец конвейера
+OPTIONAL_BACKENDS = {
+    'multivariate': ('multivariate_anomaly_enabled', True, True, ['Стандартный', 'Расширенный']),
+    'retrieval': ('recommendation_mode', 'retrieval', 'retrieval', ['Стандартный', 'Расширенный'])
+}
+
+# Уровень детализации по умолчанию
+DEFAULT_DETAIL_LEVEL = 'Стандартный'
+
+def optional_setting(config, name):
+    """Значение настройки необязательного бэкенда name с учетом значения по умолчанию"""
+    setting, _, default, _ = OPTIONAL_BACKENDS[name]
+    return config.get(setting, default)
+
+class DiagnosticsPipeline:
+    """Конвейер диагностики, выбираемый по уровню детализации"""
+
+    def __init__(self, config=None):
+        """Инициализация конвейера диагностики"""
+        self.config = config if config is not None else {}
+        self.backends = {}
+        # Бэкенды создаются один раз, даже если диагностику запускают
+        # несколько потоков (например, отмененный и новый)
+        self.backends_lock = threading.Lock()
+        self.logger = logging.getLogger('diagnostics_pipeline')
+
+    @property
+    def detail_level(self):
+        """Текущий уровень детализации из конфигурации"""
+        level = self.config.get('diagnostics_detail_level', DEFAULT_DETAIL_LEVEL)
+        if level not in DETAIL_LEVELS:
+            self.logger.warning("Неизвестный уровень детализации: %s", level)
+            return DEFAULT_DETAIL_LEVEL
+        return level
+
+    def get_backend(self, name):
+        """Получение бэкенда с загрузкой модуля при первом обращении"""
+        with self.backends_lock:
+            if name not in self.backends:
+                spec = DIAGNOSTICS_BACKENDS[name]
+                start = time.perf_counter()
+                module = importlib.import_module(spec['module'])
+                self.backends[name] = getattr(module, spec['class'])(self.config)
+                self.logger.info("Бэкенд %s загружен за %.2f с", name, time.perf_counter() - start)
+            return self.backends[name]
+
+    def run_diagnostics(self, hardware_info, token_callback=None, components=None, cancel_token=None):
+        """Запуск диагностики бэкендами текущего уровня детализации
+
+        Первый бэкенд формирует результат, остальные дополняют его
+        через extend_diagnostics. components - необязательный список
+        компонентов, которыми ограничивается диагностика на всех этапах.
+        cancel_token - необязательный CancellationToken; при отмене
+        возбуждается OperationCancelledError. Время каждого этапа
+        записывается в diagnostics_result['stage_times_ms'].
+        """
+        level = self.detail_level
+        stages = DETAIL_LEVELS[level] + [name for name, (_, value, _, levels) in OPTIONAL_BACKENDS.items()
+                                         if level in levels and optional_setting(self.config, name) == value]
+        stage_times = {}
+
+        start = time.perf_counter()
+        diagnostics_result = self.get_backend(stages[0]).run_diagnostics(
+            hardware_info, token_callback=token_callback, components=components, cancel_token=cancel_token
+        )
+        stage_times[stages[0]] = round((time.perf_counter() - start) * 1000, 2)
+
+        for name in stages[1:]:
+            if cancel_token is not None:
+                cancel_token.raise_if_cancelled()
+            start = time.perf_counter()
+            try:
+                self.get_backend(name).extend_diagnostics(
+                    diagnostics_result, hardware_info, token_callback=token_callback, components=components,
+                    cancel_token=cancel_token
+                )
+            except OperationCancelledError:
+                raise
+            except Exception as e:
+                # Ошибка дополнительного этапа не отменяет результат предыдущих
+                self.logger.error("Ошибка бэкенда %s: %s", name, e)
+            stage_times[name] = round((time.perf_counter() - start) * 1000, 2)
+
+        # Сообщение об отсутствии проблем неактуально, если их нашли следующие этапы
+        issues = diagnostics_result.get('issues', [])
+        if len(issues) > 1:
+            diagnostics_result['issues'] = [issue for issue in issues
+                                         if not (issue['component'] == 'system' and issue['severity'] == 'info')]
+
+        diagnostics_result['detail_level'] = level
+        diagnostics_result['components'] = list(components) if components is not None else None
+        diagnostics_result['stage_times_ms'] = stage_times
+        diagnostics_result['timestamp'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        return diagnostics_result
+
+    def close(self):
+        """Освобождение ресурсов загруженных бэкендов"""
+        with self.backends_lock:
+            backends = list(self.backends.items())
+        for name, backend in backends:
+            if hasattr(backend, 'close'):
+                try:
+                    backend.close()
+                except Exception as e:
+                    self.logger.error("Ошибка при закрытии бэкенда %s: %s", name, e)
+
+def create_diagnostics_engine(config=None):
+    """Создание конвейера диагностики для настроек приложения"""
+    return DiagnosticsPipeline(config)
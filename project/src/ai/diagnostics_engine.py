@@ -2,7 +2,9 @@
 # -*- coding: utf-8 -*-
 
 """
-Модуль для диагностики системы с использованием ИИ
+Модуль для диагностики системы по правилам
+
+Используется бэкендом "rules" всех уровней детализации (см. backends.py).
 """
 
 import os
@@ -12,40 +14,52 @@ import random
 import time
 from datetime import datetime
 
+# Компоненты, поддерживаемые диагностикой
+COMPONENTS = ['cpu', 'gpu', 'memory', 'storage', 'network']
+
+# Признак критической проблемы в тексте проблемы компонента
+CRITICAL_MARKERS = {
+    'cpu': 'критически',
+    'gpu': 'критически',
+    'memory': 'критически',
+    'storage': 'критическое'
+}
+
 class DiagnosticsEngine:
-    """Класс для диагностики системы с использованием ИИ"""
+    """Класс для диагностики системы по правилам"""
     
-    def __init__(self):
+    def __init__(self, config=None):
         """Инициализация движка диагностики"""
+        self.config = config or {}
         self.model_loaded = False
         self.load_model()
         
     def load_model(self):
-        """Загрузка модели ИИ"""
-        # Имитация загрузки модели DigitalGPT-2
-        # В реальном приложении здесь будет код загрузки модели
-        time.sleep(0.5)  # Имитация времени загрузки
+        """Подготовка движка к работе"""
+        # Правила не требуют загрузки модели, анализ языковой моделью
+        # выполняет бэкенд "llm" (LLMDiagnosticsEngine)
         self.model_loaded = True
         
-    def run_diagnostics(self, hardware_info):
-        """Запуск диагностики системы"""
+    def run_diagnostics(self, hardware_info, token_callback=None, components=None, cancel_token=None):
+        """Запуск диагностики системы
+        
+        token_callback - необязательная функция (компонент, текст), которой
+        передаются найденные проблемы по мере их выявления. components -
+        необязательный список компонентов; остальные компоненты не читаются
+        и не анализируются. cancel_token - необязательный CancellationToken.
+        """
         if not self.model_loaded:
             self.load_model()
             
-        # Имитация работы ИИ для диагностики
-        # В реальном приложении здесь будет код использования модели DigitalGPT-2
-        
+        selected = [component for component in COMPONENTS if components is None or component in components]
+            
         # Создание результата диагностики
         diagnostics_result = {}
         
         # Оценка состояния компонентов
-        component_scores = {
-            'cpu': hardware_info.get('cpu', {}).get('health_score', 0),
-            'gpu': hardware_info.get('gpu', {}).get('health_score', 0),
-            'memory': hardware_info.get('memory', {}).get('health_score', 0),
-            'storage': hardware_info.get('storage', {}).get('health_score', 0),
-            'network': hardware_info.get('network', {}).get('health_score', 0)
-        }
+        component_scores = {}
+        for component in selected:
+            component_scores[component] = hardware_info.get(component, {}).get('health_score', 0)
         
         # Общая оценка системы
         overall_score = self.calculate_overall_score(component_scores)
@@ -53,55 +67,20 @@ class DiagnosticsEngine:
         # Сбор всех проблем
         issues = []
         
-        # Проблемы с процессором
-        cpu_issues = hardware_info.get('cpu', {}).get('issues', [])
-        for issue in cpu_issues:
-            severity = 'critical' if 'критически' in issue.lower() else 'warning'
-            issues.append({
-                'component': 'cpu',
-                'severity': severity,
-                'message': issue
-            })
-            
-        # Проблемы с видеокартой
-        gpu_issues = hardware_info.get('gpu', {}).get('issues', [])
-        for issue in gpu_issues:
-            severity = 'critical' if 'критически' in issue.lower() else 'warning'
-            issues.append({
-                'component': 'gpu',
-                'severity': severity,
-                'message': issue
-            })
-            
-        # Проблемы с памятью
-        memory_issues = hardware_info.get('memory', {}).get('issues', [])
-        for issue in memory_issues:
-            severity = 'critical' if 'критически' in issue.lower() else 'warning'
-            issues.append({
-                'component': 'memory',
-                'severity': severity,
-                'message': issue
-            })
-            
-        # Проблемы с хранилищем
-        storage_issues = hardware_info.get('storage', {}).get('issues', [])
-        for issue in storage_issues:
-            severity = 'critical' if 'критическое' in issue.lower() else 'warning'
-            issues.append({
-                'component': 'storage',
-                'severity': severity,
-                'message': issue
-            })
-            
-        # Проблемы с сетью
-        network_issues = hardware_info.get('network', {}).get('issues', [])
-        for issue in network_issues:
-            severity = 'warning'
-            issues.append({
-                'component': 'network',
-                'severity': severity,
-                'message': issue
-            })
+        for component in selected:
+            if cancel_token is not None:
+                cancel_token.raise_if_cancelled()
+            critical_marker = CRITICAL_MARKERS.get(component)
+            for issue in hardware_info.get(component, {}).get('issues', []):
+                severity = 'critical' if critical_marker and critical_marker in issue.lower() else 'warning'
+                issues.append({
+                    'component': component,
+                    'severity': severity,
+                    'message': issue,
+                    'source': 'threshold'
+                })
+                if token_callback is not None:
+                    token_callback(component, issue + '\n')
             
         # Если проблем не обнаружено, добавляем информационное сообщение
         if not issues:
@@ -113,71 +92,78 @@ class DiagnosticsEngine:
             
         # Детальная информация о компонентах
         details = {}
+        for component in selected:
+            details[component] = getattr(self, f'{component}_details')(hardware_info.get(component, {}))
+                
+        # Рекомендации
+        recommendations = hardware_info.get('recommendations', [])
         
-        # Детали о процессоре
-        details['cpu'] = {
-            'model': hardware_info.get('cpu', {}).get('model', 'Неизвестно'),
-            'cores': hardware_info.get('cpu', {}).get('cores', 0),
-            'threads': hardware_info.get('cpu', {}).get('threads', 0),
-            'frequency': f"{hardware_info.get('cpu', {}).get('frequency', 0)} ГГц",
-            'temperature': f"{hardware_info.get('cpu', {}).get('temperature', 0)}°C",
-            'usage': f"{hardware_info.get('cpu', {}).get('usage', 0)}%"
+        # Формирование результата диагностики
+        diagnostics_result['overall_score'] = overall_score
+        diagnostics_result['component_scores'] = component_scores
+        diagnostics_result['issues'] = issues
+        diagnostics_result['details'] = details
+        diagnostics_result['recommendations'] = recommendations
+        diagnostics_result['timestamp'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        
+        return diagnostics_result
+        
+    def cpu_details(self, cpu_info):
+        """Детали о процессоре"""
+        return {
+            'model': cpu_info.get('model', 'Неизвестно'),
+            'cores': cpu_info.get('cores', 0),
+            'threads': cpu_info.get('threads', 0),
+            'frequency': f"{cpu_info.get('frequency', 0)} ГГц",
+            'temperature': f"{cpu_info.get('temperature', 0)}°C",
+            'usage': f"{cpu_info.get('usage', 0)}%"
         }
         
-        # Детали о видеокарте
-        details['gpu'] = {
-            'model': hardware_info.get('gpu', {}).get('model', 'Неизвестно'),
-            'memory': f"{hardware_info.get('gpu', {}).get('memory', 0)} МБ",
-            'temperature': f"{hardware_info.get('gpu', {}).get('temperature', 0)}°C",
-            'usage': f"{hardware_info.get('gpu', {}).get('usage', 0)}%",
-            'memory_usage': f"{hardware_info.get('gpu', {}).get('memory_usage_percent', 0)}%"
+    def gpu_details(self, gpu_info):
+        """Детали о видеокарте"""
+        return {
+            'model': gpu_info.get('model', 'Неизвестно'),
+            'memory': f"{gpu_info.get('memory', 0)} МБ",
+            'temperature': f"{gpu_info.get('temperature', 0)}°C",
+            'usage': f"{gpu_info.get('usage', 0)}%",
+            'memory_usage': f"{gpu_info.get('memory_usage_percent', 0)}%"
         }
         
-        # Детали о памяти
-        details['memory'] = {
-            'total': f"{hardware_info.get('memory', {}).get('total', 0)} ГБ",
-            'used': f"{hardware_info.get('memory', {}).get('used', 0)} ГБ",
-            'free': f"{hardware_info.get('memory', {}).get('free', 0)} ГБ",
-            'usage': f"{hardware_info.get('memory', {}).get('usage_percent', 0)}%",
-            'type': hardware_info.get('memory', {}).get('type', 'Неизвестно'),
-            'frequency': f"{hardware_info.get('memory', {}).get('frequency', 0)} МГц"
+    def memory_details(self, memory_info):
+        """Детали о памяти"""
+        return {
+            'total': f"{memory_info.get('total', 0)} ГБ",
+            'used': f"{memory_info.get('used', 0)} ГБ",
+            'free': f"{memory_info.get('free', 0)} ГБ",
+            'usage': f"{memory_info.get('usage_percent', 0)}%",
+            'type': memory_info.get('type', 'Неизвестно'),
+            'frequency': f"{memory_info.get('frequency', 0)} МГц"
         }
         
-        # Детали о хранилище
-        details['storage'] = {}
-        disks = hardware_info.get('storage', {}).get('disks', [])
-        for i, disk in enumerate(disks):
-            details['storage'][f'disk{i+1}'] = {
+    def storage_details(self, storage_info):
+        """Детали о хранилище"""
+        details = {}
+        for i, disk in enumerate(storage_info.get('disks', [])):
+            details[f'disk{i+1}'] = {
                 'model': disk.get('model', 'Неизвестно'),
                 'size': f"{disk.get('size', 0)} ГБ",
                 'type': disk.get('type', 'Неизвестно'),
                 'status': disk.get('status', 'Неизвестно')
             }
-            
-        # Детали о сети
-        details['network'] = {}
-        interfaces = hardware_info.get('network', {}).get('interfaces', [])
-        for i, interface in enumerate(interfaces):
+        return details
+        
+    def network_details(self, network_info):
+        """Детали о сети"""
+        details = {}
+        for i, interface in enumerate(network_info.get('interfaces', [])):
             if interface.get('status') == 'Подключено':
-                details['network'][f'interface{i+1}'] = {
+                details[f'interface{i+1}'] = {
                     'name': interface.get('name', 'Неизвестно'),
                     'ip': interface.get('ip', 'Неизвестно'),
                     'type': interface.get('type', 'Неизвестно'),
                     'speed': f"{interface.get('speed', 0)} Мбит/с"
                 }
-                
-        # Рекомендации
-        recommendations = hardware_info.get('recommendations', [])
-        
-        # Формирование результата диагностики
-        diagnostics_result['overall_score'] = overall_score
-        diagnostics_result['component_scores'] = component_scores
-        diagnostics_result['issues'] = issues
-        diagnostics_result['details'] = details
-        diagnostics_result['recommendations'] = recommendations
-        diagnostics_result['timestamp'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        
-        return diagnostics_result
+        return details
         
     def calculate_overall_score(self, component_scores):
         """Расчет общей оценки системы"""
@@ -190,12 +176,17 @@ class DiagnosticsEngine:
             'network': 0.1
         }
         
-        # Расчет взвешенной суммы
+        # Расчет взвешенной суммы; при диагностике части компонентов
+        # веса нормируются на их сумму
         overall_score = 0
+        total_weight = 0
         for component, score in component_scores.items():
             overall_score += score * weights.get(component, 0)
+            total_weight += weights.get(component, 0)
             
-        return round(overall_score)
+        if total_weight == 0:
+            return 0
+        return round(overall_score / total_weight)
         
     def analyze_text(self, text):
         """Анализ текста с использованием ИИ"""
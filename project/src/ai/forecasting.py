@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Модуль прогноза исчерпания дискового пространства и оперативной памяти
+
+Для каждого ресурса компьютера (раздела диска и оперативной памяти)
+хранится окно последних отсчетов заполнения. Тренд оценивается
+методом Тейла-Сена (медиана попарных наклонов), устойчивым к разовым
+всплескам. Попарные наклоны пересчитываются инкрементально: новый отсчет
+добавляет только свои пары, а медианы считаются одной векторной операцией
+сразу для всех ресурсов.
+
+Используется бэкендом "forecast" (см. backends.py).
+"""
+
+import logging
+import threading
+import warnings
+
+import numpy as np
+
+from src.ai.history_store import MetricsHistoryStore, host_key
+
+# Число последних отсчетов ресурса, по которым оценивается тренд
+TREND_WINDOW = 64
+
+# Минимальное число отсчетов и охват по времени для прогноза
+MIN_FORECAST_SAMPLES = 5
+MIN_FORECAST_SPAN_SECONDS = 600
+
+# Пороги предупреждений по умолчанию
+DEFAULT_WARNING_DAYS = 7
+DEFAULT_CRITICAL_HOURS = 24
+
+# Ресурс оперативной памяти; разделы хранятся как "partition:<точка монтирования>"
+MEMORY_RESOURCE = 'memory'
+PARTITION_PREFIX = 'partition:'
+
+def format_duration(seconds):
+    """Длительность в часах или сутках для сообщений"""
+    if seconds < 48 * 3600:
+        return f"{seconds / 3600:.1f} ч"
+    return f"{seconds / 86400:.1f} сут"
+
+def format_bytes(value):
+    """Объем в ГБ или МБ для сообщений"""
+    if abs(value) >= 1024 ** 3:
+        return f"{value / 1024 ** 3:.2f} ГБ"
+    return f"{value / 1024 ** 2:.1f} МБ"
+
+class TrendState:
+    """Окна отсчетов и попарные наклоны всех ресурсов одного компьютера"""
+
+    def __init__(self, window=TREND_WINDOW):
+        self.window = window
+        self.resources = []
+        self.index = {}
+        self.t0 = None
+
+        # Строка - ресурс, столбец - ячейка кольцевого окна
+        self.t = np.full((0, window), np.nan)
+        self.y = np.full((0, window), np.nan)
+        self.slopes = np.full((0, window, window), np.nan)
+        self.total = np.zeros(0)
+        self.count = np.zeros(0, dtype=np.int64)
+
+    def _rows(self, resources):
+        """Номера строк ресурсов с добавлением новых"""
+        new = [resource for resource in resources if resource not in self.index]
+        if new:
+            for resource in new:
+                self.index[resource] = len(self.resources)
+                self.resources.append(resource)
+            n = len(new)
+            self.t = np.vstack([self.t, np.full((n, self.window), np.nan)])
+            self.y = np.vstack([self.y, np.full((n, self.window), np.nan)])
+            self.slopes = np.concatenate([self.slopes, np.full((n, self.window, self.window), np.nan)])
+            self.total = np.concatenate([self.total, np.zeros(n)])
+            self.count = np.concatenate([self.count, np.zeros(n, dtype=np.int64)])
+        return np.asarray([self.index[resource] for resource in resources], dtype=np.int64)
+
+    def append(self, ts, resources, used, total):
+        """Добавление одного отсчета для нескольких ресурсов
+
+        Вычисляются только наклоны пар с новым отсчетом - O(window)
+        на ресурс; вытесненный из окна отсчет заменяется вместе с его парами.
+        """
+        if not resources:
+            return
+        if self.t0 is None:
+            self.t0 = ts
+        rows = self._rows(resources)
+        slots = self.count[rows] % self.window
+        t = ts - self.t0
+        used = np.asarray(used, dtype=np.float64)
+
+        self.t[rows, slots] = t
+        self.y[rows, slots] = used
+        self.total[rows] = total
+        self.count[rows] += 1
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            dt = t - self.t[rows]
+            pair_slopes = (used[:, None] - self.y[rows]) / dt
+        pair_slopes[dt == 0] = np.nan
+        pair_slopes[np.arange(len(rows)), slots] = np.nan
+
+        self.slopes[rows, slots, :] = pair_slopes
+        self.slopes[rows, :, slots] = pair_slopes
+
+    def forecast(self):
+        """Прогноз для всех ресурсов за один проход
+
+        Возвращает массивы (наклон байт/с, текущий уровень по тренду,
+        секунды до заполнения или inf) в порядке self.resources.
+        """
+        n = len(self.resources)
+        with warnings.catch_warnings():
+            # Ресурсы без пар отсчетов дают NaN
+            warnings.simplefilter('ignore', RuntimeWarning)
+            slope = np.nanmedian(self.slopes.reshape(n, -1), axis=1)
+            intercept = np.nanmedian(self.y - slope[:, None] * self.t, axis=1)
+            now = np.nanmax(self.t, axis=1)
+            span = now - np.nanmin(self.t, axis=1)
+
+        level = intercept + slope * now
+        enough = (np.minimum(self.count, self.window) >= MIN_FORECAST_SAMPLES) & (span >= MIN_FORECAST_SPAN_SECONDS)
+        growing = enough & (slope > 0)
+
+        seconds_to_full = np.full(n, np.inf)
+        seconds_to_full[growing] = np.maximum(self.total[growing] - level[growing], 0) / slope[growing]
+        slope[~enough] = np.nan
+        return slope, level, seconds_to_full
+
+class ResourceForecaster:
+    """Класс для прогноза заполнения разделов и памяти"""
+
+    def __init__(self, config=None):
+        """Инициализация прогноза"""
+        self.config = config or {}
+        self.logger = logging.getLogger('forecasting')
+        self.store = MetricsHistoryStore(self.config.get('history_db_path') or None)
+        self.states = {}
+        self.last_scan_time = {}
+        self.lock = threading.Lock()
+
+    def get_state(self, host):
+        """Состояние трендов компьютера с загрузкой истории при первом обращении"""
+        state = self.states.get(host)
+        if state is None:
+            state = self.states[host] = TrendState()
+            for resource, rows in self.store.load_resources(host, TREND_WINDOW).items():
+                for ts, used, total in rows:
+                    state.append(ts, [resource], [used], total)
+        return state
+
+    def collect(self, hardware_info, components):
+        """Текущее заполнение ресурсов выбранных компонентов"""
+        resources = []
+        if components is None or 'memory' in components:
+            memory_info = hardware_info.get('memory', {})
+            if memory_info.get('total_bytes'):
+                resources.append(('memory', MEMORY_RESOURCE, memory_info['used_bytes'], memory_info['total_bytes']))
+        if components is None or 'storage' in components:
+            for partition in hardware_info.get('storage', {}).get('partitions', []):
+                if partition.get('total_bytes'):
+                    resources.append(('storage', PARTITION_PREFIX + partition['mountpoint'],
+                                      partition['used_bytes'], partition['total_bytes']))
+        return resources
+
+    def extend_diagnostics(self, diagnostics_result, hardware_info, token_callback=None, components=None,
+                           cancel_token=None):
+        """Дополнение результата диагностики прогнозами исчерпания ресурсов"""
+        if cancel_token is not None:
+            cancel_token.raise_if_cancelled()
+
+        host = host_key(hardware_info)
+        scan_time = hardware_info.get('scan_time')
+        resources = self.collect(hardware_info, components)
+
+        with self.lock:
+            state = self.get_state(host)
+
+            # Отсчет каждого ресурса учитывается один раз за сканирование
+            new = [item for item in resources if self.last_scan_time.get((host, item[1])) != scan_time]
+            if scan_time is not None and new:
+                self.store.append_resources(host, scan_time, [(resource, used, total) for _, resource, used, total in new])
+                state.append(scan_time, [item[1] for item in new], [item[2] for item in new],
+                             np.asarray([item[3] for item in new], dtype=np.float64))
+                for item in new:
+                    self.last_scan_time[(host, item[1])] = scan_time
+
+            if not state.resources:
+                diagnostics_result['forecasts'] = []
+                return
+            slope, level, seconds_to_full = state.forecast()
+            index = dict(state.index)
+
+        warning_seconds = self.config.get('forecast_warning_days', DEFAULT_WARNING_DAYS) * 86400
+        critical_seconds = self.config.get('forecast_critical_hours', DEFAULT_CRITICAL_HOURS) * 3600
+        forecasts = []
+
+        for component, resource, used, total in resources:
+            # Ресурс без отсчетов в истории (снимок без scan_time) не прогнозируется
+            row = index.get(resource)
+            if row is None or np.isnan(slope[row]):
+                continue
+            forecast = {
+                'component': component,
+                'resource': resource,
+                'used_bytes': used,
+                'total_bytes': total,
+                'growth_bytes_per_day': round(float(slope[row]) * 86400),
+                'seconds_to_full': None if np.isinf(seconds_to_full[row]) else round(float(seconds_to_full[row]))
+            }
+            forecasts.append(forecast)
+
+            if forecast['seconds_to_full'] is None or forecast['seconds_to_full'] > warning_seconds:
+                continue
+            if component == 'memory':
+                message = (f"Оперативная память будет исчерпана примерно через {format_duration(seconds_to_full[row])} "
+                           f"(рост {format_bytes(slope[row] * 3600)}/ч)")
+            else:
+                message = (f"Раздел {resource[len(PARTITION_PREFIX):]} заполнится примерно через "
+                           f"{format_duration(seconds_to_full[row])} (рост {format_bytes(slope[row] * 86400)}/сутки)")
+            diagnostics_result['issues'].append({
+                'component': component,
+                'severity': 'critical' if seconds_to_full[row] <= critical_seconds else 'warning',
+                'message': message,
+                'source': 'forecast',
+                'resource': resource,
+                'seconds_to_full': forecast['seconds_to_full']
+            })
+            if token_callback is not None:
+                token_callback(component, message + '\n')
+
+        diagnostics_result['forecasts'] = forecasts
+
+    def close(self):
+        """Закрытие истории"""
+        self.store.close()
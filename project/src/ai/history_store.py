@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Модуль для хранения истории показателей компьютеров
+
+Каждый снимок сканирования сохраняется как строка признаков в SQLite.
+История используется для обучения многомерной модели аномалий
+(см. multivariate_detector.py). Отдельно хранятся ряды заполнения
+ресурсов (разделов дисков и оперативной памяти) для прогноза их
+исчерпания (см. forecasting.py).
+"""
+
+import os
+import sqlite3
+import threading
+
+# Признаки снимка в порядке столбцов матрицы обучения
+FEATURE_NAMES = [
+    'cpu_usage',
+    'core_spread',
+    'memory_usage',
+    'swap_usage',
+    'disk_latency_ms',
+    'nic_error_percent'
+]
+
+# Путь к базе истории по умолчанию (относительно каталога приложения)
+DEFAULT_HISTORY_DB = os.path.join('data', 'metrics_history.db')
+
+def app_dir():
+    """Каталог приложения"""
+    return os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def host_key(hardware_info):
+    """Идентификатор компьютера, которому принадлежит снимок"""
+    system_info = hardware_info.get('system', {})
+    return system_info.get('machine_id') or system_info.get('hostname') or 'localhost'
+
+def extract_features(hardware_info):
+    """Вектор признаков снимка сканирования в порядке FEATURE_NAMES"""
+    cpu_info = hardware_info.get('cpu', {})
+    memory_info = hardware_info.get('memory', {})
+    core_usage = cpu_info.get('core_usage') or []
+
+    return [
+        float(cpu_info.get('usage', 0) or 0),
+        float(max(core_usage) - min(core_usage)) if core_usage else 0.0,
+        float(memory_info.get('usage_percent', 0) or 0),
+        float(memory_info.get('swap_percent', 0) or 0),
+        float(hardware_info.get('storage', {}).get('io_latency_ms', 0) or 0),
+        float(hardware_info.get('network', {}).get('error_percent', 0) or 0)
+    ]
+
+class MetricsHistoryStore:
+    """Хранилище снимков показателей в SQLite"""
+
+    def __init__(self, path=None):
+        """Открытие или создание базы истории"""
+        path = path or DEFAULT_HISTORY_DB
+        self.path = path if os.path.isabs(path) else os.path.join(app_dir(), path)
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self.lock = threading.Lock()
+
+        # Соединение используется из потоков диагностики и обучения
+        self.connection = sqlite3.connect(self.path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        columns = ", ".join(f"{name} REAL NOT NULL" for name in FEATURE_NAMES)
+        self.connection.execute(f"CREATE TABLE IF NOT EXISTS snapshots (host TEXT NOT NULL, ts REAL NOT NULL, {columns})")
+        self.connection.execute("CREATE INDEX IF NOT EXISTS snapshots_host_ts ON snapshots (host, ts)")
+        self.connection.execute("CREATE TABLE IF NOT EXISTS resource_usage (host TEXT NOT NULL, ts REAL NOT NULL, "
+                                "resource TEXT NOT NULL, used_bytes REAL NOT NULL, total_bytes REAL NOT NULL)")
+        self.connection.execute("CREATE INDEX IF NOT EXISTS resource_usage_host_resource_ts "
+                                "ON resource_usage (host, resource, ts)")
+        self.connection.commit()
+
+    def append(self, host, ts, features):
+        """Сохранение снимка признаков"""
+        placeholders = ", ".join("?" for _ in range(len(FEATURE_NAMES) + 2))
+        with self.lock:
+            self.connection.execute(f"INSERT INTO snapshots VALUES ({placeholders})", [host, ts] + list(features))
+            self.connection.commit()
+
+    def hosts(self):
+        """Список компьютеров, для которых есть история"""
+        with self.lock:
+            return [row[0] for row in self.connection.execute("SELECT DISTINCT host FROM snapshots")]
+
+    def count(self, host, since=None):
+        """Число снимков компьютера, сохраненных после момента since"""
+        with self.lock:
+            return self.connection.execute(
+                "SELECT COUNT(*) FROM snapshots WHERE host = ? AND ts > ?", (host, since or 0)
+            ).fetchone()[0]
+
+    def load(self, host, limit):
+        """Последние limit снимков компьютера в хронологическом порядке
+
+        Возвращает список пар (время, признаки).
+        """
+        columns = ", ".join(FEATURE_NAMES)
+        with self.lock:
+            rows = self.connection.execute(
+                f"SELECT ts, {columns} FROM snapshots WHERE host = ? ORDER BY ts DESC LIMIT ?", (host, limit)
+            ).fetchall()
+        rows.reverse()
+        return [(row[0], row[1:]) for row in rows]
+
+    def append_resources(self, host, ts, resources):
+        """Сохранение заполнения ресурсов: список (ресурс, занято байт, всего байт)"""
+        with self.lock:
+            self.connection.executemany(
+                "INSERT INTO resource_usage VALUES (?, ?, ?, ?, ?)",
+                [(host, ts, resource, used, total) for resource, used, total in resources]
+            )
+            self.connection.commit()
+
+    def load_resources(self, host, limit):
+        """Последние limit отсчетов каждого ресурса компьютера
+
+        Возвращает словарь {ресурс: [(время, занято байт, всего байт), ...]}
+        в хронологическом порядке.
+        """
+        series = {}
+        with self.lock:
+            resources = [row[0] for row in self.connection.execute(
+                "SELECT DISTINCT resource FROM resource_usage WHERE host = ?", (host,)
+            )]
+            for resource in resources:
+                rows = self.connection.execute(
+                    "SELECT ts, used_bytes, total_bytes FROM resource_usage WHERE host = ? AND resource = ? "
+                    "ORDER BY ts DESC LIMIT ?", (host, resource, limit)
+                ).fetchall()
+                rows.reverse()
+                series[resource] = rows
+        return series
+
+    def close(self):
+        """Закрытие базы истории"""
+        with self.lock:
+            self.connection.close()
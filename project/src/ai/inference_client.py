@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Клиент внешнего процесса инференса модели диагностики
+
+Модуль использует только стандартную библиотеку, поэтому процесс интерфейса,
+работающий через клиента, не загружает torch и transformers.
+
+Сообщения передаются в JSON (send_bytes/recv_bytes), а не в pickle, поэтому
+полученное сообщение не может выполнить код. Сокет и случайный ключ
+аутентификации хранятся в каталоге, доступном только текущему пользователю;
+TCP-адреса допускаются только на петлевом интерфейсе.
+"""
+
+import os
+import sys
+import json
+import stat
+import time
+import secrets
+import tempfile
+import ipaddress
+import itertools
+import threading
+import subprocess
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client
+
+# Каталог канала и ключа внутри XDG_RUNTIME_DIR (или временного каталога)
+RUNTIME_DIR_NAME = 'pc_hardware_diagnostics'
+
+# Имена сокета и файла ключа аутентификации в этом каталоге
+SOCKET_NAME = 'inference.sock'
+AUTHKEY_FILE = 'inference.key'
+
+# Длина случайного ключа аутентификации, байт
+AUTHKEY_BYTES = 32
+
+# Интервал опроса канала при ожидании ответа, с
+POLL_INTERVAL = 0.05
+
+class WorkerUnavailableError(Exception):
+    """Процесс инференса недоступен"""
+
+class RequestCancelledError(Exception):
+    """Запрос к процессу инференса был отменен"""
+
+def runtime_dir():
+    """Каталог канала и ключа, доступный только текущему пользователю"""
+    if sys.platform == 'win32':
+        path = os.path.join(os.environ.get('LOCALAPPDATA') or tempfile.gettempdir(), RUNTIME_DIR_NAME)
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    base = os.environ.get('XDG_RUNTIME_DIR')
+    if base and os.path.isdir(base):
+        path = os.path.join(base, RUNTIME_DIR_NAME)
+    else:
+        path = os.path.join(tempfile.gettempdir(), f"{RUNTIME_DIR_NAME}-{os.getuid()}")
+    try:
+        os.mkdir(path, 0o700)
+    except FileExistsError:
+        pass
+
+    # Каталог, созданный другим пользователем или доступный другим, не используется
+    info = os.lstat(path)
+    if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid() or info.st_mode & 0o077:
+        raise PermissionError(f"Небезопасный каталог канала инференса: {path}")
+    return path
+
+def default_worker_address():
+    """Адрес локального канала по умолчанию для текущей платформы"""
+    if sys.platform == 'win32':
+        return r'\\.\pipe\pc_hardware_diagnostics_inference'
+    return os.path.join(runtime_dir(), SOCKET_NAME)
+
+def is_unix_socket(address):
+    """Является ли адрес путем к Unix-сокету"""
+    return isinstance(address, str) and not address.startswith('\\\\')
+
+def check_loopback(host):
+    """Проверка, что TCP-адрес доступен только с локального компьютера"""
+    try:
+        loopback = host == 'localhost' or ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        loopback = False
+    if not loopback:
+        raise ValueError(f"Допускается только петлевой TCP-адрес процесса инференса: {host}")
+
+def parse_address(address):
+    """Преобразование адреса из конфигурации в формат multiprocessing.connection
+
+    Поддерживаются именованный канал Windows (\\\\.\\pipe\\имя), путь к Unix-сокету
+    и локальный TCP-адрес вида "127.0.0.1:5000". Адреса других хостов
+    отклоняются с ValueError.
+    """
+    if not address or address == 'auto':
+        return default_worker_address()
+    if isinstance(address, (list, tuple)):
+        check_loopback(address[0])
+        return (address[0], int(address[1]))
+    if address.startswith('\\\\') or os.path.isabs(address):
+        return address
+    host, _, port = address.rpartition(':')
+    if host and port.isdigit():
+        host = host.strip('[]')
+        check_loopback(host)
+        return (host, int(port))
+    return address
+
+def load_authkey():
+    """Ключ аутентификации текущего пользователя
+
+    Создается при первом обращении и сохраняется в файл с правами 0600.
+    Файл записывается целиком во временный файл и затем связывается с
+    постоянным именем, поэтому одновременно запущенные процессы получают
+    один и тот же ключ.
+    """
+    directory = runtime_dir()
+    path = os.path.join(directory, AUTHKEY_FILE)
+    if not os.path.exists(path):
+        fd, temporary_path = tempfile.mkstemp(dir=directory)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(secrets.token_hex(AUTHKEY_BYTES).encode('ascii'))
+            os.link(temporary_path, path)
+        except FileExistsError:
+            pass
+        finally:
+            os.unlink(temporary_path)
+    with open(path, 'rb') as f:
+        return f.read().strip()
+
+def encode_authkey(authkey):
+    """Приведение ключа аутентификации к bytes; без ключа - ключ пользователя"""
+    if not authkey:
+        return load_authkey()
+    return authkey.encode('utf-8') if isinstance(authkey, str) else authkey
+
+def send_message(connection, message):
+    """Отправка сообщения в формате JSON"""
+    connection.send_bytes(json.dumps(message, ensure_ascii=False).encode('utf-8'))
+
+def recv_message(connection):
+    """Получение сообщения в формате JSON; ValueError при некорректном сообщении"""
+    message = json.loads(connection.recv_bytes().decode('utf-8'))
+    if not isinstance(message, dict):
+        raise ValueError("Сообщение должно быть объектом JSON")
+    return message
+
+class InferenceClient:
+    """Клиент для отправки запросов генерации во внешний процесс инференса"""
+
+    def __init__(self, address, authkey=None, autostart=False, worker_config=None, connect_timeout=60.0):
+        self.address = parse_address(address)
+        self.authkey = encode_authkey(authkey)
+        self.autostart = autostart
+        self.worker_config = worker_config or {}
+        self.connect_timeout = connect_timeout
+        self.connection = None
+        self.worker_process = None
+        self._request_ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def connect(self):
+        """Подключение к процессу инференса с запуском при необходимости"""
+        if self.connection is not None:
+            return
+
+        try:
+            self.connection = Client(self.address, authkey=self.authkey)
+            return
+        except AuthenticationError as e:
+            # Канал занят процессом с другим ключом - запуск своего процесса не поможет
+            raise WorkerUnavailableError(f"Ошибка аутентификации процесса инференса: {str(e)}")
+        except (OSError, EOFError) as e:
+            if not self.autostart:
+                raise WorkerUnavailableError(str(e))
+
+        self.start_worker()
+        deadline = time.monotonic() + self.connect_timeout
+        while True:
+            try:
+                self.connection = Client(self.address, authkey=self.authkey)
+                return
+            except AuthenticationError as e:
+                raise WorkerUnavailableError(f"Ошибка аутентификации процесса инференса: {str(e)}")
+            except (OSError, EOFError) as e:
+                if self.worker_process.poll() is not None:
+                    raise WorkerUnavailableError(f"Процесс инференса завершился с кодом {self.worker_process.returncode}")
+                if time.monotonic() > deadline:
+                    raise WorkerUnavailableError(str(e))
+                time.sleep(0.5)
+
+    def start_worker(self):
+        """Запуск процесса инференса в фоне"""
+        # Передаются только настройки модели, адрес задается отдельно
+        worker_config = {key: value for key, value in self.worker_config.items()
+                         if key.startswith('ai_') and key not in ('ai_worker_address', 'ai_worker_autostart')}
+        root_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        address = self.address if isinstance(self.address, str) else f"{self.address[0]}:{self.address[1]}"
+
+        self.worker_process = subprocess.Popen(
+            [sys.executable, '-m', 'src.ai.inference_worker',
+             '--address', address, '--config-json', json.dumps(worker_config), '--exit-when-idle'],
+            cwd=root_dir,
+            env=dict(os.environ, PC_DIAGNOSTICS_WORKER_AUTHKEY=self.authkey.decode('utf-8', 'replace'))
+        )
+
+    def close(self):
+        """Закрытие соединения с процессом инференса
+        
+        Процесс инференса продолжает обслуживать других клиентов; запущенный
+        клиентом процесс завершается сам после отключения последнего клиента.
+        """
+        if self.connection is not None:
+            try:
+                self.connection.close()
+            except OSError:
+                pass
+            self.connection = None
+
+    def ping(self):
+        """Проверка доступности процесса инференса"""
+        return self._request({'op': 'ping'}).get('ok', False)
+
+    def generate(self, prompts, cancel_event=None, token_callback=None, budget=None):
+        """Генерация текста для списка запросов
+
+        cancel_event - необязательный объект с методом is_set(); при его
+        установке запрос отменяется и возбуждается RequestCancelledError.
+        token_callback - функция для потоковой выдачи фрагментов ответа
+        (только для одного запроса). budget - бюджет времени генерации в
+        секундах, по истечении которого возвращается частичный результат.
+        """
+        message = {'op': 'generate', 'prompts': list(prompts), 'stream': token_callback is not None, 'budget': budget}
+        response = self._request(message, cancel_event, token_callback)
+        if response.get('cancelled'):
+            raise RequestCancelledError("Запрос отменен")
+        if 'error' in response:
+            raise RuntimeError(response['error'])
+        return response['results']
+
+    def classify(self, prompts, cancel_event=None):
+        """Вероятности серьезности для списка запросов (один прямой проход модели)
+
+        Возвращает список словарей {метка: вероятность} в порядке запросов.
+        """
+        response = self._request({'op': 'classify', 'prompts': list(prompts)}, cancel_event)
+        if response.get('cancelled'):
+            raise RequestCancelledError("Запрос отменен")
+        if 'error' in response:
+            raise RuntimeError(response['error'])
+        return response['results']
+
+    def _request(self, message, cancel_event=None, token_callback=None):
+        """Отправка запроса и ожидание ответа с тем же идентификатором"""
+        with self._lock:
+            self.connect()
+            request_id = next(self._request_ids)
+            message = dict(message, id=request_id)
+            cancel_sent = False
+
+            try:
+                send_message(self.connection, message)
+                while True:
+                    if self.connection.poll(POLL_INTERVAL):
+                        response = recv_message(self.connection)
+                        # Ответы на ранее отмененные запросы пропускаются
+                        if response.get('id') != request_id:
+                            continue
+                        if 'token' in response:
+                            if token_callback is not None:
+                                token_callback(response['token'])
+                            continue
+                        return response
+                    elif cancel_event is not None and not cancel_sent and cancel_event.is_set():
+                        send_message(self.connection, {'op': 'cancel', 'id': request_id})
+                        cancel_sent = True
+            except (OSError, EOFError, ValueError) as e:
+                self.close()
+                raise WorkerUnavailableError(str(e))
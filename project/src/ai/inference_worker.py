@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Внешний процесс инференса модели диагностики
+
+Процесс держит модель загруженной, принимает запросы генерации и
+классификации серьезности от нескольких клиентов (интерфейс, фоновые агенты) через локальный канал, объединяет их
+в пакеты и поддерживает отмену запросов.
+
+Запуск из корня репозитория:
+    python -m src.ai.inference_worker [--address АДРЕС] [--config-json JSON]
+"""
+
+import os
+import json
+import time
+import queue
+import socket
+import logging
+import argparse
+import itertools
+import threading
+from multiprocessing.connection import Listener
+
+from src.ai.llm_engine import LLMDiagnosticsEngine
+from src.ai.inference_client import parse_address, encode_authkey, is_unix_socket, send_message, recv_message
+from src.utils.logger import setup_logger
+
+class PendingRequest:
+    """Запрос генерации или классификации, ожидающий обработки"""
+
+    def __init__(self, channel, request_id, prompts, stream=False, budget=None, op='generate'):
+        self.op = op
+        self.channel = channel
+        self.request_id = request_id
+        self.prompts = prompts
+        self.stream = stream
+        # Бюджет отсчитывается от момента получения запроса
+        self.deadline = None if budget is None else time.monotonic() + budget
+        self.cancelled = threading.Event()
+
+class ClientChannel:
+    """Соединение с одним клиентом"""
+
+    def __init__(self, connection, channel_id):
+        self.connection = connection
+        self.channel_id = channel_id
+        self.pending = {}
+        self.send_lock = threading.Lock()
+
+    def send(self, message):
+        """Потокобезопасная отправка сообщения клиенту"""
+        try:
+            with self.send_lock:
+                send_message(self.connection, message)
+        except (OSError, EOFError):
+            pass
+
+def socket_in_use(path):
+    """Принимает ли Unix-сокет подключения (работает ли другой процесс инференса)"""
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+        return True
+    except OSError:
+        return False
+    finally:
+        probe.close()
+
+class InferenceWorker:
+    """Сервер инференса с пакетной обработкой запросов"""
+
+    def __init__(self, address, config=None, authkey=None, max_batch_size=8, batch_wait=0.02, exit_when_idle=False):
+        """Инициализация процесса инференса
+
+        exit_when_idle - завершить работу после отключения последнего клиента
+        (процесс, запущенный клиентом автоматически).
+        """
+        self.address = parse_address(address)
+        self.authkey = encode_authkey(authkey)
+        self.max_batch_size = max_batch_size
+        self.batch_wait = batch_wait
+        self.exit_when_idle = exit_when_idle
+        self.requests = queue.Queue()
+        # Число подключенных клиентов
+        self.client_count = 0
+        self.clients_lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.logger = logging.getLogger('inference_worker')
+
+        # Модель загружается один раз и остается в памяти процесса
+        config = dict(config or {})
+        config.pop('ai_worker_address', None)
+        self.engine = LLMDiagnosticsEngine(config)
+        self.engine.load_model()
+        if not self.engine.model_loaded:
+            raise RuntimeError("Не удалось загрузить модель")
+
+    def serve_forever(self):
+        """Запуск приема соединений и цикла инференса"""
+        if is_unix_socket(self.address) and os.path.exists(self.address):
+            if socket_in_use(self.address):
+                raise RuntimeError(f"Адрес {self.address} уже используется другим процессом инференса")
+            # Сокет остался от завершившегося процесса
+            os.unlink(self.address)
+
+        # Unix-сокет создается сразу с правами только для текущего пользователя
+        previous_umask = os.umask(0o177)
+        try:
+            listener = Listener(self.address, authkey=self.authkey)
+        finally:
+            os.umask(previous_umask)
+        self.logger.info("Процесс инференса ожидает подключений: %s", self.address)
+
+        accept_thread = threading.Thread(target=self._accept_loop, args=(listener,), daemon=True)
+        accept_thread.start()
+        try:
+            self._inference_loop()
+        finally:
+            self.stopped.set()
+            listener.close()
+
+    def _accept_loop(self, listener):
+        """Прием новых клиентов"""
+        channel_ids = itertools.count(1)
+        while True:
+            try:
+                connection = listener.accept()
+            except Exception as e:
+                if self.stopped.is_set():
+                    return
+                # Ошибка аутентификации или разрыв при подключении одного клиента
+                self.logger.warning("Не удалось принять подключение: %s", e)
+                continue
+            channel = ClientChannel(connection, next(channel_ids))
+            threading.Thread(target=self._channel_loop, args=(channel,), daemon=True).start()
+
+    def _channel_loop(self, channel):
+        """Чтение сообщений одного клиента"""
+        self.logger.info("Клиент %d подключен", channel.channel_id)
+        with self.clients_lock:
+            self.client_count += 1
+        try:
+            while True:
+                message = recv_message(channel.connection)
+                op = message.get('op')
+                request_id = message.get('id')
+
+                if op in ('generate', 'classify'):
+                    request = PendingRequest(channel, request_id, message.get('prompts', []),
+                                             message.get('stream', False), message.get('budget'), op)
+                    channel.pending[request_id] = request
+                    self.requests.put(request)
+                elif op == 'cancel':
+                    request = channel.pending.get(request_id)
+                    if request is not None:
+                        # Ответ отправляется сразу, не дожидаясь пакета с этим запросом
+                        request.cancelled.set()
+                        self._finish(request, {'cancelled': True})
+                elif op == 'ping':
+                    channel.send({'id': request_id, 'ok': True})
+                else:
+                    channel.send({'id': request_id, 'error': f"Неизвестная операция: {op}"})
+        except (OSError, EOFError):
+            pass
+        except ValueError as e:
+            self.logger.warning("Некорректное сообщение клиента %d: %s", channel.channel_id, e)
+        finally:
+            # Запросы отключившегося клиента больше не нужны
+            for request in list(channel.pending.values()):
+                request.cancelled.set()
+            channel.connection.close()
+            self.logger.info("Клиент %d отключен", channel.channel_id)
+            with self.clients_lock:
+                self.client_count -= 1
+                idle = self.client_count == 0
+            if idle and self.exit_when_idle:
+                # Пустой элемент очереди завершает цикл инференса
+                self.requests.put(None)
+
+    def _collect_batch(self):
+        """Формирование пакета из ожидающих запросов; None - сигнал завершения"""
+        request = self.requests.get()
+        if request is None:
+            return None
+        batch = [request]
+        prompt_count = len(batch[0].prompts)
+        deadline = time.monotonic() + self.batch_wait
+
+        while prompt_count < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                request = self.requests.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if request is None:
+                # Сигнал завершения обрабатывается после текущего пакета
+                self.requests.put(None)
+                break
+            batch.append(request)
+            prompt_count += len(request.prompts)
+
+        return batch
+
+    def _inference_loop(self):
+        """Последовательная обработка пакетов запросов"""
+        while True:
+            batch = self._collect_batch()
+            if batch is None:
+                with self.clients_lock:
+                    if self.client_count:
+                        # Новый клиент подключился после отключения последнего
+                        continue
+                self.logger.info("Клиентов не осталось, процесс инференса завершается")
+                return
+
+            # Отмененные до начала генерации запросы не обрабатываются
+            active = []
+            for request in batch:
+                if request.cancelled.is_set():
+                    self._finish(request, {'cancelled': True})
+                else:
+                    active.append(request)
+            if not active:
+                continue
+
+            # Запросы классификации обрабатываются одним прямым проходом
+            classify = [request for request in active if request.op == 'classify']
+            if classify:
+                self._process_classify(classify)
+            active = [request for request in active if request.op == 'generate']
+
+            # Потоковые запросы обрабатываются по одному, остальные - пакетом
+            for request in [request for request in active if request.stream]:
+                self._process_stream(request)
+            active = [request for request in active if not request.stream]
+            if not active:
+                continue
+
+            prompts = [prompt for request in active for prompt in request.prompts]
+            # Запрос каждого текста пакета: отмененный запрос выбывает из генерации
+            rows = [request for request in active for _ in request.prompts]
+            # Пакет ограничен ближайшим сроком, чтобы ни один запрос не превысил бюджет
+            deadlines = [request.deadline for request in active if request.deadline is not None]
+            try:
+                results = self.engine.generate_batch(
+                    prompts,
+                    should_stop=lambda: [request.cancelled.is_set() for request in rows],
+                    deadline=min(deadlines) if deadlines else None
+                )
+            except Exception as e:
+                self.logger.error("Ошибка генерации: %s", e)
+                for request in active:
+                    self._finish(request, {'error': str(e)})
+                continue
+
+            offset = 0
+            for request in active:
+                request_results = results[offset:offset + len(request.prompts)]
+                offset += len(request.prompts)
+                if request.cancelled.is_set():
+                    self._finish(request, {'cancelled': True})
+                else:
+                    self._finish(request, {'results': request_results})
+
+            self.logger.debug("Обработан пакет: %d запросов, %d текстов", len(active), len(prompts))
+
+    def _process_classify(self, requests):
+        """Классификация запросов пакета за один прямой проход модели"""
+        prompts = [prompt for request in requests for prompt in request.prompts]
+        try:
+            results = self.engine.classify_batch(prompts)
+        except Exception as e:
+            self.logger.error("Ошибка классификации: %s", e)
+            for request in requests:
+                self._finish(request, {'error': str(e)})
+            return
+
+        offset = 0
+        for request in requests:
+            self._finish(request, {'results': results[offset:offset + len(request.prompts)]})
+            offset += len(request.prompts)
+
+    def _process_stream(self, request):
+        """Генерация с отправкой фрагментов ответа по мере появления"""
+        try:
+            results = self.engine.generate_batch(
+                request.prompts,
+                should_stop=request.cancelled.is_set,
+                token_callback=lambda text: request.channel.send({'id': request.request_id, 'token': text}),
+                deadline=request.deadline
+            )
+        except Exception as e:
+            self.logger.error("Ошибка генерации: %s", e)
+            self._finish(request, {'error': str(e)})
+            return
+
+        if request.cancelled.is_set():
+            self._finish(request, {'cancelled': True})
+        else:
+            self._finish(request, {'results': results})
+
+    def _finish(self, request, response):
+        """Отправка ответа и удаление запроса из ожидающих
+
+        На каждый запрос отправляется один ответ: запрос, на который уже
+        ответили (например, при отмене), пропускается.
+        """
+        if request.channel.pending.pop(request.request_id, None) is None:
+            return
+        request.channel.send(dict(response, id=request.request_id))
+
+def main():
+    """Точка входа процесса инференса"""
+    parser = argparse.ArgumentParser(description="Процесс инференса модели диагностики")
+    parser.add_argument('--address', default='auto', help="Путь к Unix-сокету, именованный канал или петлевой host:port")
+    parser.add_argument('--config-json', default='{}', help="Настройки модели (ключи ai_*) в формате JSON")
+    parser.add_argument('--max-batch-size', type=int, default=8)
+    parser.add_argument('--batch-wait-ms', type=float, default=20)
+    parser.add_argument('--exit-when-idle', action='store_true',
+                        help="Завершить работу после отключения последнего клиента")
+    args = parser.parse_args()
+
+    config = json.loads(args.config_json)
+    setup_logger(config, filename='inference_worker.log')
+
+    worker = InferenceWorker(
+        args.address,
+        config=config,
+        authkey=os.environ.get('PC_DIAGNOSTICS_WORKER_AUTHKEY'),
+        max_batch_size=args.max_batch_size,
+        batch_wait=args.batch_wait_ms / 1000,
+        exit_when_idle=args.exit_when_idle
+    )
+    try:
+        worker.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,773 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Модуль для диагностики системы с использованием языковой модели DistilGPT-2
+
+Используется бэкендом "llm" уровня детализации "Расширенный" (см. backends.py).
+"""
+
+import os
+import sys
+import copy
+import json
+import random
+import time
+import logging
+from datetime import datetime
+
+from src.ai.backends import optional_setting
+from src.ai.inference_client import InferenceClient, WorkerUnavailableError, RequestCancelledError
+from src.hardware.thresholds import ISSUE_THRESHOLDS, CORE_SPREAD_THRESHOLD
+from src.utils.cancellation import OperationCancelledError
+
+# torch и transformers импортируются лениво внутри методов: в режиме внешнего
+# процесса инференса (ai_worker_address) процесс интерфейса их не загружает
+
+# Максимальная длина последовательности (запрос + ответ) при генерации
+GENERATION_MAX_LENGTH = 150
+
+# Компоненты, для которых выполняется анализ моделью
+AI_COMPONENTS = ['cpu', 'gpu', 'memory']
+
+# Бюджет времени на один запрос к модели по умолчанию, мс
+DEFAULT_LATENCY_BUDGET_MS = 2000
+
+# Ответ analyze_with_ai при ошибке генерации
+ANALYSIS_FAILED_MESSAGE = "Не удалось выполнить анализ"
+
+# Метки серьезности для классификации состояния компонента за один проход
+# модели: оцениваются вероятности продолжений запроса этими словами
+SEVERITY_LABELS = ['normal', 'warning', 'critical']
+
+# Порядок серьезности: классификатор может только повысить серьезность
+# проблемы, найденной правилами
+SEVERITY_RANK = {'info': 0, 'normal': 0, 'warning': 1, 'critical': 2}
+
+# Окончание запроса классификации, после которого ожидается метка
+CLASSIFICATION_SUFFIX = "\nHealth status:"
+
+# Запрос без содержания для калибровки априорных вероятностей меток
+CALIBRATION_PROMPT = "N/A"
+
+# Постоянные начала запросов (см. build_prompt и run_diagnostics), состояние
+# модели для которых вычисляется один раз при загрузке. Начало заканчивается
+# словом: в GPT-2 пробел относится к следующему токену, поэтому раздельная
+# токенизация начала и остатка совпадает с токенизацией всего запроса.
+PROMPT_PREFIXES = [
+    "Analyze CPU health: Temperature",
+    "Analyze GPU health: Temperature",
+    "Analyze memory health: Usage",
+    "Based on system status:"
+]
+
+class LLMDiagnosticsEngine:
+    """Класс для диагностики системы с использованием языковой модели"""
+    
+    def __init__(self, config=None):
+        """Инициализация движка диагностики"""
+        self.config = config or {}
+        self.model_loaded = False
+        self.client = None
+        self.label_token_ids = None
+        self.label_prior = None
+        self.prefix_cache = {}
+        self.logger = logging.getLogger('diagnostics_engine')
+        
+        if self.config.get('ai_worker_address'):
+            self.client = InferenceClient(
+                self.config['ai_worker_address'],
+                authkey=self.config.get('ai_worker_authkey'),
+                autostart=self.config.get('ai_worker_autostart', True),
+                worker_config=self.config
+            )
+        # Модель загружается при первом компоненте с метриками вне нормы
+        # (run_diagnostics), поэтому диагностика исправной системы ее не ждет
+        
+    def sanitize_text(self, text):
+        """Очистка текста от некорректных символов"""
+        try:
+            # Проверка на None
+            if text is None:
+                self.logger.warning("Получен None вместо текста")
+                return ""
+                
+            # Проверка типа
+            if not isinstance(text, str):
+                self.logger.warning("Неверный тип данных: %s", type(text))
+                return str(text)
+                
+            # Удаление или замена некорректных символов
+            cleaned_text = "".join(char for char in text if ord(char) < 65536)
+            
+            # Проверка на изменения
+            if cleaned_text != text:
+                self.logger.warning("Обнаружены и удалены некорректные символы в тексте")
+                
+            return cleaned_text
+        except Exception as e:
+            self.logger.error("Ошибка при очистке текста: %s", e)
+            return ""
+        
+    def configure_threads(self):
+        """Настройка количества потоков torch для инференса на CPU"""
+        import torch
+        
+        # 0 в конфигурации означает автоматический выбор: половина логических
+        # ядер, чтобы оставить ресурсы сканеру и потоку интерфейса
+        intra_op_threads = self.config.get('ai_intra_op_threads', 0)
+        if not intra_op_threads:
+            intra_op_threads = max(1, (os.cpu_count() or 2) // 2)
+        inter_op_threads = self.config.get('ai_inter_op_threads', 1)
+        
+        torch.set_num_threads(intra_op_threads)
+        try:
+            torch.set_num_interop_threads(inter_op_threads)
+        except RuntimeError as e:
+            # Число inter-op потоков можно задать только до первого параллельного вызова
+            self.logger.warning("Не удалось изменить число inter-op потоков: %s", e)
+        self.logger.info("Потоки torch: intra-op %d, inter-op %d", intra_op_threads, inter_op_threads)
+        
+    def quantize_model(self):
+        """Динамическая int8-квантизация линейных слоев модели"""
+        # В GPT-2 проекции внимания и MLP реализованы слоями Conv1D, поэтому
+        # перед квантизацией они заменяются эквивалентными nn.Linear
+        import torch
+        from transformers.pytorch_utils import Conv1D
+        
+        for module in list(self.model.modules()):
+            for name, child in list(module.named_children()):
+                if isinstance(child, Conv1D):
+                    in_features, out_features = child.weight.shape
+                    linear = torch.nn.Linear(in_features, out_features)
+                    linear.weight.data = child.weight.data.t().contiguous()
+                    linear.bias.data = child.bias.data
+                    setattr(module, name, linear)
+                    
+        self.model = torch.quantization.quantize_dynamic(self.model, {torch.nn.Linear}, dtype=torch.qint8)
+        self.logger.info("Применена динамическая int8-квантизация")
+        
+    def warm_up(self):
+        """Прогрев модели одним коротким проходом генерации"""
+        import torch
+        
+        start_time = time.perf_counter()
+        inputs = self.tokenizer("System check", return_tensors="pt")
+        with torch.inference_mode():
+            self.model.generate(
+                inputs["input_ids"],
+                attention_mask=inputs["attention_mask"],
+                max_new_tokens=1,
+                do_sample=False,
+                pad_token_id=self.tokenizer.eos_token_id
+            )
+        self.logger.info("Прогрев модели занял %.2f с", time.perf_counter() - start_time)
+        
+    def build_prefix_cache(self):
+        """Вычисление past_key_values для постоянных начал запросов
+        
+        Кэш - только ускорение: при ошибке (например, если модель не
+        принимает объекты Cache) запросы кодируются целиком.
+        """
+        self.prefix_cache = {}
+        if not self.config.get('ai_prefix_cache', True):
+            return
+        try:
+            import torch
+            from transformers import DynamicCache
+            
+            prefix_cache = {}
+            for prefix in PROMPT_PREFIXES:
+                input_ids = self.tokenizer(prefix, return_tensors="pt")["input_ids"]
+                with torch.inference_mode():
+                    cache = self.model(input_ids=input_ids, past_key_values=DynamicCache(), use_cache=True).past_key_values
+                prefix_cache[prefix] = (input_ids, cache)
+        except Exception as e:
+            self.logger.warning("Кэш начал запросов не поддерживается: %s", e)
+            return
+        self.prefix_cache = prefix_cache
+        self.logger.info("Кэшировано начал запросов: %d", len(self.prefix_cache))
+        
+    def cached_inputs(self, text):
+        """Токены запроса и копия кэша его постоянного начала
+        
+        Возвращает (input_ids, attention_mask, past_key_values) или None,
+        если запрос не начинается с кэшированного начала. Кэш копируется:
+        генерация дописывает в него состояние новых токенов.
+        """
+        import torch
+        
+        for prefix, (prefix_ids, cache) in self.prefix_cache.items():
+            if not text.startswith(prefix) or len(text) == len(prefix):
+                continue
+            suffix_ids = self.tokenizer(text[len(prefix):], return_tensors="pt")["input_ids"]
+            input_ids = torch.cat([prefix_ids, suffix_ids], dim=1)
+            if input_ids.shape[1] > 512:
+                return None
+            return input_ids, torch.ones_like(input_ids), copy.deepcopy(cache)
+        return None
+        
+    def calibrate_classifier(self):
+        """Подготовка классификации серьезности
+        
+        Метке соответствует первый токен слова с пробелом. Априорные
+        вероятности меток для запроса без содержания исключаются из оценок
+        (контекстная калибровка), иначе модель предпочитает самую частую метку.
+        Ошибка калибровки не мешает работе модели: оценки остаются
+        некалиброванными.
+        """
+        self.label_token_ids = [self.tokenizer.encode(' ' + label)[0] for label in SEVERITY_LABELS]
+        self.label_prior = None
+        try:
+            label_prior = self.classify_batch([CALIBRATION_PROMPT])[0]
+        except Exception as e:
+            self.logger.warning("Калибровка классификатора не выполнена, оценки некалиброванные: %s", e)
+            return
+        self.label_prior = label_prior
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info("Априорные вероятности меток: %s",
+                             ", ".join(f"{label} {p:.2f}" for label, p in self.label_prior.items()))
+        
+    def load_model(self):
+        """Загрузка модели ИИ"""
+        if self.client is not None:
+            # Модель постоянно находится во внешнем процессе инференса
+            try:
+                self.client.connect()
+                self.model_loaded = True
+                self.logger.info("Подключение к процессу инференса %s", self.client.address)
+            except WorkerUnavailableError as e:
+                self.logger.error("Процесс инференса недоступен: %s", e)
+                self.model_loaded = False
+            return
+            
+        try:
+            start_time = time.perf_counter()
+            self.configure_threads()
+            model_path = self.config.get('ai_model_path')
+            if model_path:
+                # Локальный каталог: веса отображаются в память, сеть не нужна
+                from src.ai.model_store import load_local_model
+                
+                self.logger.info("Начало загрузки модели из %s", model_path)
+                self.tokenizer, self.model = load_local_model(model_path, self.config.get('ai_model_sha256'),
+                                                              self.logger)
+            else:
+                from transformers import AutoTokenizer, AutoModelForCausalLM
+                
+                self.logger.info("Начало загрузки модели DistilGPT-2")
+                self.tokenizer = AutoTokenizer.from_pretrained("distilgpt2")
+                self.model = AutoModelForCausalLM.from_pretrained("distilgpt2")
+            self.model.eval()
+            self.logger.info("Веса модели загружены за %.2f с", time.perf_counter() - start_time)
+            
+            # Пакетная генерация требует выравнивания запросов слева
+            self.tokenizer.pad_token = self.tokenizer.eos_token
+            self.tokenizer.padding_side = 'left'
+            
+            if self.config.get('ai_inference_mode', 'fp32') == 'int8':
+                self.quantize_model()
+                
+            self.warm_up()
+            self.build_prefix_cache()
+            self.calibrate_classifier()
+            self.model_loaded = True
+            self.logger.info("Модель успешно загружена за %.2f с", time.perf_counter() - start_time)
+        except Exception as e:
+            self.logger.error("Ошибка загрузки модели: %s", e)
+            self.model_loaded = False
+        
+    def analyze_with_ai(self, text, token_callback=None, deadline=None, cancel_token=None):
+        """Анализ текста с помощью DistilGPT-2
+        
+        token_callback - необязательная функция, получающая фрагменты
+        ответа модели по мере генерации. deadline - момент по часам
+        time.monotonic(), после которого генерация прерывается.
+        cancel_token - необязательный CancellationToken; генерация
+        останавливается на ближайшем токене и возбуждается
+        OperationCancelledError.
+        """
+        try:
+            self.logger.debug("Начало анализа текста: %.100s...", text)
+            
+            # Очистка входного текста
+            cleaned_text = self.sanitize_text(text)
+            if not cleaned_text:
+                raise ValueError("Пустой текст после очистки")
+                
+            # Генерация локально или во внешнем процессе инференса
+            if self.client is not None:
+                budget = None if deadline is None else max(0.0, deadline - time.monotonic())
+                result = self.client.generate([cleaned_text], cancel_event=cancel_token,
+                                              token_callback=token_callback, budget=budget)[0]
+            else:
+                should_stop = cancel_token.is_set if cancel_token is not None else None
+                result = self.generate_batch([cleaned_text], should_stop=should_stop,
+                                             token_callback=token_callback, deadline=deadline)[0]
+            if cancel_token is not None:
+                cancel_token.raise_if_cancelled()
+            result = self.sanitize_text(result)
+            
+            self.logger.debug("Анализ успешно завершен")
+            return result
+        except RequestCancelledError:
+            raise OperationCancelledError("Анализ отменен")
+        except OperationCancelledError:
+            raise
+        except Exception as e:
+            self.logger.error("Ошибка анализа: %s", e)
+            return ANALYSIS_FAILED_MESSAGE
+            
+    def classify_severity(self, prompts, cancel_token=None):
+        """Вероятности серьезности для списка запросов за один проход модели
+        
+        Возвращает список словарей {метка: вероятность} в порядке запросов
+        или None, если классификация не удалась.
+        """
+        try:
+            cleaned = [self.sanitize_text(prompt) for prompt in prompts]
+            if self.client is not None:
+                result = self.client.classify(cleaned, cancel_event=cancel_token)
+            else:
+                result = self.classify_batch(cleaned)
+            if cancel_token is not None:
+                cancel_token.raise_if_cancelled()
+            return result
+        except RequestCancelledError:
+            raise OperationCancelledError("Анализ отменен")
+        except OperationCancelledError:
+            raise
+        except Exception as e:
+            self.logger.error("Ошибка классификации: %s", e)
+            return None
+            
+    def analyze_within_budget(self, prompt, token_callback=None, cancel_token=None):
+        """Анализ с ограничением времени генерации
+        
+        Возвращает пару (текст, источник результата). Источник - 'model',
+        'model_partial' (ответ оборван по бюджету) или 'rules', если ответ
+        модели не получен в срок и нужно использовать правила.
+        """
+        budget = self.config.get('ai_latency_budget_ms', DEFAULT_LATENCY_BUDGET_MS) / 1000
+        deadline = time.monotonic() + budget
+        result = self.analyze_with_ai(prompt, token_callback=token_callback, deadline=deadline,
+                                      cancel_token=cancel_token)
+        
+        if result == ANALYSIS_FAILED_MESSAGE:
+            return None, 'rules'
+        if time.monotonic() < deadline:
+            return result, 'model'
+            
+        # Бюджет исчерпан: используется частичный ответ, если он содержит продолжение
+        generated = result[len(prompt):].strip() if result.startswith(prompt) else result.strip()
+        self.logger.warning("Превышен бюджет генерации %.2f с", budget)
+        if self.config.get('ai_deadline_fallback', 'partial') == 'partial' and generated:
+            return result, 'model_partial'
+        return None, 'rules'
+        
+    def rule_based_issues(self, component, component_info, abnormal_metrics):
+        """Проблемы компонента по результатам пороговых проверок сканера"""
+        issues = []
+        for issue in component_info.get('issues', []):
+            severity = 'critical' if 'критически' in issue.lower() else 'warning'
+            issues.append({
+                'component': component,
+                'severity': severity,
+                'message': issue
+            })
+            
+        if not issues and abnormal_metrics:
+            issues.append({
+                'component': component,
+                'severity': 'warning',
+                'message': f"Показатели вне нормы: {', '.join(abnormal_metrics)}"
+            })
+        return issues
+        
+    def generate_batch(self, texts, should_stop=None, token_callback=None, deadline=None):
+        """Пакетная генерация текста локальной моделью
+        
+        should_stop - необязательная функция без аргументов; генерация
+        прерывается, как только она вернет True, а если она возвращает список
+        значений по одному на текст - только для текстов со значением True.
+        token_callback поддерживается
+        только для одного текста и получает фрагменты ответа по мере генерации.
+        deadline - момент по часам time.monotonic(), после которого генерация
+        прерывается с частичным результатом.
+        """
+        import torch
+        from transformers import StoppingCriteriaList
+        from src.ai.stopping import CallbackStoppingCriteria, DeadlineStoppingCriteria
+        
+        streamer = None
+        if token_callback is not None:
+            if len(texts) != 1:
+                raise ValueError("Потоковая генерация поддерживается только для одного текста")
+            from src.ai.streaming import CallbackTextStreamer
+            streamer = CallbackTextStreamer(self.tokenizer, token_callback)
+        
+        # Токенизация и проверка; для одного запроса с постоянным началом
+        # кодируется только переменная часть, начало берется из кэша
+        generate_kwargs = {}
+        cached = self.cached_inputs(texts[0]) if len(texts) == 1 and self.prefix_cache else None
+        if cached is not None:
+            input_ids, attention_mask, generate_kwargs['past_key_values'] = cached
+        else:
+            inputs = self.tokenizer(texts, return_tensors="pt", max_length=512, truncation=True, padding=True)
+            input_ids, attention_mask = inputs["input_ids"], inputs["attention_mask"]
+        if input_ids.shape[1] == 0:
+            raise ValueError("Текст не содержит валидных токенов")
+            
+        stopping_criteria = StoppingCriteriaList()
+        if should_stop is not None:
+            stopping_criteria.append(CallbackStoppingCriteria(should_stop))
+        if deadline is not None:
+            stopping_criteria.append(DeadlineStoppingCriteria(deadline))
+            
+        # Генерация
+        with torch.inference_mode():
+            outputs = self.model.generate(
+                input_ids,
+                attention_mask=attention_mask,
+                max_new_tokens=max(1, GENERATION_MAX_LENGTH - input_ids.shape[1]),
+                num_return_sequences=1,
+                temperature=0.7,
+                top_p=0.9,
+                do_sample=True,
+                pad_token_id=self.tokenizer.eos_token_id,
+                stopping_criteria=stopping_criteria,
+                streamer=streamer,
+                **generate_kwargs
+            )
+            
+        # Декодирование результата
+        return self.tokenizer.batch_decode(outputs, skip_special_tokens=True)
+        
+    def classify_batch(self, texts):
+        """Классификация серьезности локальной моделью
+        
+        Для всех текстов выполняется один прямой проход без генерации:
+        сравниваются логиты меток SEVERITY_LABELS в позиции после
+        CLASSIFICATION_SUFFIX.
+        """
+        import torch
+        
+        inputs = self.tokenizer([text + CLASSIFICATION_SUFFIX for text in texts], return_tensors="pt",
+                                max_length=512, truncation=True, padding=True)
+        # При выравнивании слева позиции отсчитываются от первого значимого токена
+        position_ids = (inputs["attention_mask"].cumsum(-1) - 1).clamp(min=0)
+        with torch.inference_mode():
+            logits = self.model(input_ids=inputs["input_ids"], attention_mask=inputs["attention_mask"],
+                                position_ids=position_ids).logits[:, -1, :]
+            probabilities = torch.softmax(logits[:, self.label_token_ids].float(), dim=-1)
+            if self.label_prior is not None:
+                prior = torch.tensor([self.label_prior[label] for label in SEVERITY_LABELS])
+                probabilities = probabilities / prior
+                probabilities = probabilities / probabilities.sum(dim=-1, keepdim=True)
+                
+        return [dict(zip(SEVERITY_LABELS, row)) for row in probabilities.tolist()]
+        
+    def detect_abnormal_metrics(self, component, component_info):
+        """Быстрая пороговая проверка метрик компонента
+        
+        Используются пороги проверок HardwareScanner.detect_*_issues
+        (thresholds.py). Возвращает список метрик, вышедших за пределы нормы.
+        """
+        abnormal = []
+        for metric, threshold in ISSUE_THRESHOLDS.get(component, {}).items():
+            value = component_info.get(metric)
+            if isinstance(value, (int, float)) and value > threshold:
+                abnormal.append(metric)
+                
+        # Неравномерная загрузка ядер процессора
+        if component == 'cpu':
+            core_usage = component_info.get('core_usage') or []
+            if core_usage and max(core_usage) - min(core_usage) > CORE_SPREAD_THRESHOLD:
+                abnormal.append('core_usage')
+                
+        return abnormal
+        
+    def build_prompt(self, component, component_info):
+        """Формирование запроса к модели для компонента"""
+        if component == 'cpu':
+            prompt = (f"Analyze CPU health: Temperature {component_info.get('temperature')}°C, "
+                      f"Usage {component_info.get('usage')}%, Model {component_info.get('model')}")
+        elif component == 'gpu':
+            prompt = (f"Analyze GPU health: Temperature {component_info.get('temperature')}°C, "
+                      f"Usage {component_info.get('usage')}%, Memory usage {component_info.get('memory_usage_percent')}%")
+        else:
+            prompt = (f"Analyze memory health: Usage {component_info.get('usage_percent')}%, "
+                      f"Available {component_info.get('free')} GB")
+        return self.sanitize_text(prompt)
+        
+    def build_classification_prompt(self, component, component_info, abnormal_metrics):
+        """Запрос классификации: описание компонента и метрики вне нормы"""
+        return f"{self.build_prompt(component, component_info)}. Out of range: {', '.join(abnormal_metrics)}."
+        
+    def classify_components(self, hardware_info, gating, components, served_by, cancel_token=None):
+        """Проблемы компонентов по вероятностям серьезности
+        
+        Все компоненты классифицируются одним пакетом. Проблемы берутся из
+        правил; классификатор добавляет вероятности и может только повысить
+        их серьезность. При ошибке классификации используются правила.
+        """
+        prompts = [self.build_classification_prompt(component, hardware_info.get(component, {}), gating[component])
+                   for component in components]
+        start = time.perf_counter()
+        probabilities = self.classify_severity(prompts, cancel_token=cancel_token)
+        self.logger.debug("Классификация %d компонентов заняла %.1f мс", len(prompts),
+                          (time.perf_counter() - start) * 1000)
+        
+        issues = []
+        for index, component in enumerate(components):
+            component_info = hardware_info.get(component, {})
+            if probabilities is None:
+                served_by[component] = 'rules'
+                issues.extend(self.rule_based_issues(component, component_info, gating[component]))
+                continue
+                
+            served_by[component] = 'classifier'
+            severity = max(probabilities[index], key=probabilities[index].get)
+            for issue in self.rule_based_issues(component, component_info, gating[component]):
+                if SEVERITY_RANK[severity] > SEVERITY_RANK.get(issue['severity'], 0):
+                    issue['severity'] = severity
+                issue['severity_probabilities'] = {label: round(p, 3) for label, p in probabilities[index].items()}
+                issue['source'] = 'classifier'
+                issues.append(issue)
+        return issues
+        
+    def status_line(self, component, component_info):
+        """Строка состояния компонента для запроса рекомендаций"""
+        if component == 'cpu':
+            return f"CPU: {component_info.get('model')}, Temperature: {component_info.get('temperature')}°C"
+        if component == 'gpu':
+            return f"GPU: {component_info.get('model')}, Temperature: {component_info.get('temperature')}°C"
+        return f"Memory Usage: {component_info.get('usage_percent')}%"
+        
+    def _component_callback(self, token_callback, component):
+        """Привязка функции потоковой выдачи к компоненту"""
+        if token_callback is None:
+            return None
+        return lambda text: token_callback(component, text)
+        
+    def run_diagnostics(self, hardware_info, token_callback=None, components=None, cancel_token=None):
+        """Запуск диагностики системы
+        
+        token_callback - необязательная функция (компонент, фрагмент текста)
+        для потоковой выдачи ответов модели. components - необязательный
+        список компонентов; запросы к модели формируются только для них.
+        cancel_token - необязательный CancellationToken для отмены генерации.
+        """
+        try:
+            self.logger.info("Начало диагностики системы")
+            
+            if not isinstance(hardware_info, dict):
+                raise TypeError(f"Неверный тип данных hardware_info: {type(hardware_info)}")
+                
+            # Создание результата диагностики
+            diagnostics_result = {}
+            
+            # Оценка состояния компонентов
+            component_scores = {}
+            selected = [component for component in ['cpu', 'gpu', 'memory', 'storage', 'network']
+                        if components is None or component in components]
+            for component in selected:
+                try:
+                    score = hardware_info.get(component, {}).get('health_score', 0)
+                    if not isinstance(score, (int, float)):
+                        self.logger.warning("Некорректная оценка для %s: %s", component, score)
+                        score = 0
+                    component_scores[component] = score
+                except Exception as e:
+                    self.logger.error("Ошибка при обработке %s: %s", component, e)
+                    component_scores[component] = 0
+                    
+            # Общая оценка системы
+            overall_score = self.calculate_overall_score(component_scores)
+            
+            # Пороговая проверка: модель вызывается только для компонентов,
+            # метрики которых вышли за пределы нормы
+            ai_components = [component for component in AI_COMPONENTS if component in selected]
+            gating = {}
+            for component in ai_components:
+                gating[component] = self.detect_abnormal_metrics(component, hardware_info.get(component, {}))
+            abnormal_components = [component for component in ai_components if gating[component]]
+            
+            generations = 0
+            skipped_generations = len(ai_components) - len(abnormal_components)
+            
+            if abnormal_components and not self.model_loaded:
+                self.logger.info("Метрики вне нормы: загрузка модели")
+                self.load_model()
+                
+            # Источник результата по каждому компоненту
+            served_by = {component: 'threshold' for component in ai_components}
+            
+            # Анализ проблем с помощью ИИ
+            issues = []
+            
+            # В режиме "classify" серьезность оценивается одним прямым проходом
+            # модели, в режиме "generate" - по тексту, сгенерированному для компонента
+            issue_mode = self.config.get('ai_issue_mode', 'classify')
+            if issue_mode == 'classify' and abnormal_components:
+                issues.extend(self.classify_components(hardware_info, gating, abnormal_components, served_by,
+                                                       cancel_token=cancel_token))
+            generated_components = abnormal_components if issue_mode == 'generate' else []
+                
+            for component in generated_components:
+                component_info = hardware_info.get(component, {})
+                try:
+                    self.logger.debug("Метрики вне нормы для %s: %s", component, gating[component])
+                    analysis, served_by[component] = self.analyze_within_budget(
+                        self.build_prompt(component, component_info),
+                        token_callback=self._component_callback(token_callback, component),
+                        cancel_token=cancel_token
+                    )
+                    generations += 1
+                    if analysis is None:
+                        # Ответ модели не получен в срок - результат по правилам
+                        issues.extend(self.rule_based_issues(component, component_info, gating[component]))
+                    elif "problem" in analysis.lower() or "issue" in analysis.lower():
+                        issues.append({
+                            'component': component,
+                            'severity': 'warning',
+                            'message': analysis
+                        })
+                except OperationCancelledError:
+                    raise
+                except Exception as e:
+                    self.logger.error("Ошибка при анализе %s: %s", component, e)
+                    served_by[component] = 'rules'
+                    issues.extend(self.rule_based_issues(component, component_info, gating[component]))
+                    
+            # Если проблем не обнаружено
+            if not issues:
+                issues.append({
+                    'component': 'system',
+                    'severity': 'info',
+                    'message': 'Система работает нормально.'
+                })
+                
+            # Формирование рекомендаций с помощью ИИ только при наличии отклонений;
+            # в режиме "retrieval" их подбирает бэкенд поиска по корпусу
+            if abnormal_components and optional_setting(self.config, 'retrieval') == 'model':
+                try:
+                    system_status = self.sanitize_text(
+                        "\n".join(self.status_line(component, hardware_info.get(component, {}))
+                                  for component in ai_components)
+                    )
+                    
+                    recommendations_prompt = f"Based on system status:\n{system_status}\nProvide optimization recommendations:"
+                    recommendations_text, served_by['recommendations'] = self.analyze_within_budget(
+                        recommendations_prompt,
+                        token_callback=self._component_callback(token_callback, 'recommendations'),
+                        cancel_token=cancel_token
+                    )
+                    generations += 1
+                    if recommendations_text is None:
+                        recommendations = hardware_info.get('recommendations') or ["Не удалось сгенерировать рекомендации"]
+                    else:
+                        recommendations = recommendations_text.split('\n')
+                except OperationCancelledError:
+                    raise
+                except Exception as e:
+                    self.logger.error("Ошибка при генерации рекомендаций: %s", e)
+                    served_by['recommendations'] = 'rules'
+                    recommendations = hardware_info.get('recommendations') or ["Не удалось сгенерировать рекомендации"]
+            else:
+                # Рекомендации сканера не требуют генерации
+                skipped_generations += 1
+                served_by['recommendations'] = 'threshold'
+                recommendations = hardware_info.get('recommendations') or ["Система работает нормально."]
+                
+            # Формирование результата диагностики
+            diagnostics_result['overall_score'] = overall_score
+            diagnostics_result['component_scores'] = component_scores
+            diagnostics_result['issues'] = issues
+            diagnostics_result['recommendations'] = recommendations
+            diagnostics_result['generations'] = generations
+            diagnostics_result['skipped_generations'] = skipped_generations
+            diagnostics_result['served_by'] = served_by
+            diagnostics_result['timestamp'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            
+            self.logger.info("Диагностика успешно завершена: генераций %d, пропущено %d", generations, skipped_generations)
+            return diagnostics_result
+            
+        except OperationCancelledError:
+            self.logger.info("Диагностика отменена")
+            raise
+        except Exception as e:
+            self.logger.error("Критическая ошибка при выполнении диагностики: %s", e)
+            return {
+                'overall_score': 0,
+                'component_scores': {},
+                'issues': [{
+                    'component': 'system',
+                    'severity': 'critical',
+                    'message': f'Ошибка при выполнении диагностики: {str(e)}'
+                }],
+                'recommendations': ['Попробуйте перезапустить диагностику'],
+                'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            }
+        
+    def extend_diagnostics(self, diagnostics_result, hardware_info, token_callback=None, components=None,
+                           cancel_token=None):
+        """Дополнение результата диагностики по правилам анализом модели"""
+        llm_result = self.run_diagnostics(hardware_info, token_callback=token_callback, components=components,
+                                          cancel_token=cancel_token)
+        
+        # Проблемы, уже найденные правилами, не дублируются; классификатор
+        # добавляет к ним вероятности и может только повысить серьезность
+        known_issues = {(issue['component'], issue['message']): issue for issue in diagnostics_result['issues']}
+        for issue in llm_result.get('issues', []):
+            if issue['component'] == 'system':
+                continue
+            known = known_issues.get((issue['component'], issue['message']))
+            if known is None:
+                diagnostics_result['issues'].append(issue)
+            elif 'severity_probabilities' in issue:
+                if SEVERITY_RANK.get(issue['severity'], 0) > SEVERITY_RANK.get(known['severity'], 0):
+                    known['severity'] = issue['severity']
+                known['severity_probabilities'] = issue['severity_probabilities']
+                
+        served_by = llm_result.get('served_by', {})
+        if served_by.get('recommendations') in ('model', 'model_partial'):
+            diagnostics_result['recommendations'] = llm_result['recommendations']
+            
+        diagnostics_result['generations'] = llm_result.get('generations', 0)
+        diagnostics_result['skipped_generations'] = llm_result.get('skipped_generations', 0)
+        diagnostics_result['served_by'] = served_by
+        
+    def close(self):
+        """Закрытие соединения с процессом инференса"""
+        if self.client is not None:
+            self.client.close()
+            
+    def calculate_overall_score(self, component_scores):
+        """Расчет общей оценки системы"""
+        try:
+            weights = {
+                'cpu': 0.25,
+                'gpu': 0.2,
+                'memory': 0.2,
+                'storage': 0.25,
+                'network': 0.1
+            }
+            
+            overall_score = 0
+            total_weight = 0
+            for component, score in component_scores.items():
+                weight = weights.get(component, 0)
+                if not isinstance(score, (int, float)):
+                    self.logger.warning("Некорректная оценка для %s: %s", component, score)
+                    score = 0
+                overall_score += score * weight
+                total_weight += weight
+                
+            # При диагностике части компонентов веса нормируются на их сумму
+            if total_weight == 0:
+                return 0
+            return round(overall_score / total_weight)
+        except Exception as e:
+            self.logger.error("Ошибка при расчете общей оценки: %s", e)
+            return 0
\ No newline at end of file
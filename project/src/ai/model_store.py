@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Модуль для загрузки модели диагностики из локального каталога
+
+Каталог (настройка ai_model_path) содержит файлы конфигурации и токенизатора
+и веса model.safetensors. Веса не копируются в память процесса: файл
+отображается в память (mmap), и параметры модели ссылаются на его
+страницы. Несколько процессов (интерфейс, процесс инференса, фоновые
+агенты) разделяют одни и те же страницы файлового кэша.
+
+Контрольная сумма весов проверяется один раз для каждой версии файла,
+результат проверки сохраняется в data/model_verification.json.
+
+Подготовка каталога из командной строки (требуется доступ к сети):
+    python -m src.ai.model_store --export КАТАЛОГ [--model distilgpt2]
+"""
+
+import os
+import json
+import mmap
+import struct
+import hashlib
+import logging
+import argparse
+import tempfile
+
+from src.ai.history_store import app_dir
+
+# Файл весов и файл с его контрольной суммой в формате sha256sum
+WEIGHTS_FILE = 'model.safetensors'
+CHECKSUM_FILE = WEIGHTS_FILE + '.sha256'
+
+# Результаты проверок контрольных сумм (относительно каталога приложения)
+VERIFICATION_PATH = os.path.join('data', 'model_verification.json')
+
+# Типы данных safetensors
+SAFETENSORS_DTYPES = {
+    'F64': 'float64',
+    'F32': 'float32',
+    'F16': 'float16',
+    'BF16': 'bfloat16',
+    'I64': 'int64',
+    'I32': 'int32',
+    'I16': 'int16',
+    'I8': 'int8',
+    'U8': 'uint8',
+    'BOOL': 'bool'
+}
+
+class ModelIntegrityError(Exception):
+    """Веса модели не совпадают с ожидаемой контрольной суммой"""
+
+def file_sha256(path, chunk_size=1024 * 1024):
+    """Контрольная сумма SHA-256 файла"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def read_checksum_file(path):
+    """Контрольная сумма из файла формата sha256sum или None"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return f.read().split()[0].lower()
+    except (OSError, IndexError):
+        return None
+
+def load_verifications():
+    """Сохраненные результаты проверок: {путь: {size, mtime_ns, sha256}}"""
+    try:
+        with open(os.path.join(app_dir(), VERIFICATION_PATH), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_verification(weights_path, stat, sha256):
+    """Сохранение результата проверки файла весов
+
+    Запись выполняется через временный файл, так как проверку могут
+    одновременно выполнять несколько процессов.
+    """
+    path = os.path.join(app_dir(), VERIFICATION_PATH)
+    verifications = load_verifications()
+    verifications[weights_path] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': sha256}
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump(verifications, f, indent=4)
+    os.replace(temp_path, path)
+
+def verify_weights(weights_path, expected_sha256=None, logger=None):
+    """Проверка контрольной суммы весов
+
+    Ожидаемая сумма берется из настройки ai_model_sha256 или из файла
+    model.safetensors.sha256 рядом с весами. Если ее нет, сумма вычисляется
+    и записывается в этот файл. Файл весов с теми же размером и временем
+    изменения, что при прошлой успешной проверке, повторно не хешируется.
+    """
+    logger = logger or logging.getLogger('model_store')
+    weights_path = os.path.abspath(weights_path)
+    checksum_path = os.path.join(os.path.dirname(weights_path), CHECKSUM_FILE)
+    expected = (expected_sha256 or read_checksum_file(checksum_path) or '').lower() or None
+    stat = os.stat(weights_path)
+
+    verified = load_verifications().get(weights_path)
+    if (verified and verified['size'] == stat.st_size and verified['mtime_ns'] == stat.st_mtime_ns
+            and (expected is None or verified['sha256'] == expected)):
+        return verified['sha256']
+
+    sha256 = file_sha256(weights_path)
+    if expected is not None and sha256 != expected:
+        raise ModelIntegrityError(f"Контрольная сумма {weights_path} не совпадает: {sha256} вместо {expected}")
+    if expected is None:
+        logger.warning("Нет контрольной суммы весов, записана текущая: %s", checksum_path)
+        try:
+            with open(checksum_path, 'w', encoding='utf-8') as f:
+                f.write(f"{sha256}  {WEIGHTS_FILE}\n")
+        except OSError as e:
+            logger.warning("Не удалось записать контрольную сумму: %s", e)
+
+    try:
+        save_verification(weights_path, stat, sha256)
+    except OSError as e:
+        logger.warning("Не удалось сохранить результат проверки весов: %s", e)
+    logger.info("Контрольная сумма весов проверена: %s", sha256)
+    return sha256
+
+def load_safetensors_mmap(path):
+    """Тензоры файла safetensors, ссылающиеся на страницы отображенного файла
+
+    Отображение копируется только при записи (MAP_PRIVATE), поэтому
+    процессы, читающие один файл, используют общие страницы файлового кэша.
+    """
+    import torch
+
+    with open(path, 'rb') as f:
+        header_size = struct.unpack('<Q', f.read(8))[0]
+        header = json.loads(f.read(header_size))
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+
+    data_start = 8 + header_size
+    tensors = {}
+    for name, info in header.items():
+        if name == '__metadata__':
+            continue
+        dtype = getattr(torch, SAFETENSORS_DTYPES[info['dtype']])
+        begin, end = info['data_offsets']
+        count = (end - begin) // torch.empty(0, dtype=dtype).element_size()
+        if count == 0:
+            tensors[name] = torch.empty(info['shape'], dtype=dtype)
+            continue
+        # Тензор удерживает ссылку на отображение, пока он используется
+        tensors[name] = torch.frombuffer(buffer, dtype=dtype, count=count, offset=data_start + begin).view(info['shape'])
+    return tensors
+
+def materialize_meta_buffers(model, config):
+    """Создание буферов, оставшихся на устройстве meta после загрузки весов
+
+    Буферы, не сохраняемые в файл весов, вычисляются из конфигурации.
+    Для GPT-2 это маска внимания bias и константа masked_bias. Они
+    одинаковы во всех слоях, поэтому создаются один раз и разделяются
+    слоями. Для других буферов выбрасывается ValueError.
+    """
+    import torch
+
+    names = [name for name, buffer in model.named_buffers() if buffer.is_meta]
+    if not names:
+        return
+    unknown = [name for name in names if config.model_type != 'gpt2'
+               or name.rpartition('.')[2] not in ('bias', 'masked_bias')]
+    if unknown:
+        raise ValueError(f"Неизвестные буферы модели {config.model_type} вне файла весов: {', '.join(unknown[:5])}")
+
+    max_positions = config.max_position_embeddings
+    buffers = {
+        'bias': torch.tril(torch.ones((max_positions, max_positions), dtype=torch.bool)).view(
+            1, 1, max_positions, max_positions),
+        'masked_bias': torch.tensor(-1e4)
+    }
+    for name in names:
+        module_name, _, buffer_name = name.rpartition('.')
+        model.get_submodule(module_name)._buffers[buffer_name] = buffers[buffer_name]
+
+def load_local_model(model_dir, expected_sha256=None, logger=None):
+    """Загрузка токенизатора и модели из локального каталога без сети
+
+    Возвращает пару (токенизатор, модель). Параметры модели ссылаются
+    на отображенный в память файл весов.
+    """
+    import torch
+    from transformers import AutoConfig, AutoTokenizer, AutoModelForCausalLM
+
+    logger = logger or logging.getLogger('model_store')
+    weights_path = os.path.join(model_dir, WEIGHTS_FILE)
+    if not os.path.exists(weights_path):
+        raise FileNotFoundError(f"Не найден файл весов {weights_path}")
+    verify_weights(weights_path, expected_sha256, logger)
+
+    tokenizer = AutoTokenizer.from_pretrained(model_dir, local_files_only=True)
+    config = AutoConfig.from_pretrained(model_dir, local_files_only=True)
+    # Модель создается без выделения памяти под параметры; устройство по
+    # умолчанию задается только для текущего потока
+    with torch.device('meta'):
+        model = AutoModelForCausalLM.from_config(config)
+
+    state_dict = load_safetensors_mmap(weights_path)
+    # Веса, сохраненные из базовой модели, не содержат ее префикса
+    prefix = model.base_model_prefix + '.'
+    if hasattr(model, model.base_model_prefix) and not any(name.startswith(prefix) for name in state_dict):
+        state_dict = {prefix + name: tensor for name, tensor in state_dict.items()}
+    model.load_state_dict(state_dict, strict=False, assign=True)
+    model.tie_weights()
+    materialize_meta_buffers(model, config)
+
+    missing = [name for name, param in model.named_parameters() if param.is_meta]
+    if missing:
+        raise ValueError(f"В файле весов нет параметров: {', '.join(missing[:5])}")
+    return tokenizer, model
+
+def export_model(model_name, model_dir):
+    """Сохранение модели из хаба в локальный каталог с контрольной суммой"""
+    from transformers import AutoTokenizer, AutoModelForCausalLM
+
+    AutoTokenizer.from_pretrained(model_name).save_pretrained(model_dir)
+    AutoModelForCausalLM.from_pretrained(model_name).save_pretrained(model_dir, safe_serialization=True)
+    sha256 = file_sha256(os.path.join(model_dir, WEIGHTS_FILE))
+    with open(os.path.join(model_dir, CHECKSUM_FILE), 'w', encoding='utf-8') as f:
+        f.write(f"{sha256}  {WEIGHTS_FILE}\n")
+    return sha256
+
+def main():
+    """Подготовка локального каталога модели"""
+    parser = argparse.ArgumentParser(description='Подготовка локального каталога модели диагностики')
+    parser.add_argument('--export', required=True, metavar='КАТАЛОГ', help='Каталог для сохранения модели')
+    parser.add_argument('--model', default='distilgpt2', help='Имя модели в хабе')
+    args = parser.parse_args()
+
+    sha256 = export_model(args.model, args.export)
+    print(f"Модель {args.model} сохранена в {args.export}, SHA-256 весов: {sha256}")
+    print(f"Укажите \"ai_model_path\": \"{os.path.abspath(args.export)}\" в config.json")
+
+if __name__ == '__main__':
+    main()
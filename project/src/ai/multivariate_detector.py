@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Модуль многомерного выявления аномалий на основе IsolationForest
+
+Модель обучается на сохраненной истории снимков каждого компьютера
+(см. history_store.py) в фоновом потоке по расписанию и дообучается
+инкрементально (warm_start). Для оценки нового снимка обученный лес
+разворачивается в плоские массивы numpy, и все деревья обходятся
+одновременно за несколько векторных операций.
+
+Используется необязательным бэкендом "multivariate" (см. backends.py).
+"""
+
+import os
+import re
+import time
+import logging
+import threading
+
+import numpy as np
+import joblib
+from sklearn.ensemble import IsolationForest
+
+from src.ai.history_store import (MetricsHistoryStore, FEATURE_NAMES, app_dir,
+                                  host_key, extract_features)
+
+# Число деревьев при полном обучении и при каждом дообучении
+BASE_TREES = 100
+TREES_PER_UPDATE = 20
+
+# Предельное число деревьев; при его достижении модель обучается заново
+MAX_TREES = 300
+
+# Минимальное число снимков для первого обучения и для дообучения
+MIN_TRAIN_SAMPLES = 50
+MIN_NEW_SAMPLES = 20
+
+# Число последних снимков, на которых обучается модель
+TRAINING_WINDOW = 5000
+
+# Интервал переобучения по умолчанию, мин
+DEFAULT_RETRAIN_INTERVAL_MIN = 60
+
+# Каталог сохраненных моделей (относительно каталога приложения)
+MODELS_DIR = os.path.join('data', 'models')
+
+def average_path_length(n_samples):
+    """Средняя длина пути в двоичном дереве поиска из n элементов (как в sklearn)"""
+    n_samples = np.asarray(n_samples, dtype=np.float64)
+    result = np.zeros_like(n_samples)
+    result[n_samples == 2] = 1.0
+    mask = n_samples > 2
+    result[mask] = 2.0 * (np.log(n_samples[mask] - 1.0) + np.euler_gamma) - 2.0 * (n_samples[mask] - 1.0) / n_samples[mask]
+    return result
+
+class CompiledIsolationForest:
+    """Плоское представление обученного IsolationForest для оценки одного снимка
+
+    Узлы всех деревьев объединены в общие массивы; листья ссылаются сами
+    на себя, поэтому обход всех деревьев - это max_depth шагов векторной
+    индексации. Результат совпадает с IsolationForest.score_samples.
+    """
+
+    def __init__(self, model):
+        lefts, rights, features, thresholds, leaf_values, roots = [], [], [], [], [], []
+        offset = 0
+        max_depth = 0
+
+        for estimator, tree_features in zip(model.estimators_, model.estimators_features_):
+            tree = estimator.tree_
+            node_ids = np.arange(tree.node_count) + offset
+            is_leaf = tree.children_left == -1
+
+            # Глубина узлов: в дереве sklearn потомок всегда идет после родителя
+            depth = np.zeros(tree.node_count)
+            for node in np.flatnonzero(~is_leaf):
+                depth[tree.children_left[node]] = depth[node] + 1
+                depth[tree.children_right[node]] = depth[node] + 1
+
+            lefts.append(np.where(is_leaf, node_ids, tree.children_left + offset))
+            rights.append(np.where(is_leaf, node_ids, tree.children_right + offset))
+            features.append(np.where(is_leaf, 0, np.asarray(tree_features)[np.maximum(tree.feature, 0)]))
+            thresholds.append(tree.threshold)
+            leaf_values.append(depth + average_path_length(tree.n_node_samples))
+            roots.append(offset)
+
+            max_depth = max(max_depth, int(depth.max()))
+            offset += tree.node_count
+
+        self.left = np.concatenate(lefts)
+        self.right = np.concatenate(rights)
+        self.feature = np.concatenate(features)
+        self.threshold = np.concatenate(thresholds)
+        self.leaf_value = np.concatenate(leaf_values)
+        self.roots = np.asarray(roots)
+        self.max_depth = max_depth
+        self.normalizer = float(average_path_length([model.max_samples_])[0])
+        self.offset = model.offset_
+
+    def score(self, features):
+        """Оценка аномальности снимка (чем меньше, тем аномальнее)"""
+        # Деревья sklearn сравнивают признаки в точности float32
+        x = np.asarray(features, dtype=np.float32).astype(np.float64)
+        nodes = self.roots
+        for _ in range(self.max_depth):
+            nodes = np.where(x[self.feature[nodes]] <= self.threshold[nodes], self.left[nodes], self.right[nodes])
+        return -2.0 ** (-self.leaf_value[nodes].mean() / self.normalizer)
+
+    def is_anomaly(self, score):
+        """Признак аномалии по порогу, найденному при обучении"""
+        return score - self.offset < 0
+
+class MultivariateAnomalyDetector:
+    """Класс для многомерного выявления аномалий по истории компьютера"""
+
+    def __init__(self, config=None):
+        """Инициализация детектора и запуск фонового обучения"""
+        self.config = config or {}
+        self.logger = logging.getLogger('multivariate_detector')
+        self.store = MetricsHistoryStore(self.config.get('history_db_path') or None)
+        self.models_dir = os.path.join(app_dir(), MODELS_DIR)
+        os.makedirs(self.models_dir, exist_ok=True)
+
+        # Обученные модели по компьютерам: {хост: (IsolationForest, время последнего снимка обучения)}
+        self.models = {}
+        # Развернутые модели для оценки: {хост: CompiledIsolationForest}
+        self.compiled = {}
+        self.last_scan_time = {}
+
+        self.stop_event = threading.Event()
+        self.training_thread = threading.Thread(target=self._training_loop, name='anomaly-model-training', daemon=True)
+        self.training_thread.start()
+
+    def model_path(self, host):
+        """Путь к файлу модели компьютера"""
+        return os.path.join(self.models_dir, f"isolation_forest_{re.sub(r'[^A-Za-z0-9_.-]', '_', host)}.joblib")
+
+    def load_models(self):
+        """Загрузка сохраненных моделей"""
+        for host in self.store.hosts():
+            path = self.model_path(host)
+            if not os.path.exists(path):
+                continue
+            try:
+                saved = joblib.load(path)
+                self.models[host] = (saved['model'], saved['trained_until'])
+                self.compiled[host] = CompiledIsolationForest(saved['model'])
+            except Exception as e:
+                self.logger.error("Ошибка при загрузке модели %s: %s", path, e)
+
+    def train_host(self, host):
+        """Обучение или дообучение модели компьютера на сохраненной истории"""
+        model, trained_until = self.models.get(host, (None, None))
+        new_samples = self.store.count(host, since=trained_until)
+        if model is None and new_samples < MIN_TRAIN_SAMPLES:
+            return
+        if model is not None and new_samples < MIN_NEW_SAMPLES:
+            return
+
+        rows = self.store.load(host, TRAINING_WINDOW)
+        X = np.asarray([features for _, features in rows], dtype=np.float64)
+        start = time.perf_counter()
+
+        if model is None or model.n_estimators + TREES_PER_UPDATE > MAX_TREES:
+            # Полное обучение на окне последних снимков
+            model = IsolationForest(n_estimators=BASE_TREES, warm_start=True, random_state=0)
+        else:
+            # Дообучение: новые деревья строятся на окне с новыми снимками,
+            # ранее построенные деревья сохраняются
+            model.set_params(n_estimators=model.n_estimators + TREES_PER_UPDATE)
+        model.fit(X)
+
+        trained_until = rows[-1][0]
+        joblib.dump({'model': model, 'trained_until': trained_until, 'features': FEATURE_NAMES}, self.model_path(host))
+        compiled = CompiledIsolationForest(model)
+        self.models[host] = (model, trained_until)
+        self.compiled[host] = compiled
+        self.logger.info("Модель аномалий для %s обучена на %d снимках (%d деревьев) за %.2f с",
+                         host, len(X), model.n_estimators, time.perf_counter() - start)
+
+    def _training_loop(self):
+        """Фоновое обучение моделей по расписанию"""
+        try:
+            self.load_models()
+        except Exception as e:
+            self.logger.error("Ошибка при загрузке моделей аномалий: %s", e)
+
+        interval = self.config.get('anomaly_retrain_interval_min', DEFAULT_RETRAIN_INTERVAL_MIN) * 60
+        while True:
+            for host in self.store.hosts():
+                try:
+                    self.train_host(host)
+                except Exception as e:
+                    self.logger.error("Ошибка при обучении модели аномалий для %s: %s", host, e)
+            if self.stop_event.wait(interval):
+                break
+
+    def extend_diagnostics(self, diagnostics_result, hardware_info, token_callback=None, components=None,
+                           cancel_token=None):
+        """Сохранение снимка и оценка его текущей моделью"""
+        # Модель описывает систему целиком, частичная диагностика ее не использует
+        if components is not None:
+            return
+        if cancel_token is not None:
+            cancel_token.raise_if_cancelled()
+
+        host = host_key(hardware_info)
+        features = extract_features(hardware_info)
+        scan_time = hardware_info.get('scan_time')
+        if scan_time is not None and scan_time != self.last_scan_time.get(host):
+            self.store.append(host, scan_time, features)
+            self.last_scan_time[host] = scan_time
+
+        compiled = self.compiled.get(host)
+        if compiled is None:
+            # Модель еще не обучена: истории недостаточно
+            diagnostics_result['multivariate_score'] = None
+            return
+
+        score = compiled.score(features)
+        diagnostics_result['multivariate_score'] = round(float(score), 4)
+        if compiled.is_anomaly(score):
+            message = f"Нетипичное сочетание показателей системы (оценка аномальности {-score:.2f})"
+            diagnostics_result['issues'].append({
+                'component': 'system',
+                'severity': 'warning',
+                'message': message,
+                'source': 'multivariate',
+                'score': round(float(score), 4)
+            })
+            if token_callback is not None:
+                token_callback('system', message + '\n')
+
+    def close(self):
+        """Остановка фонового обучения и закрытие истории"""
+        self.stop_event.set()
+        self.training_thread.join(timeout=1)
+        self.store.close()
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Модуль рекомендаций на основе поиска по корпусу готовых советов
+
+Корпус рекомендаций (resources/remediation_corpus.json) векторизуется
+один раз, матрица векторов сохраняется на диск в float16 и при запуске
+отображается в память. При диагностике векторизуется описание найденных
+проблем, и ближайшие рекомендации находятся одним умножением матрицы
+на вектор - без генерации текста моделью.
+
+Используется необязательным бэкендом "retrieval" (см. backends.py).
+"""
+
+import os
+import re
+import json
+import zlib
+import hashlib
+import logging
+import argparse
+
+import numpy as np
+
+from src.ai.history_store import app_dir
+
+# Корпус рекомендаций и матрица его векторов (относительно каталога приложения)
+CORPUS_PATH = os.path.join('resources', 'remediation_corpus.json')
+EMBEDDINGS_PATH = os.path.join('data', 'recommendation_embeddings.npy')
+
+# Размерность векторов
+EMBEDDING_DIM = 512
+
+# Число рекомендаций по умолчанию
+DEFAULT_TOP_K = 5
+
+# Минимальное сходство, при котором рекомендация считается подходящей
+MIN_SIMILARITY = 0.05
+
+# Компоненты в тексте запроса и корпуса
+COMPONENT_TERMS = {
+    'cpu': 'процессор',
+    'gpu': 'видеокарта',
+    'memory': 'память',
+    'storage': 'диск',
+    'network': 'сеть',
+    'system': 'система'
+}
+
+WORD_PATTERN = re.compile(r'\w+')
+
+class HashingEmbedder:
+    """Векторизация текста хешированием слов, пар слов и символьных n-грамм
+
+    Не требует обучения и загрузки моделей: признак отображается в номер
+    координаты по CRC32, знак определяется отдельным битом хеша. Символьные
+    4-граммы делают векторы устойчивыми к окончаниям русских слов.
+    """
+
+    def __init__(self, dim=EMBEDDING_DIM):
+        self.dim = dim
+
+    def features(self, text):
+        """Признаки текста"""
+        words = WORD_PATTERN.findall(text.lower())
+        features = ['w:' + word for word in words]
+        features += ['b:' + first + ' ' + second for first, second in zip(words, words[1:])]
+        for word in words:
+            padded = f"<{word}>"
+            features += ['c:' + padded[i:i + 4] for i in range(max(len(padded) - 3, 1))]
+        return features
+
+    def embed(self, text):
+        """Нормированный вектор текста"""
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for feature in self.features(text):
+            h = zlib.crc32(feature.encode('utf-8'))
+            vector[h % self.dim] += 1.0 if (h >> 31) & 1 else -1.0
+        # Сублинейное масштабирование частот
+        vector = np.sign(vector) * np.log1p(np.abs(vector))
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+def load_corpus(path=None):
+    """Загрузка корпуса рекомендаций и его контрольной суммы"""
+    path = path or os.path.join(app_dir(), CORPUS_PATH)
+    with open(path, 'rb') as f:
+        data = f.read()
+    return json.loads(data.decode('utf-8')), hashlib.sha256(data).hexdigest()
+
+def corpus_text(entry):
+    """Текст записи корпуса для векторизации"""
+    return f"{COMPONENT_TERMS.get(entry['component'], entry['component'])} {entry['text']}"
+
+def build_embeddings(corpus, embedder, path, corpus_hash):
+    """Векторизация корпуса и сохранение матрицы float16 с описанием"""
+    matrix = np.stack([embedder.embed(corpus_text(entry)) for entry in corpus]).astype(np.float16)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    np.save(path, matrix)
+    with open(path + '.json', 'w', encoding='utf-8') as f:
+        json.dump({'corpus_sha256': corpus_hash, 'dim': embedder.dim, 'size': len(corpus)}, f)
+    return matrix
+
+class RetrievalRecommender:
+    """Класс для подбора рекомендаций поиском по корпусу"""
+
+    def __init__(self, config=None):
+        """Инициализация: отображение матрицы векторов корпуса в память"""
+        self.config = config or {}
+        self.logger = logging.getLogger('retrieval')
+        self.embedder = HashingEmbedder()
+        self.corpus, corpus_hash = load_corpus()
+        self.embeddings = self.load_embeddings(os.path.join(app_dir(), EMBEDDINGS_PATH), corpus_hash)
+
+    def load_embeddings(self, path, corpus_hash):
+        """Загрузка матрицы векторов; при изменении корпуса она пересчитывается"""
+        try:
+            with open(path + '.json', 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            if meta.get('corpus_sha256') == corpus_hash and meta.get('dim') == self.embedder.dim:
+                return np.load(path, mmap_mode='r')
+        except (OSError, ValueError) as e:
+            self.logger.info("Матрица векторов рекомендаций недоступна: %s", e)
+
+        self.logger.info("Векторизация корпуса рекомендаций (%d записей)", len(self.corpus))
+        build_embeddings(self.corpus, self.embedder, path, corpus_hash)
+        return np.load(path, mmap_mode='r')
+
+    def build_query(self, issues):
+        """Текст запроса из найденных проблем"""
+        parts = []
+        for issue in issues:
+            parts.append(COMPONENT_TERMS.get(issue['component'], issue['component']))
+            parts.append(issue['message'])
+            if issue.get('metric_name'):
+                parts.append(issue['metric_name'])
+        return ' '.join(parts)
+
+    def recommend(self, issues, top_k=None):
+        """Ближайшие к описанию проблем рекомендации корпуса
+
+        Возвращает список пар (запись корпуса, сходство) по убыванию сходства.
+        """
+        top_k = top_k or self.config.get('recommendation_top_k', DEFAULT_TOP_K)
+        query = self.embedder.embed(self.build_query(issues))
+        scores = self.embeddings @ query.astype(np.float16)
+        count = min(top_k, len(scores))
+        best = np.argpartition(-scores, count - 1)[:count]
+        best = best[np.argsort(-scores[best])]
+        return [(self.corpus[i], float(scores[i])) for i in best if scores[i] >= MIN_SIMILARITY]
+
+    def extend_diagnostics(self, diagnostics_result, hardware_info, token_callback=None, components=None,
+                           cancel_token=None):
+        """Замена рекомендаций результата найденными в корпусе"""
+        if cancel_token is not None:
+            cancel_token.raise_if_cancelled()
+
+        # Сообщение об отсутствии проблем не требует поиска
+        issues = [issue for issue in diagnostics_result.get('issues', []) if issue['severity'] != 'info']
+        if not issues:
+            return
+
+        matches = self.recommend(issues)
+        if not matches:
+            return
+
+        recommendations = [entry['text'] for entry, _ in matches]
+        diagnostics_result['recommendations'] = recommendations
+        diagnostics_result.setdefault('served_by', {})['recommendations'] = 'retrieval'
+        if token_callback is not None:
+            for recommendation in recommendations:
+                token_callback('recommendations', recommendation + '\n')
+
+def main():
+    """Пересчет матрицы векторов корпуса из командной строки"""
+    parser = argparse.ArgumentParser(description='Векторизация корпуса рекомендаций')
+    parser.add_argument('--corpus', default=os.path.join(app_dir(), CORPUS_PATH), help='Путь к корпусу')
+    parser.add_argument('--output', default=os.path.join(app_dir(), EMBEDDINGS_PATH), help='Путь к матрице векторов')
+    args = parser.parse_args()
+
+    corpus, corpus_hash = load_corpus(args.corpus)
+    matrix = build_embeddings(corpus, HashingEmbedder(), args.output, corpus_hash)
+    print(f"Сохранено {matrix.shape[0]} векторов размерности {matrix.shape[1]} в {args.output}")
+
+if __name__ == '__main__':
+    main()
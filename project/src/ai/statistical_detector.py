@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Модуль потокового выявления аномалий в показателях компонентов
+
+Для каждого показателя каждого компьютера в памяти хранится базовая линия
+(экспоненциально взвешенные среднее и дисперсия), которая обновляется
+за O(1) на каждый новый отсчет. Используется бэкендом "statistical"
+уровней детализации "Стандартный" и "Расширенный" (см. backends.py).
+Не требует загрузки моделей.
+"""
+
+import math
+import logging
+import threading
+
+from src.ai.history_store import host_key
+
+# Отслеживаемые показатели: (компонент, ключ, название, ключ истории, минимальное СКО)
+# Ряды истории сканера используются для начального заполнения базовой линии;
+# минимальное СКО не дает стабильному показателю давать огромные оценки
+# при небольших изменениях.
+MONITORED_METRICS = [
+    ('cpu', 'usage', 'загрузка', 'usage_history', 2.0),
+    ('cpu', 'temperature', 'температура', None, 1.0),
+    ('gpu', 'usage', 'загрузка', 'usage_history', 2.0),
+    ('gpu', 'temperature', 'температура', None, 1.0),
+    ('gpu', 'memory_usage_percent', 'использование памяти', 'memory_usage_history', 2.0),
+    ('memory', 'usage_percent', 'использование', 'usage_history', 1.0),
+    ('memory', 'swap_percent', 'использование файла подкачки', None, 1.0),
+    ('network', 'ping', 'задержка', None, 2.0)
+]
+
+# Порог робастной z-оценки, выше которого значение считается аномальным
+DEFAULT_Z_THRESHOLD = 3.5
+
+# Коэффициент сглаживания EWMA по умолчанию
+DEFAULT_EWMA_ALPHA = 0.1
+
+# Число отсчетов, после которого базовая линия считается установившейся
+MIN_BASELINE_SAMPLES = 10
+
+# Ограничение отклонения при обновлении базовой линии, в СКО
+UPDATE_CLIP_SIGMA = 3.0
+
+class EWMABaseline:
+    """Экспоненциально взвешенные среднее и дисперсия одного показателя"""
+
+    __slots__ = ('mean', 'var', 'count', 'min_std')
+
+    def __init__(self, min_std=1.0):
+        self.mean = 0.0
+        self.var = 0.0
+        self.count = 0
+        self.min_std = min_std
+
+    @property
+    def std(self):
+        """СКО базовой линии с учетом нижней границы"""
+        return max(math.sqrt(self.var), self.min_std)
+
+    def score(self, value):
+        """z-оценка значения относительно базовой линии
+
+        Возвращает None, пока базовая линия не установилась.
+        """
+        if self.count < MIN_BASELINE_SAMPLES:
+            return None
+        return (value - self.mean) / self.std
+
+    def update(self, value, alpha):
+        """Учет нового отсчета за O(1)
+
+        Отклонение ограничивается UPDATE_CLIP_SIGMA СКО (оценка Хьюбера),
+        поэтому единичные выбросы не смещают базовую линию.
+        """
+        if self.count == 0:
+            self.mean = float(value)
+            self.count = 1
+            return
+
+        diff = value - self.mean
+        if self.count >= MIN_BASELINE_SAMPLES:
+            limit = UPDATE_CLIP_SIGMA * self.std
+            diff = max(-limit, min(limit, diff))
+
+        increment = alpha * diff
+        self.mean += increment
+        self.var = (1 - alpha) * (self.var + diff * increment)
+        self.count += 1
+
+class StatisticalAnomalyDetector:
+    """Класс для потокового выявления аномалий по базовым линиям показателей"""
+
+    def __init__(self, config=None):
+        """Инициализация детектора аномалий"""
+        self.config = config or {}
+        self.logger = logging.getLogger('statistical_detector')
+
+        # Базовые линии по компьютерам: {хост: {(компонент, ключ): EWMABaseline}}
+        self.baselines = {}
+        # Время последнего учтенного сканирования по компьютерам
+        self.last_scan_time = {}
+        self.lock = threading.Lock()
+
+    def detect(self, hardware_info, components=None, cancel_token=None):
+        """Оценка текущих показателей и обновление базовых линий
+
+        Показатели одного сканирования учитываются в базовой линии один раз,
+        повторная диагностика того же сканирования только оценивает их.
+        """
+        threshold = self.config.get('anomaly_z_threshold', DEFAULT_Z_THRESHOLD)
+        alpha = self.config.get('anomaly_ewma_alpha', DEFAULT_EWMA_ALPHA)
+        host = host_key(hardware_info)
+        scan_time = hardware_info.get('scan_time')
+        anomalies = []
+
+        with self.lock:
+            host_baselines = self.baselines.setdefault(host, {})
+            is_new_scan = scan_time is None or scan_time != self.last_scan_time.get(host)
+
+            for component, key, metric_name, history_key, min_std in MONITORED_METRICS:
+                if components is not None and component not in components:
+                    continue
+                if cancel_token is not None:
+                    cancel_token.raise_if_cancelled()
+
+                component_info = hardware_info.get(component, {})
+                value = component_info.get(key)
+                if not isinstance(value, (int, float)):
+                    continue
+
+                baseline = host_baselines.get((component, key))
+                if baseline is None:
+                    # Начальное заполнение базовой линии историей сканера
+                    baseline = host_baselines[(component, key)] = EWMABaseline(min_std)
+                    history = component_info.get(history_key) if history_key else None
+                    for sample in history or []:
+                        baseline.update(sample, alpha)
+
+                score = baseline.score(value)
+                if score is not None and abs(score) > threshold:
+                    anomalies.append({
+                        'component': component,
+                        'metric': key,
+                        'metric_name': metric_name,
+                        'value': value,
+                        'baseline': round(baseline.mean, 2),
+                        'score': round(score, 2)
+                    })
+
+                if is_new_scan:
+                    baseline.update(value, alpha)
+
+            if is_new_scan and scan_time is not None:
+                self.last_scan_time[host] = scan_time
+
+        return anomalies
+
+    def extend_diagnostics(self, diagnostics_result, hardware_info, token_callback=None, components=None,
+                           cancel_token=None):
+        """Дополнение результата диагностики найденными аномалиями"""
+        anomalies = self.detect(hardware_info, components, cancel_token)
+
+        for anomaly in anomalies:
+            direction = 'рост' if anomaly['score'] > 0 else 'падение'
+            message = (f"Нетипичный {direction} показателя \"{anomaly['metric_name']}\": "
+                       f"{anomaly['value']:.1f} при обычном {anomaly['baseline']:.1f} "
+                       f"(отклонение {abs(anomaly['score']):.1f} СКО)")
+            diagnostics_result['issues'].append({
+                'component': anomaly['component'],
+                'severity': 'warning',
+                'message': message,
+                'source': 'anomaly',
+                'metric': anomaly['metric'],
+                'value': anomaly['value'],
+                'baseline': anomaly['baseline'],
+                'z_score': anomaly['score']
+            })
+            if token_callback is not None:
+                token_callback(anomaly['component'], message + '\n')
+
+        diagnostics_result['anomalies'] = anomalies
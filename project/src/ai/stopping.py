@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Критерии остановки генерации текста для модели диагностики
+"""
+
+import time
+
+import torch
+from transformers import StoppingCriteria
+
+class CallbackStoppingCriteria(StoppingCriteria):
+    """Остановка генерации по сигналу внешней функции
+
+    should_stop возвращает True/False для всего пакета или список значений
+    по одному на последовательность: остановленные последовательности
+    завершаются, остальные продолжают генерацию.
+    """
+
+    def __init__(self, should_stop):
+        self.should_stop = should_stop
+
+    def __call__(self, input_ids, scores, **kwargs):
+        stop = self.should_stop()
+        if isinstance(stop, (list, tuple)):
+            return torch.tensor(stop, dtype=torch.bool, device=input_ids.device)
+        return torch.full((input_ids.shape[0],), bool(stop), dtype=torch.bool, device=input_ids.device)
+
+class DeadlineStoppingCriteria(StoppingCriteria):
+    """Остановка генерации по истечении бюджета времени
+
+    deadline - момент времени по часам time.monotonic().
+    """
+
+    def __init__(self, deadline):
+        self.deadline = deadline
+
+    def __call__(self, input_ids, scores, **kwargs):
+        return torch.full((input_ids.shape[0],), time.monotonic() >= self.deadline, dtype=torch.bool, device=input_ids.device)
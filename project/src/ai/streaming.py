@@ -0,0 +1,20 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Потоковая выдача текста при генерации модели диагностики
+"""
+
+from transformers import TextStreamer
+
+class CallbackTextStreamer(TextStreamer):
+    """Передача сгенерированного текста в функцию обратного вызова по мере декодирования"""
+
+    def __init__(self, tokenizer, callback):
+        # Текст запроса не передается, только продолжение модели
+        super().__init__(tokenizer, skip_prompt=True, skip_special_tokens=True)
+        self.callback = callback
+
+    def on_finalized_text(self, text, stream_end=False):
+        if text:
+            self.callback(text)
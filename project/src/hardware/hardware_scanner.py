@@ -15,6 +15,9 @@ import random
 import time
 from datetime import datetime
 
+from src.hardware.thresholds import ISSUE_THRESHOLDS, CORE_SPREAD_THRESHOLD
+from src.utils.cancellation import OperationCancelledError
+
 # Импорт зависимостей для работы с аппаратным обеспечением
 try:
     import psutil
@@ -55,34 +58,52 @@ class HardwareScanner:
         else:
             self.wmi_initialized = False
             
-    def scan_all(self):
-        """Сканирование всего аппаратного обеспечения"""
-        hardware_info = {}
-        
-        # Сканирование системной информации
-        hardware_info['system'] = self.scan_system_info()
+    def scan_all(self, cancel_token=None, progress_callback=None):
+        """Сканирование всего аппаратного обеспечения
         
-        # Сканирование процессора
-        hardware_info['cpu'] = self.scan_cpu()
-        
-        # Сканирование видеокарты
-        hardware_info['gpu'] = self.scan_gpu()
-        
-        # Сканирование памяти
-        hardware_info['memory'] = self.scan_memory()
+        cancel_token - необязательный CancellationToken, проверяемый перед
+        каждым этапом сканирования и внутри этапов при переборе устройств;
+        при отмене возбуждается OperationCancelledError. progress_callback -
+        необязательная функция, получающая процент выполнения после
+        каждого этапа.
+        """
+        hardware_info = {}
         
-        # Сканирование хранилища
-        hardware_info['storage'] = self.scan_storage()
+        # Этапы сканирования: ключ результата и метод сбора данных
+        stages = [
+            ('system', self.scan_system_info),
+            ('cpu', self.scan_cpu),
+            ('gpu', self.scan_gpu),
+            ('memory', self.scan_memory),
+            ('storage', self.scan_storage),
+            ('network', self.scan_network)
+        ]
         
-        # Сканирование сети
-        hardware_info['network'] = self.scan_network()
+        for i, (key, scan) in enumerate(stages):
+            self.check_cancelled(cancel_token)
+            hardware_info[key] = scan(cancel_token)
+            if progress_callback is not None:
+                progress_callback(round((i + 1) * 100 / (len(stages) + 1)))
         
+        self.check_cancelled(cancel_token)
+            
         # Генерация рекомендаций на основе собранных данных
         hardware_info['recommendations'] = self.generate_recommendations(hardware_info)
         
+        # Время сканирования: по нему детектор аномалий учитывает каждый снимок один раз
+        hardware_info['scan_time'] = time.time()
+        if progress_callback is not None:
+            progress_callback(100)
+        
         return hardware_info
         
-    def scan_system_info(self):
+    @staticmethod
+    def check_cancelled(cancel_token):
+        """Возбуждение OperationCancelledError, если запрошена отмена"""
+        if cancel_token is not None:
+            cancel_token.raise_if_cancelled()
+            
+    def scan_system_info(self, cancel_token=None):
         """Сканирование общей информации о системе"""
         system_info = {}
         
@@ -110,6 +131,7 @@ class HardwareScanner:
         system_info['ram_info'] = f"{round(memory.total / (1024**3), 2)} ГБ"
         
         # Информация о материнской плате (только для Windows)
+        self.check_cancelled(cancel_token)
         if self.os_name == "Windows" and self.wmi_initialized:
             try:
                 for board in self.wmi_client.Win32_BaseBoard():
@@ -121,6 +143,7 @@ class HardwareScanner:
             system_info['motherboard'] = 'Не удалось определить'
             
         # Информация о BIOS (только для Windows)
+        self.check_cancelled(cancel_token)
         if self.os_name == "Windows" and self.wmi_initialized:
             try:
                 for bios in self.wmi_client.Win32_BIOS():
@@ -143,7 +166,7 @@ class HardwareScanner:
         
         return system_info
         
-    def scan_cpu(self):
+    def scan_cpu(self, cancel_token=None):
         """Сканирование информации о процессоре"""
         cpu_info = {}
         
@@ -176,6 +199,7 @@ class HardwareScanner:
         cpu_info['usage_history'] = self.generate_usage_history(base=70, variance=20)
         
         # Температура процессора (если доступно)
+        self.check_cancelled(cancel_token)
         if hasattr(psutil, "sensors_temperatures"):
             temps = psutil.sensors_temperatures()
             if temps:
@@ -198,7 +222,7 @@ class HardwareScanner:
         
         return cpu_info
         
-    def scan_gpu(self):
+    def scan_gpu(self, cancel_token=None):
         """Сканирование информации о видеокарте"""
         gpu_info = {}
         
@@ -221,6 +245,7 @@ class HardwareScanner:
                 gpu_info['temperature'] = gpu.temperature
                 
                 # Дополнительная информация (только для Windows)
+                self.check_cancelled(cancel_token)
                 if self.os_name == "Windows" and self.wmi_initialized:
                     try:
                         for video_controller in self.wmi_client.Win32_VideoController():
@@ -257,6 +282,8 @@ class HardwareScanner:
                 gpu_info['memory_usage_history'] = [0] * 60
                 gpu_info['health_score'] = 0
                 gpu_info['issues'] = ['Видеокарта не обнаружена или не поддерживается']
+        except OperationCancelledError:
+            raise
         except Exception as e:
             # В случае ошибки заполняем данные заглушками
             gpu_info['model'] = 'Ошибка определения'
@@ -276,7 +303,7 @@ class HardwareScanner:
             
         return gpu_info
         
-    def scan_memory(self):
+    def scan_memory(self, cancel_token=None):
         """Сканирование информации об оперативной памяти"""
         memory_info = {}
         
@@ -290,6 +317,10 @@ class HardwareScanner:
         memory_info['free'] = round(virtual_memory.available / (1024**3), 2)
         memory_info['usage_percent'] = virtual_memory.percent
         
+        # Точные значения в байтах для прогноза исчерпания памяти
+        memory_info['used_bytes'] = virtual_memory.total - virtual_memory.available
+        memory_info['total_bytes'] = virtual_memory.total
+        
         # Информация о файле подкачки
         memory_info['swap_total'] = round(swap_memory.total / (1024**3), 2)
         memory_info['swap_used'] = round(swap_memory.used / (1024**3), 2)
@@ -305,6 +336,7 @@ class HardwareScanner:
         if self.os_name == "Windows" and self.wmi_initialized:
             try:
                 for module in self.wmi_client.Win32_PhysicalMemory():
+                    self.check_cancelled(cancel_token)
                     module_info = {
                         'slot': module.DeviceLocator,
                         'size': round(int(module.Capacity) / (1024**3), 2),
@@ -314,6 +346,8 @@ class HardwareScanner:
                         'part_number': module.PartNumber
                     }
                     memory_info['modules'].append(module_info)
+            except OperationCancelledError:
+                raise
             except Exception:
                 # Если не удалось получить информацию о модулях, создаем заглушки
                 memory_info['modules'] = self.generate_memory_modules(memory_info['total'])
@@ -339,7 +373,7 @@ class HardwareScanner:
         
         return memory_info
         
-    def scan_storage(self):
+    def scan_storage(self, cancel_token=None):
         """Сканирование информации о хранилище"""
         storage_info = {}
         
@@ -351,6 +385,7 @@ class HardwareScanner:
         if self.os_name == "Windows" and self.wmi_initialized:
             try:
                 for disk in self.wmi_client.Win32_DiskDrive():
+                    self.check_cancelled(cancel_token)
                     disk_info = {
                         'device': disk.DeviceID,
                         'model': disk.Model,
@@ -362,6 +397,8 @@ class HardwareScanner:
                         'usage_percent': random.randint(30, 90)
                     }
                     storage_info['disks'].append(disk_info)
+            except OperationCancelledError:
+                raise
             except Exception:
                 # Если не удалось получить информацию о дисках, создаем заглушки
                 storage_info['disks'] = self.generate_disk_info()
@@ -371,6 +408,8 @@ class HardwareScanner:
             
         # Получение информации о разделах
         for partition in psutil.disk_partitions():
+            # Опрос раздела (например, сетевого) может длиться долго
+            self.check_cancelled(cancel_token)
             try:
                 usage = psutil.disk_usage(partition.mountpoint)
                 partition_info = {
@@ -380,13 +419,26 @@ class HardwareScanner:
                     'size': round(usage.total / (1024**3), 2),
                     'used': round(usage.used / (1024**3), 2),
                     'free': round(usage.free / (1024**3), 2),
-                    'usage_percent': usage.percent
+                    'usage_percent': usage.percent,
+                    'used_bytes': usage.used,
+                    'total_bytes': usage.total
                 }
                 storage_info['partitions'].append(partition_info)
             except (PermissionError, FileNotFoundError):
                 # Пропускаем разделы, к которым нет доступа
                 continue
                 
+        # Средняя задержка операций ввода-вывода с момента загрузки системы, мс
+        storage_info['io_latency_ms'] = 0
+        try:
+            io_counters = psutil.disk_io_counters()
+            if io_counters:
+                operations = io_counters.read_count + io_counters.write_count
+                if operations > 0:
+                    storage_info['io_latency_ms'] = round((io_counters.read_time + io_counters.write_time) / operations, 3)
+        except Exception:
+            pass
+            
         # История активности дисков (имитация для демонстрации)
         storage_info['activity_history'] = self.generate_usage_history(base=20, variance=15)
         
@@ -398,7 +450,7 @@ class HardwareScanner:
         
         return storage_info
         
-    def scan_network(self):
+    def scan_network(self, cancel_token=None):
         """Сканирование информации о сети"""
         network_info = {}
         
@@ -407,6 +459,7 @@ class HardwareScanner:
         
         # Получение информации о сетевых интерфейсах
         for interface_name, interface_addresses in psutil.net_if_addrs().items():
+            self.check_cancelled(cancel_token)
             interface_info = {
                 'name': interface_name,
                 'ip': 'Н/Д',
@@ -453,6 +506,18 @@ class HardwareScanner:
         network_info['download_speed'] = random.randint(50, 500)
         network_info['upload_speed'] = random.randint(10, 100)
         
+        # Доля ошибочных и отброшенных пакетов с момента загрузки системы, %
+        network_info['error_percent'] = 0
+        try:
+            net_counters = psutil.net_io_counters()
+            packets = net_counters.packets_sent + net_counters.packets_recv
+            errors = net_counters.errin + net_counters.errout + net_counters.dropin + net_counters.dropout
+            network_info['errors'] = errors
+            if packets > 0:
+                network_info['error_percent'] = round(errors * 100 / packets, 4)
+        except Exception:
+            pass
+            
         # История сетевой активности (имитация для демонстрации)
         network_info['download_history'] = self.generate_usage_history(base=30, variance=20)
         network_info['upload_history'] = self.generate_usage_history(base=10, variance=5)
@@ -753,12 +818,12 @@ class HardwareScanner:
         temperature = cpu_info.get('temperature', 0)
         if temperature > 85:
             issues.append("Критически высокая температура процессора. Рекомендуется проверить систему охлаждения.")
-        elif temperature > 75:
+        elif temperature > ISSUE_THRESHOLDS['cpu']['temperature']:
             issues.append("Повышенная температура процессора. Рекомендуется улучшить охлаждение.")
             
         # Проверка загрузки
         usage = cpu_info.get('usage', 0)
-        if usage > 90:
+        if usage > ISSUE_THRESHOLDS['cpu']['usage']:
             issues.append("Высокая загрузка процессора. Возможно, запущены ресурсоемкие процессы.")
             
         # Проверка неравномерной загрузки ядер
@@ -766,7 +831,7 @@ class HardwareScanner:
         if core_usage:
             max_usage = max(core_usage)
             min_usage = min(core_usage)
-            if max_usage - min_usage > 50:
+            if max_usage - min_usage > CORE_SPREAD_THRESHOLD:
                 issues.append("Неравномерная загрузка ядер процессора. Возможно, некоторые приложения не оптимизированы для многоядерных процессоров.")
                 
         return issues
@@ -779,17 +844,17 @@ class HardwareScanner:
         temperature = gpu_info.get('temperature', 0)
         if temperature > 85:
             issues.append("Критически высокая температура видеокарты. Рекомендуется проверить систему охлаждения.")
-        elif temperature > 75:
+        elif temperature > ISSUE_THRESHOLDS['gpu']['temperature']:
             issues.append("Повышенная температура видеокарты. Рекомендуется улучшить охлаждение.")
             
         # Проверка загрузки
         usage = gpu_info.get('usage', 0)
-        if usage > 90:
+        if usage > ISSUE_THRESHOLDS['gpu']['usage']:
             issues.append("Высокая загрузка видеокарты. Возможно, запущены ресурсоемкие графические приложения.")
             
         # Проверка использования видеопамяти
         memory_usage = gpu_info.get('memory_usage_percent', 0)
-        if memory_usage > 90:
+        if memory_usage > ISSUE_THRESHOLDS['gpu']['memory_usage_percent']:
             issues.append("Высокое использование видеопамяти. Возможно, запущены приложения, требующие большого объема видеопамяти.")
             
         return issues
@@ -802,12 +867,12 @@ class HardwareScanner:
         usage_percent = memory_info.get('usage_percent', 0)
         if usage_percent > 90:
             issues.append("Критически высокое использование оперативной памяти. Рекомендуется закрыть неиспользуемые приложения или увеличить объем памяти.")
-        elif usage_percent > 80:
+        elif usage_percent > ISSUE_THRESHOLDS['memory']['usage_percent']:
             issues.append("Высокое использование оперативной памяти. Возможно, запущено слишком много приложений.")
             
         # Проверка использования файла подкачки
         swap_percent = memory_info.get('swap_percent', 0)
-        if swap_percent > 50:
+        if swap_percent > ISSUE_THRESHOLDS['memory']['swap_percent']:
             issues.append("Высокое использование файла подкачки. Это может привести к снижению производительности системы.")
             
         # Проверка модулей памяти
@@ -0,0 +1,20 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Пороги проверок состояния компонентов
+
+Используются проверками HardwareScanner.detect_*_issues и быстрой
+пороговой проверкой перед анализом моделью (llm_engine.py). Модуль не
+зависит от psutil и может импортироваться процессом инференса.
+"""
+
+# Верхние границы нормы метрик: превышение дает предупреждение
+ISSUE_THRESHOLDS = {
+    'cpu': {'temperature': 75, 'usage': 90},
+    'gpu': {'temperature': 75, 'usage': 90, 'memory_usage_percent': 90},
+    'memory': {'usage_percent': 80, 'swap_percent': 50}
+}
+
+# Допустимый разброс загрузки ядер процессора, %
+CORE_SPREAD_THRESHOLD = 50
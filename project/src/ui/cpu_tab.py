@@ -6,13 +6,15 @@
 """
 
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
-                            QFrame, QGridLayout, QSizePolicy, QProgressBar)
+                            QFrame, QGridLayout, QSizePolicy)
 from PyQt5.QtGui import QFont
 from PyQt5.QtCore import Qt
 
-from src.ui.widgets.performance_chart import PerformanceChart
+from src.ui.widgets.time_series_chart import TimeSeriesChart
+from src.ui.widgets.deferred_update import DeferredUpdateMixin
+from src.ui.widgets.core_heatmap import CoreHeatmap
 
-class CPUTab(QWidget):
+class CPUTab(DeferredUpdateMixin, QWidget):
     """Вкладка с информацией о процессоре"""
     
     def __init__(self):
@@ -82,37 +84,12 @@ class CPUTab(QWidget):
         usage_layout = QHBoxLayout()
         
         # График загрузки
-        self.cpu_chart = PerformanceChart("Загрузка ЦП", "%")
+        self.cpu_chart = TimeSeriesChart("Загрузка ЦП", "%")
         usage_layout.addWidget(self.cpu_chart)
         
-        # Информация о загрузке ядер
-        cores_frame = QFrame()
-        cores_frame.setFrameShape(QFrame.StyledPanel)
-        cores_frame.setFrameShadow(QFrame.Raised)
-        cores_layout = QVBoxLayout(cores_frame)
-        
-        cores_header = QLabel("Загрузка ядер")
-        cores_header.setFont(QFont("Segoe UI", 10, QFont.Bold))
-        cores_header.setAlignment(Qt.AlignCenter)
-        cores_layout.addWidget(cores_header)
-        
-        self.core_bars = []
-        for i in range(8):  # Предполагаем максимум 8 ядер для отображения
-            core_layout = QHBoxLayout()
-            core_label = QLabel(f"Ядро {i+1}:")
-            core_bar = QProgressBar()
-            core_bar.setRange(0, 100)
-            core_bar.setValue(0)
-            core_bar.setTextVisible(True)
-            core_bar.setFormat("%v%")
-            
-            core_layout.addWidget(core_label)
-            core_layout.addWidget(core_bar)
-            
-            cores_layout.addLayout(core_layout)
-            self.core_bars.append(core_bar)
-            
-        usage_layout.addWidget(cores_frame)
+        # Загрузка всех ядер: тепловая карта ядра x время
+        self.core_heatmap = CoreHeatmap("Загрузка ядер")
+        usage_layout.addWidget(self.core_heatmap)
         
         main_layout.addLayout(usage_layout)
         
@@ -138,6 +115,16 @@ class CPUTab(QWidget):
         main_layout.addWidget(spacer)
         
     def update_info(self, cpu_info):
+        """Запись отсчета загрузки ядер и отложенная отрисовка остальных данных
+        
+        История ядер пополняется и пока вкладка скрыта, чтобы в тепловой
+        карте не было пропусков.
+        """
+        if cpu_info:
+            self.core_heatmap.add_sample(cpu_info.get('core_usage', []))
+        super().update_info(cpu_info)
+        
+    def render_info(self, cpu_info):
         """Обновление информации о процессоре"""
         if not cpu_info:
             return
@@ -165,50 +152,8 @@ class CPUTab(QWidget):
         # Обновление графика загрузки
         self.cpu_chart.update_data(cpu_info.get('usage_history', []))
         
-        # Обновление загрузки ядер
-        core_usage = cpu_info.get('core_usage', [])
-        for i, bar in enumerate(self.core_bars):
-            if i < len(core_usage):
-                bar.setValue(int(core_usage[i]))
-                # Цветовая индикация загрузки
-                if core_usage[i] >= 90:
-                    bar.setStyleSheet("""
-                        QProgressBar {
-                            border: 1px solid #cccccc;
-                            border-radius: 4px;
-                            text-align: center;
-                        }
-                        QProgressBar::chunk {
-                            background-color: #F44336;
-                            border-radius: 3px;
-                        }
-                    """)
-                elif core_usage[i] >= 70:
-                    bar.setStyleSheet("""
-                        QProgressBar {
-                            border: 1px solid #cccccc;
-                            border-radius: 4px;
-                            text-align: center;
-                        }
-                        QProgressBar::chunk {
-                            background-color: #FF9800;
-                            border-radius: 3px;
-                        }
-                    """)
-                else:
-                    bar.setStyleSheet("""
-                        QProgressBar {
-                            border: 1px solid #cccccc;
-                            border-radius: 4px;
-                            text-align: center;
-                        }
-                        QProgressBar::chunk {
-                            background-color: #4CAF50;
-                            border-radius: 3px;
-                        }
-                    """)
-            else:
-                bar.setValue(0)
+        # Обновление сводки загрузки ядер (отсчет добавлен в update_info)
+        self.core_heatmap.update_summary()
                 
         # Обновление диагностики
         issues = cpu_info.get('issues', [])
@@ -12,9 +12,10 @@ from PyQt5.QtCore import Qt
 
 from src.ui.widgets.system_info_card import SystemInfoCard
 from src.ui.widgets.health_indicator import HealthIndicator
-from src.ui.widgets.performance_chart import PerformanceChart
+from src.ui.widgets.time_series_chart import TimeSeriesChart
+from src.ui.widgets.deferred_update import DeferredUpdateMixin
 
-class DashboardTab(QWidget):
+class DashboardTab(DeferredUpdateMixin, QWidget):
     """Вкладка с обзором системы"""
     
     def __init__(self):
@@ -54,8 +55,8 @@ class DashboardTab(QWidget):
         # Графики производительности
         charts_layout = QHBoxLayout()
         
-        self.cpu_chart = PerformanceChart("Загрузка ЦП", "%")
-        self.memory_chart = PerformanceChart("Использование памяти", "ГБ")
+        self.cpu_chart = TimeSeriesChart("Загрузка ЦП", "%")
+        self.memory_chart = TimeSeriesChart("Использование памяти", "ГБ")
         
         charts_layout.addWidget(self.cpu_chart)
         charts_layout.addWidget(self.memory_chart)
@@ -83,7 +84,7 @@ class DashboardTab(QWidget):
         spacer.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
         main_layout.addWidget(spacer)
         
-    def update_info(self, hardware_info):
+    def render_info(self, hardware_info):
         """Обновление информации на вкладке"""
         if not hardware_info:
             return
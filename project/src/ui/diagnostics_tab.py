@@ -8,32 +8,63 @@
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
                             QFrame, QGridLayout, QSizePolicy, QPushButton,
                             QTextEdit, QProgressBar, QComboBox)
-from PyQt5.QtGui import QFont, QColor
+from PyQt5.QtGui import QFont, QColor, QTextCursor
 from PyQt5.QtCore import Qt, QThread, pyqtSignal
 
-from src.ai.diagnostics_engine import DiagnosticsEngine
+from src.utils.cancellation import CancellationToken, OperationCancelledError
+
+# Названия компонентов для отображения
+COMPONENT_NAMES = {
+    'cpu': 'Процессор',
+    'gpu': 'Видеокарта',
+    'memory': 'Оперативная память',
+    'storage': 'Хранилище',
+    'network': 'Сеть',
+    'system': 'Система'
+}
+
+# Типы диагностики и компоненты, которыми она ограничивается (None - все)
+DIAGNOSTICS_TYPES = [
+    ("Полная диагностика", None),
+    ("Диагностика процессора", ['cpu']),
+    ("Диагностика видеокарты", ['gpu']),
+    ("Диагностика памяти", ['memory']),
+    ("Диагностика хранилища", ['storage']),
+    ("Диагностика сети", ['network'])
+]
 
 class DiagnosticsThread(QThread):
     """Поток для выполнения диагностики"""
     progress_signal = pyqtSignal(int)
+    token_signal = pyqtSignal(str, str)
     result_signal = pyqtSignal(dict)
     error_signal = pyqtSignal(str)
     
-    def __init__(self, diagnostics_engine, hardware_info, parent=None):
+    def __init__(self, diagnostics_engine, hardware_info, components=None, parent=None):
         super().__init__(parent)
         self.diagnostics_engine = diagnostics_engine
         self.hardware_info = hardware_info
+        self.components = components
+        self.cancel_token = CancellationToken()
+        
+    def cancel(self):
+        """Запрос отмены диагностики, включая генерацию модели"""
+        self.cancel_token.cancel()
         
     def run(self):
         try:
-            # Имитация прогресса диагностики
-            for i in range(101):
-                self.progress_signal.emit(i)
-                self.msleep(50)  # Задержка для демонстрации прогресса
-                
-            # Выполнение диагностики
-            diagnostics_result = self.diagnostics_engine.run_diagnostics(self.hardware_info)
+            # Выполнение диагностики с потоковой выдачей ответов модели
+            diagnostics_result = self.diagnostics_engine.run_diagnostics(
+                self.hardware_info,
+                token_callback=self.token_signal.emit,
+                components=self.components,
+                cancel_token=self.cancel_token
+            )
+            self.progress_signal.emit(100)
             self.result_signal.emit(diagnostics_result)
+        except OperationCancelledError:
+            # Интерфейс сбрасывается при запросе отмены (cancel_diagnostics)
+            pass
         except Exception as e:
             self.error_signal.emit(str(e))
 
@@ -43,6 +74,7 @@ class DiagnosticsTab(QWidget):
     def __init__(self, diagnostics_engine):
         super().__init__()
         self.diagnostics_engine = diagnostics_engine
+        self.diagnostics_thread = None
         self.init_ui()
         
     def init_ui(self):
@@ -59,17 +91,13 @@ class DiagnosticsTab(QWidget):
         
         # Выбор типа диагностики
         self.diagnostics_type_combo = QComboBox()
-        self.diagnostics_type_combo.addItem("Полная диагностика")
-        self.diagnostics_type_combo.addItem("Диагностика процессора")
-        self.diagnostics_type_combo.addItem("Диагностика видеокарты")
-        self.diagnostics_type_combo.addItem("Диагностика памяти")
-        self.diagnostics_type_combo.addItem("Диагностика хранилища")
-        self.diagnostics_type_combo.addItem("Диагностика сети")
+        for title, components in DIAGNOSTICS_TYPES:
+            self.diagnostics_type_combo.addItem(title, components)
         control_layout.addWidget(self.diagnostics_type_combo)
         
         # Кнопка запуска диагностики
         self.run_button = QPushButton("Запустить диагностику")
-        self.run_button.clicked.connect(self.start_diagnostics)
+        self.run_button.clicked.connect(self.toggle_diagnostics)
         control_layout.addWidget(self.run_button)
         
         main_layout.addLayout(control_layout)
@@ -118,39 +146,98 @@ class DiagnosticsTab(QWidget):
         spacer.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
         main_layout.addWidget(spacer)
         
+    def toggle_diagnostics(self):
+        """Запуск диагностики или отмена текущей"""
+        if self.diagnostics_thread is not None:
+            self.cancel_diagnostics()
+            self.results_text.append("Диагностика отменена")
+        else:
+            self.start_diagnostics()
+            
     def start_diagnostics(self):
         """Запуск диагностики вручную"""
         if not hasattr(self, 'hardware_info') or not self.hardware_info:
             self.results_text.setHtml("<p style='color: #F44336;'>Ошибка: Необходимо сначала выполнить сканирование аппаратного обеспечения</p>")
             return
             
-        self.run_diagnostics(self.hardware_info)
+        self.run_diagnostics(self.hardware_info, self.diagnostics_type_combo.currentData())
+        
+    def run_diagnostics(self, hardware_info, components=None):
+        """Запуск диагностики системы
+        
+        components - список компонентов для диагностики (None - все компоненты).
+        """
+        # Новая диагностика заменяет незавершенную
+        self.cancel_diagnostics()
         
-    def run_diagnostics(self, hardware_info):
-        """Запуск диагностики системы"""
         self.hardware_info = hardware_info
-        self.run_button.setEnabled(False)
+        self.run_button.setText("Отменить диагностику")
         self.progress_bar.setVisible(True)
-        self.progress_bar.setValue(0)
+        # Длительность генерации заранее неизвестна - индикатор без процентов
+        self.progress_bar.setRange(0, 0)
         
         # Очистка предыдущих результатов
         self.results_text.clear()
         self.recommendations_text.clear()
+        self.streaming_component = None
         
-        # Создание и запуск потока диагностики
-        self.diagnostics_thread = DiagnosticsThread(self.diagnostics_engine, hardware_info)
+        # Создание и запуск потока диагностики; поток принадлежит вкладке
+        # и удаляется после фактического завершения
+        self.diagnostics_thread = DiagnosticsThread(self.diagnostics_engine, hardware_info, components, self)
         self.diagnostics_thread.progress_signal.connect(self.update_progress)
+        self.diagnostics_thread.token_signal.connect(self.append_token)
         self.diagnostics_thread.result_signal.connect(self.diagnostics_finished)
         self.diagnostics_thread.error_signal.connect(self.diagnostics_error)
+        self.diagnostics_thread.finished.connect(self.diagnostics_thread.deleteLater)
         self.diagnostics_thread.start()
         
+    def cancel_diagnostics(self):
+        """Отмена текущей диагностики без ожидания завершения потока"""
+        if self.diagnostics_thread is None:
+            return
+            
+        thread = self.diagnostics_thread
+        self.diagnostics_thread = None
+        thread.cancel()
+        
+        # Результаты отмененной диагностики больше не обрабатываются
+        thread.progress_signal.disconnect()
+        thread.token_signal.disconnect()
+        thread.result_signal.disconnect()
+        thread.error_signal.disconnect()
+        
+        self.run_button.setText("Запустить диагностику")
+        self.progress_bar.setRange(0, 100)
+        self.progress_bar.setVisible(False)
+        
     def update_progress(self, value):
         """Обновление прогресс-бара"""
+        self.progress_bar.setRange(0, 100)
         self.progress_bar.setValue(value)
         
+    def append_token(self, component, text):
+        """Добавление фрагмента ответа модели в конец результатов без перерисовки документа"""
+        target = self.recommendations_text if component == 'recommendations' else self.results_text
+        cursor = target.textCursor()
+        cursor.movePosition(QTextCursor.End)
+        
+        # Заголовок при переходе к новому компоненту
+        if component != self.streaming_component:
+            self.streaming_component = component
+            if component != 'recommendations':
+                if not target.document().isEmpty():
+                    cursor.insertBlock()
+                cursor.insertHtml(f"<b>{COMPONENT_NAMES.get(component, component)}:</b> ")
+                
+        cursor.insertText(text)
+        target.setTextCursor(cursor)
+        target.ensureCursorVisible()
+        
     def diagnostics_finished(self, diagnostics_result):
         """Обработка завершения диагностики"""
-        self.run_button.setEnabled(True)
+        self.diagnostics_thread = None
+        self.run_button.setText("Запустить диагностику")
+        self.progress_bar.setRange(0, 100)
         self.progress_bar.setVisible(False)
         
         # Обработка результатов диагностики
@@ -158,7 +245,9 @@ class DiagnosticsTab(QWidget):
         
     def diagnostics_error(self, error_message):
         """Обработка ошибки диагностики"""
-        self.run_button.setEnabled(True)
+        self.diagnostics_thread = None
+        self.run_button.setText("Запустить диагностику")
+        self.progress_bar.setRange(0, 100)
         self.progress_bar.setVisible(False)
         
         self.results_text.setHtml(f"<p style='color: #F44336;'>Ошибка при выполнении диагностики: {error_message}</p>")
@@ -177,19 +266,23 @@ class DiagnosticsTab(QWidget):
         score_color = self.get_score_color(overall_score)
         html_result += f"<p>Общая оценка: <span style='color: {score_color}; font-weight: bold;'>{overall_score}/100</span></p>"
         
+        # Уровень детализации и время этапов диагностики
+        if 'detail_level' in diagnostics_result:
+            stage_times = ", ".join(f"{name} {elapsed} мс" for name, elapsed in diagnostics_result.get('stage_times_ms', {}).items())
+            html_result += f"<p>Уровень детализации: {diagnostics_result['detail_level']} ({stage_times})</p>"
+        
+        # Статистика вызовов модели ИИ
+        if 'skipped_generations' in diagnostics_result:
+            html_result += (f"<p>Анализ ИИ: выполнено генераций {diagnostics_result.get('generations', 0)}, "
+                            f"пропущено {diagnostics_result['skipped_generations']} (показатели в норме)</p>")
+        
         # Оценки по компонентам
         html_result += "<h3>Оценки по компонентам</h3>"
         html_result += "<ul>"
         
         component_scores = diagnostics_result.get('component_scores', {})
         for component, score in component_scores.items():
-            component_name = {
-                'cpu': 'Процессор',
-                'gpu': 'Видеокарта',
-                'memory': 'Оперативная память',
-                'storage': 'Хранилище',
-                'network': 'Сеть'
-            }.get(component, component)
+            component_name = COMPONENT_NAMES.get(component, component)
             
             score_color = self.get_score_color(score)
             html_result += f"<li>{component_name}: <span style='color: {score_color}; font-weight: bold;'>{score}/100</span></li>"
@@ -227,13 +320,7 @@ class DiagnosticsTab(QWidget):
         details = diagnostics_result.get('details', {})
         
         for component, component_details in details.items():
-            component_name = {
-                'cpu': 'Процессор',
-                'gpu': 'Видеокарта',
-                'memory': 'Оперативная память',
-                'storage': 'Хранилище',
-                'network': 'Сеть'
-            }.get(component, component)
+            component_name = COMPONENT_NAMES.get(component, component)
             
             html_result += f"<h4>{component_name}</h4>"
             
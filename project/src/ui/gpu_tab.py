@@ -10,9 +10,10 @@ from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
 from PyQt5.QtGui import QFont
 from PyQt5.QtCore import Qt
 
-from src.ui.widgets.performance_chart import PerformanceChart
+from src.ui.widgets.time_series_chart import TimeSeriesChart
+from src.ui.widgets.deferred_update import DeferredUpdateMixin
 
-class GPUTab(QWidget):
+class GPUTab(DeferredUpdateMixin, QWidget):
     """Вкладка с информацией о видеокарте"""
     
     def __init__(self):
@@ -82,11 +83,11 @@ class GPUTab(QWidget):
         usage_layout = QHBoxLayout()
         
         # График загрузки GPU
-        self.gpu_chart = PerformanceChart("Загрузка GPU", "%")
+        self.gpu_chart = TimeSeriesChart("Загрузка GPU", "%")
         usage_layout.addWidget(self.gpu_chart)
         
         # График использования видеопамяти
-        self.memory_chart = PerformanceChart("Использование видеопамяти", "МБ")
+        self.memory_chart = TimeSeriesChart("Использование видеопамяти", "МБ")
         usage_layout.addWidget(self.memory_chart)
         
         main_layout.addLayout(usage_layout)
@@ -146,7 +147,7 @@ class GPUTab(QWidget):
         spacer.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
         main_layout.addWidget(spacer)
         
-    def update_info(self, gpu_info):
+    def render_info(self, gpu_info):
         """Обновление информации о видеокарте"""
         if not gpu_info:
             return
@@ -3,28 +3,45 @@
 
 """
 Главное окно приложения PC Hardware Diagnostics AI
+
+Вкладки создаются при первом открытии: модуль вкладки импортируется,
+виджет заменяет пустую заготовку и получает данные последнего
+сканирования. Сканер оборудования импортируется при первом сканировании.
 """
 
 import os
 import sys
+import time
+import logging
+import importlib
 from PyQt5.QtWidgets import (QMainWindow, QTabWidget, QWidget, QVBoxLayout, 
                             QHBoxLayout, QPushButton, QLabel, QProgressBar, 
                             QMessageBox, QSplashScreen, QAction, QMenu, QStatusBar)
 from PyQt5.QtGui import QIcon, QPixmap, QFont, QColor, QPalette
 from PyQt5.QtCore import Qt, QTimer, QThread, pyqtSignal
 
-from src.ui.dashboard_tab import DashboardTab
-from src.ui.cpu_tab import CPUTab
-from src.ui.gpu_tab import GPUTab
-from src.ui.memory_tab import MemoryTab
-from src.ui.storage_tab import StorageTab
-from src.ui.network_tab import NetworkTab
-from src.ui.diagnostics_tab import DiagnosticsTab
-from src.ui.settings_tab import SettingsTab
-from src.ui.help_tab import HelpTab
+from src.ai.backends import create_diagnostics_engine
+from src.utils.cancellation import CancellationToken, OperationCancelledError
+from src.utils.update_coalescer import UpdateCoalescer, DEFAULT_MAX_FPS
+
+# Время ожидания фоновых потоков при закрытии окна, мс; не успевшие
+# завершиться потоки дожидаются со скрытым окном
+SHUTDOWN_WAIT_MS = 1000
 
-from src.hardware.hardware_scanner import HardwareScanner
-from src.ai.diagnostics_engine import DiagnosticsEngine
+# Вкладки в порядке отображения: имя, модуль, класс, заголовок и раздел
+# результатов сканирования, передаваемый в update_info ('' - результаты
+# целиком, None - вкладка не отображает результаты сканирования)
+TABS = [
+    ('dashboard', 'src.ui.dashboard_tab', 'DashboardTab', "Обзор", ''),
+    ('cpu', 'src.ui.cpu_tab', 'CPUTab', "Процессор", 'cpu'),
+    ('gpu', 'src.ui.gpu_tab', 'GPUTab', "Видеокарта", 'gpu'),
+    ('memory', 'src.ui.memory_tab', 'MemoryTab', "Память", 'memory'),
+    ('storage', 'src.ui.storage_tab', 'StorageTab', "Хранилище", 'storage'),
+    ('network', 'src.ui.network_tab', 'NetworkTab', "Сеть", 'network'),
+    ('diagnostics', 'src.ui.diagnostics_tab', 'DiagnosticsTab', "Диагностика", None),
+    ('settings', 'src.ui.settings_tab', 'SettingsTab', "Настройки", None),
+    ('help', 'src.ui.help_tab', 'HelpTab', "Справка", None)
+]
 
 class ScannerThread(QThread):
     """Поток для сканирования аппаратного обеспечения"""
@@ -34,18 +51,26 @@ class ScannerThread(QThread):
     
     def __init__(self, parent=None):
         super().__init__(parent)
+        # psutil, cpuinfo и GPUtil загружаются при первом сканировании
+        from src.hardware.hardware_scanner import HardwareScanner
         self.scanner = HardwareScanner()
+        self.cancel_token = CancellationToken()
+        
+    def cancel(self):
+        """Запрос отмены сканирования"""
+        self.cancel_token.cancel()
         
     def run(self):
         try:
-            # Имитация прогресса сканирования
-            for i in range(101):
-                self.progress_signal.emit(i)
-                self.msleep(50)  # Задержка для демонстрации прогресса
-                
-            # Получение информации об аппаратном обеспечении
-            hardware_info = self.scanner.scan_all()
+            # Получение информации об аппаратном обеспечении с прогрессом по этапам
+            hardware_info = self.scanner.scan_all(
+                cancel_token=self.cancel_token,
+                progress_callback=self.progress_signal.emit
+            )
             self.finished_signal.emit(hardware_info)
+        except OperationCancelledError:
+            # Интерфейс сбрасывается при запросе отмены (cancel_scan)
+            pass
         except Exception as e:
             self.error_signal.emit(str(e))
 
@@ -56,7 +81,16 @@ class MainWindow(QMainWindow):
         super().__init__()
         self.config = config
         self.hardware_info = None
-        self.diagnostics_engine = DiagnosticsEngine()
+        self.scanner_thread = None
+        self.diagnostics_engine = create_diagnostics_engine(self.config)
+        self.logger = logging.getLogger('main_window')
+        
+        # Созданные вкладки: {имя: виджет}
+        self.tabs = {}
+        
+        # Снимки состояния применяются к вкладкам не чаще ui_max_fps раз в секунду
+        self.update_coalescer = UpdateCoalescer(self.apply_hardware_info,
+                                                self.config.get('ui_max_fps', DEFAULT_MAX_FPS), self)
         
         self.init_ui()
         self.setup_menu()
@@ -86,7 +120,7 @@ class MainWindow(QMainWindow):
         # Кнопка сканирования
         self.scan_button = QPushButton("Запустить сканирование")
         self.scan_button.setFixedWidth(200)
-        self.scan_button.clicked.connect(self.start_scan)
+        self.scan_button.clicked.connect(self.toggle_scan)
         header_layout.addWidget(self.scan_button)
         
         main_layout.addLayout(header_layout)
@@ -96,36 +130,57 @@ class MainWindow(QMainWindow):
         self.progress_bar.setVisible(False)
         main_layout.addWidget(self.progress_bar)
         
-        # Создание вкладок
+        # Создание вкладок: до первого открытия на месте вкладки пустая заготовка
         self.tab_widget = QTabWidget()
-        
-        # Инициализация вкладок
-        self.dashboard_tab = DashboardTab()
-        self.cpu_tab = CPUTab()
-        self.gpu_tab = GPUTab()
-        self.memory_tab = MemoryTab()
-        self.storage_tab = StorageTab()
-        self.network_tab = NetworkTab()
-        self.diagnostics_tab = DiagnosticsTab(self.diagnostics_engine)
-        self.settings_tab = SettingsTab(self.config)
-        self.help_tab = HelpTab()
-        
-        # Добавление вкладок
-        self.tab_widget.addTab(self.dashboard_tab, "Обзор")
-        self.tab_widget.addTab(self.cpu_tab, "Процессор")
-        self.tab_widget.addTab(self.gpu_tab, "Видеокарта")
-        self.tab_widget.addTab(self.memory_tab, "Память")
-        self.tab_widget.addTab(self.storage_tab, "Хранилище")
-        self.tab_widget.addTab(self.network_tab, "Сеть")
-        self.tab_widget.addTab(self.diagnostics_tab, "Диагностика")
-        self.tab_widget.addTab(self.settings_tab, "Настройки")
-        self.tab_widget.addTab(self.help_tab, "Справка")
+        for name, _, _, title, _ in TABS:
+            self.tab_widget.addTab(QWidget(), title)
+        self.get_tab(TABS[0][0])
+        self.tab_widget.currentChanged.connect(self.on_tab_changed)
         
         main_layout.addWidget(self.tab_widget)
         
         # Применение стилей
         self.apply_styles()
         
+    def get_tab(self, name):
+        """Вкладка по имени; создается при первом обращении"""
+        tab = self.tabs.get(name)
+        if tab is not None:
+            return tab
+            
+        index = [spec[0] for spec in TABS].index(name)
+        _, module_name, class_name, title, data_key = TABS[index]
+        start = time.perf_counter()
+        tab_class = getattr(importlib.import_module(module_name), class_name)
+        if name == 'diagnostics':
+            tab = tab_class(self.diagnostics_engine)
+        elif name == 'settings':
+            tab = tab_class(self.config)
+        else:
+            tab = tab_class()
+        self.tabs[name] = tab
+        
+        # Замена заготовки без повторного сигнала о смене вкладки
+        current = self.tab_widget.currentIndex()
+        self.tab_widget.blockSignals(True)
+        placeholder = self.tab_widget.widget(index)
+        self.tab_widget.removeTab(index)
+        self.tab_widget.insertTab(index, tab, title)
+        self.tab_widget.setCurrentIndex(current)
+        self.tab_widget.blockSignals(False)
+        placeholder.deleteLater()
+        
+        # Данные последнего сканирования привязываются в момент создания
+        if self.hardware_info and data_key is not None:
+            tab.update_info(self.hardware_info.get(data_key, {}) if data_key else self.hardware_info)
+        self.logger.debug("Вкладка %s создана за %.1f мс", name, (time.perf_counter() - start) * 1000)
+        return tab
+        
+    def on_tab_changed(self, index):
+        """Создание вкладки при первом открытии"""
+        if 0 <= index < len(TABS):
+            self.get_tab(TABS[index][0])
+            
     def apply_styles(self):
         """Применение стилей к интерфейсу"""
         # Базовые стили
@@ -210,7 +265,7 @@ class MainWindow(QMainWindow):
         tools_menu.addSeparator()
         
         settings_action = QAction("Настройки", self)
-        settings_action.triggered.connect(lambda: self.tab_widget.setCurrentWidget(self.settings_tab))
+        settings_action.triggered.connect(lambda: self.tab_widget.setCurrentWidget(self.get_tab('settings')))
         tools_menu.addAction(settings_action)
         
         # Меню "Справка"
@@ -221,7 +276,7 @@ class MainWindow(QMainWindow):
         help_menu.addAction(about_action)
         
         help_action = QAction("Руководство пользователя", self)
-        help_action.triggered.connect(lambda: self.tab_widget.setCurrentWidget(self.help_tab))
+        help_action.triggered.connect(lambda: self.tab_widget.setCurrentWidget(self.get_tab('help')))
         help_menu.addAction(help_action)
         
     def setup_status_bar(self):
@@ -230,20 +285,50 @@ class MainWindow(QMainWindow):
         self.setStatusBar(self.status_bar)
         self.status_bar.showMessage("Готов к работе")
         
+    def toggle_scan(self):
+        """Запуск сканирования или отмена текущего"""
+        if self.scanner_thread is not None:
+            self.cancel_scan()
+            self.status_bar.showMessage("Сканирование отменено")
+        else:
+            self.start_scan()
+            
     def start_scan(self):
         """Запуск сканирования аппаратного обеспечения"""
-        self.scan_button.setEnabled(False)
+        # Новое сканирование заменяет незавершенное
+        self.cancel_scan()
+        
+        self.scan_button.setText("Отменить сканирование")
         self.progress_bar.setVisible(True)
         self.progress_bar.setValue(0)
         self.status_bar.showMessage("Сканирование аппаратного обеспечения...")
         
-        # Создание и запуск потока сканирования
-        self.scanner_thread = ScannerThread()
+        # Создание и запуск потока сканирования; поток принадлежит окну
+        # и удаляется после фактического завершения
+        self.scanner_thread = ScannerThread(self)
         self.scanner_thread.progress_signal.connect(self.update_progress)
         self.scanner_thread.finished_signal.connect(self.scan_finished)
         self.scanner_thread.error_signal.connect(self.scan_error)
+        self.scanner_thread.finished.connect(self.scanner_thread.deleteLater)
         self.scanner_thread.start()
         
+    def cancel_scan(self):
+        """Отмена текущего сканирования без ожидания завершения потока"""
+        if self.scanner_thread is None:
+            return
+            
+        thread = self.scanner_thread
+        self.scanner_thread = None
+        thread.cancel()
+        
+        # Результаты отмененного сканирования больше не обрабатываются
+        thread.progress_signal.disconnect()
+        thread.finished_signal.disconnect()
+        thread.error_signal.disconnect()
+        
+        self.scan_button.setText("Запустить сканирование")
+        self.progress_bar.setVisible(False)
+        
     def update_progress(self, value):
         """Обновление прогресс-бара"""
         self.progress_bar.setValue(value)
@@ -251,24 +336,32 @@ class MainWindow(QMainWindow):
     def scan_finished(self, hardware_info):
         """Обработка завершения сканирования"""
         self.hardware_info = hardware_info
-        self.scan_button.setEnabled(True)
+        self.scanner_thread = None
+        self.scan_button.setText("Запустить сканирование")
         self.progress_bar.setVisible(False)
         self.status_bar.showMessage("Сканирование завершено успешно")
         
-        # Обновление информации на вкладках
-        self.dashboard_tab.update_info(hardware_info)
-        self.cpu_tab.update_info(hardware_info.get('cpu', {}))
-        self.gpu_tab.update_info(hardware_info.get('gpu', {}))
-        self.memory_tab.update_info(hardware_info.get('memory', {}))
-        self.storage_tab.update_info(hardware_info.get('storage', {}))
-        self.network_tab.update_info(hardware_info.get('network', {}))
+        # Обновление вкладок в ближайшем кадре
+        self.update_coalescer.submit(hardware_info)
         
         # Запуск автоматической диагностики
         self.run_diagnostics()
         
+    def apply_hardware_info(self, hardware_info):
+        """Обновление информации на созданных вкладках
+        
+        Видимая вкладка отрисовывает данные сразу, скрытые - при показе
+        (DeferredUpdateMixin); несозданные вкладки получат данные при первом
+        открытии.
+        """
+        for name, _, _, _, data_key in TABS:
+            if name in self.tabs and data_key is not None:
+                self.tabs[name].update_info(hardware_info.get(data_key, {}) if data_key else hardware_info)
+                
     def scan_error(self, error_message):
         """Обработка ошибки сканирования"""
-        self.scan_button.setEnabled(True)
+        self.scanner_thread = None
+        self.scan_button.setText("Запустить сканирование")
         self.progress_bar.setVisible(False)
         self.status_bar.showMessage("Ошибка сканирования")
         
@@ -283,8 +376,36 @@ class MainWindow(QMainWindow):
             return
         
         self.status_bar.showMessage("Выполнение диагностики...")
-        self.tab_widget.setCurrentWidget(self.diagnostics_tab)
-        self.diagnostics_tab.run_diagnostics(self.hardware_info)
+        diagnostics_tab = self.get_tab('diagnostics')
+        self.tab_widget.setCurrentWidget(diagnostics_tab)
+        diagnostics_tab.run_diagnostics(self.hardware_info)
+        
+    def closeEvent(self, event):
+        """Отмена фоновых операций при закрытии окна
+        
+        Общие ресурсы (истории, соединение с процессом инференса)
+        освобождаются только после завершения всех фоновых потоков. Если
+        поток не успел завершиться (например, загружает модель), окно
+        скрывается и закрывается повторно по завершении последнего потока.
+        """
+        self.cancel_scan()
+        if 'diagnostics' in self.tabs:
+            self.tabs['diagnostics'].cancel_diagnostics()
+        
+        # Потоки, включая отмененные ранее, завершаются на ближайшей
+        # проверке токена отмены
+        running = [thread for thread in self.findChildren(QThread) if not thread.wait(SHUTDOWN_WAIT_MS)]
+        if running:
+            self.logger.info("Ожидание завершения фоновых потоков: %d", len(running))
+            for thread in running:
+                thread.finished.connect(self.close, Qt.UniqueConnection)
+            self.hide()
+            event.ignore()
+            return
+            
+        self.diagnostics_engine.close()
+        self.logger.info("Обновления интерфейса: %s", self.update_coalescer.stats())
+        super().closeEvent(event)
         
     def save_report(self):
         """Сохранение отчета о состоянии системы"""
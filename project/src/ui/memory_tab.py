@@ -6,14 +6,26 @@
 """
 
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
-                            QFrame, QGridLayout, QSizePolicy, QProgressBar, QTableWidget,
-                            QTableWidgetItem, QHeaderView)
+                            QFrame, QGridLayout, QSizePolicy, QProgressBar)
 from PyQt5.QtGui import QFont
 from PyQt5.QtCore import Qt
 
-from src.ui.widgets.performance_chart import PerformanceChart
+from src.ui.widgets.time_series_chart import TimeSeriesChart
+from src.ui.widgets.deferred_update import DeferredUpdateMixin
+from src.ui.widgets.snapshot_table import SnapshotTable, TableColumn, numeric
 
-class MemoryTab(QWidget):
+# Столбцы таблицы модулей памяти
+MODULE_COLUMNS = [
+    TableColumn("Слот", lambda module: module.get('slot', 'Н/Д')),
+    TableColumn("Размер", lambda module: f"{module.get('size', 'Н/Д')} ГБ",
+                sort_value=lambda module: numeric(module.get('size'))),
+    TableColumn("Тип", lambda module: module.get('type', 'Н/Д')),
+    TableColumn("Частота", lambda module: f"{module.get('frequency', 'Н/Д')} МГц",
+                sort_value=lambda module: numeric(module.get('frequency'))),
+    TableColumn("Производитель", lambda module: module.get('manufacturer', 'Н/Д'))
+]
+
+class MemoryTab(DeferredUpdateMixin, QWidget):
     """Вкладка с информацией об оперативной памяти"""
     
     def __init__(self):
@@ -83,7 +95,7 @@ class MemoryTab(QWidget):
         usage_layout = QHBoxLayout()
         
         # График использования памяти
-        self.memory_chart = PerformanceChart("Использование памяти", "ГБ")
+        self.memory_chart = TimeSeriesChart("Использование памяти", "ГБ")
         usage_layout.addWidget(self.memory_chart)
         
         # Индикатор использования памяти
@@ -140,10 +152,7 @@ class MemoryTab(QWidget):
         modules_header.setFont(QFont("Segoe UI", 12, QFont.Bold))
         modules_layout.addWidget(modules_header)
         
-        self.modules_table = QTableWidget()
-        self.modules_table.setColumnCount(5)
-        self.modules_table.setHorizontalHeaderLabels(["Слот", "Размер", "Тип", "Частота", "Производитель"])
-        self.modules_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.modules_table = SnapshotTable(MODULE_COLUMNS, key=lambda module: module.get('slot'))
         modules_layout.addWidget(self.modules_table)
         
         main_layout.addWidget(modules_frame)
@@ -169,7 +178,7 @@ class MemoryTab(QWidget):
         spacer.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
         main_layout.addWidget(spacer)
         
-    def update_info(self, memory_info):
+    def render_info(self, memory_info):
         """Обновление информации о памяти"""
         if not memory_info:
             return
@@ -232,15 +241,7 @@ class MemoryTab(QWidget):
         self.virtual_used_value.setText(f"{memory_info.get('swap_used', 'Н/Д')} ГБ")
         
         # Обновление таблицы модулей памяти
-        modules = memory_info.get('modules', [])
-        self.modules_table.setRowCount(len(modules))
-        
-        for i, module in enumerate(modules):
-            self.modules_table.setItem(i, 0, QTableWidgetItem(module.get('slot', 'Н/Д')))
-            self.modules_table.setItem(i, 1, QTableWidgetItem(f"{module.get('size', 'Н/Д')} ГБ"))
-            self.modules_table.setItem(i, 2, QTableWidgetItem(module.get('type', 'Н/Д')))
-            self.modules_table.setItem(i, 3, QTableWidgetItem(f"{module.get('frequency', 'Н/Д')} МГц"))
-            self.modules_table.setItem(i, 4, QTableWidgetItem(module.get('manufacturer', 'Н/Д')))
+        self.modules_table.set_rows(memory_info.get('modules', []))
             
         # Обновление диагностики
         issues = memory_info.get('issues', [])
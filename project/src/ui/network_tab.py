@@ -4,16 +4,35 @@
 """
 Вкладка с информацией о сети
 """
-from PyQt5.QtGui import QColor
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
-                            QFrame, QGridLayout, QSizePolicy, QTableWidget,
-                            QTableWidgetItem, QHeaderView)
+                            QFrame, QGridLayout, QSizePolicy)
 from PyQt5.QtGui import QFont
 from PyQt5.QtCore import Qt
 
-from src.ui.widgets.performance_chart import PerformanceChart
+from src.ui.widgets.time_series_chart import TimeSeriesChart
+from src.ui.widgets.deferred_update import DeferredUpdateMixin
+from src.ui.widgets.snapshot_table import SnapshotTable, TableColumn, numeric
 
-class NetworkTab(QWidget):
+# Цвета статуса интерфейса
+INTERFACE_STATUS_COLORS = {
+    'Подключено': '#4CAF50',  # Зеленый
+    'Отключено': '#F44336',  # Красный
+    'Ошибка': '#FF9800'  # Оранжевый
+}
+
+# Столбцы таблицы сетевых интерфейсов
+INTERFACE_COLUMNS = [
+    TableColumn("Интерфейс", lambda interface: interface.get('name', 'Н/Д')),
+    TableColumn("IP-адрес", lambda interface: interface.get('ip', 'Н/Д')),
+    TableColumn("MAC-адрес", lambda interface: interface.get('mac', 'Н/Д')),
+    TableColumn("Скорость", lambda interface: f"{interface.get('speed', 'Н/Д')} Мбит/с",
+                sort_value=lambda interface: numeric(interface.get('speed'))),
+    TableColumn("Статус", lambda interface: interface.get('status', 'Н/Д'),
+                color=lambda interface: INTERFACE_STATUS_COLORS.get(interface.get('status'))),
+    TableColumn("Тип", lambda interface: interface.get('type', 'Н/Д'))
+]
+
+class NetworkTab(DeferredUpdateMixin, QWidget):
     """Вкладка с информацией о сети"""
     
     def __init__(self):
@@ -39,10 +58,8 @@ class NetworkTab(QWidget):
         interfaces_header.setFont(QFont("Segoe UI", 12, QFont.Bold))
         interfaces_layout.addWidget(interfaces_header)
         
-        self.interfaces_table = QTableWidget()
-        self.interfaces_table.setColumnCount(6)
-        self.interfaces_table.setHorizontalHeaderLabels(["Интерфейс", "IP-адрес", "MAC-адрес", "Скорость", "Статус", "Тип"])
-        self.interfaces_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.interfaces_table = SnapshotTable(INTERFACE_COLUMNS, key=lambda interface: interface.get('name'),
+                                              filter_placeholder="Фильтр интерфейсов")
         interfaces_layout.addWidget(self.interfaces_table)
         
         main_layout.addWidget(interfaces_frame)
@@ -51,11 +68,11 @@ class NetworkTab(QWidget):
         charts_layout = QHBoxLayout()
         
         # График входящего трафика
-        self.download_chart = PerformanceChart("Входящий трафик", "МБ/с")
+        self.download_chart = TimeSeriesChart("Входящий трафик", "МБ/с")
         charts_layout.addWidget(self.download_chart)
         
         # График исходящего трафика
-        self.upload_chart = PerformanceChart("Исходящий трафик", "МБ/с")
+        self.upload_chart = TimeSeriesChart("Исходящий трафик", "МБ/с")
         charts_layout.addWidget(self.upload_chart)
         
         main_layout.addLayout(charts_layout)
@@ -139,32 +156,13 @@ class NetworkTab(QWidget):
         spacer.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
         main_layout.addWidget(spacer)
         
-    def update_info(self, network_info):
+    def render_info(self, network_info):
         """Обновление информации о сети"""
         if not network_info:
             return
             
         # Обновление таблицы сетевых интерфейсов
-        interfaces = network_info.get('interfaces', [])
-        self.interfaces_table.setRowCount(len(interfaces))
-        
-        for i, interface in enumerate(interfaces):
-            self.interfaces_table.setItem(i, 0, QTableWidgetItem(interface.get('name', 'Н/Д')))
-            self.interfaces_table.setItem(i, 1, QTableWidgetItem(interface.get('ip', 'Н/Д')))
-            self.interfaces_table.setItem(i, 2, QTableWidgetItem(interface.get('mac', 'Н/Д')))
-            self.interfaces_table.setItem(i, 3, QTableWidgetItem(f"{interface.get('speed', 'Н/Д')} Мбит/с"))
-            
-            # Статус с цветовой индикацией
-            status_item = QTableWidgetItem(interface.get('status', 'Н/Д'))
-            if interface.get('status') == 'Подключено':
-                status_item.setForeground(QColor('#4CAF50'))  # Зеленый
-            elif interface.get('status') == 'Отключено':
-                status_item.setForeground(QColor('#F44336'))  # Красный
-            elif interface.get('status') == 'Ошибка':
-                status_item.setForeground(QColor('#FF9800'))  # Оранжевый
-                
-            self.interfaces_table.setItem(i, 4, status_item)
-            self.interfaces_table.setItem(i, 5, QTableWidgetItem(interface.get('type', 'Н/Д')))
+        self.interfaces_table.set_rows(network_info.get('interfaces', []))
             
         # Обновление графиков сетевой активности
         self.download_chart.update_data(network_info.get('download_history', []))
@@ -4,16 +4,87 @@
 """
 Вкладка с информацией о хранилище
 """
-from PyQt5.QtGui import QColor
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
-                            QFrame, QGridLayout, QSizePolicy, QProgressBar, QTableWidget,
-                            QTableWidgetItem, QHeaderView)
+                            QFrame, QGridLayout, QSizePolicy, QProgressBar)
 from PyQt5.QtGui import QFont
 from PyQt5.QtCore import Qt
 
-from src.ui.widgets.performance_chart import PerformanceChart
+from src.ui.widgets.time_series_chart import TimeSeriesChart
+from src.ui.widgets.deferred_update import DeferredUpdateMixin
+from src.ui.widgets.snapshot_table import SnapshotTable, TableColumn, numeric
 
-class StorageTab(QWidget):
+# Цвета состояния диска
+DISK_STATUS_COLORS = {
+    'Отлично': '#4CAF50',  # Зеленый
+    'Хорошо': '#8BC34A',  # Светло-зеленый
+    'Удовлетворительно': '#FFC107',  # Желтый
+    'Внимание': '#FF9800',  # Оранжевый
+    'Критично': '#F44336'  # Красный
+}
+
+def partition_usage_color(partition):
+    """Цвет заполненности раздела"""
+    usage_percent = numeric(partition.get('usage_percent', 0))
+    if usage_percent >= 90:
+        return '#F44336'  # Красный
+    if usage_percent >= 70:
+        return '#FF9800'  # Оранжевый
+    return '#4CAF50'  # Зеленый
+
+# Оформление индикаторов заполненности дисков: цвет выбирается свойством
+# usage_state, таблица стилей разбирается один раз для всего блока
+DISK_USAGE_STYLE = """
+    QProgressBar {
+        border: 1px solid #cccccc;
+        border-radius: 4px;
+        text-align: center;
+    }
+    QProgressBar::chunk {
+        background-color: #4CAF50;
+        border-radius: 3px;
+    }
+    QProgressBar[usage_state="warning"]::chunk {
+        background-color: #FF9800;
+    }
+    QProgressBar[usage_state="critical"]::chunk {
+        background-color: #F44336;
+    }
+"""
+
+def disk_usage_state(usage_percent):
+    """Состояние заполненности диска для выбора цвета индикатора"""
+    if usage_percent >= 90:
+        return 'critical'
+    if usage_percent >= 70:
+        return 'warning'
+    return 'normal'
+
+# Столбцы таблицы дисков
+DISK_COLUMNS = [
+    TableColumn("Диск", lambda disk: disk.get('device', 'Н/Д')),
+    TableColumn("Тип", lambda disk: disk.get('type', 'Н/Д')),
+    TableColumn("Размер", lambda disk: f"{disk.get('size', 'Н/Д')} ГБ",
+                sort_value=lambda disk: numeric(disk.get('size'))),
+    TableColumn("Модель", lambda disk: disk.get('model', 'Н/Д')),
+    TableColumn("Интерфейс", lambda disk: disk.get('interface', 'Н/Д')),
+    TableColumn("Состояние", lambda disk: disk.get('status', 'Н/Д'),
+                color=lambda disk: DISK_STATUS_COLORS.get(disk.get('status')))
+]
+
+# Столбцы таблицы разделов
+PARTITION_COLUMNS = [
+    TableColumn("Раздел", lambda partition: partition.get('device', 'Н/Д')),
+    TableColumn("Точка монтирования", lambda partition: partition.get('mountpoint', 'Н/Д')),
+    TableColumn("Файловая система", lambda partition: partition.get('fstype', 'Н/Д')),
+    TableColumn("Размер", lambda partition: f"{partition.get('size', 'Н/Д')} ГБ",
+                sort_value=lambda partition: numeric(partition.get('size'))),
+    TableColumn("Использовано",
+                lambda partition: f"{partition.get('used', 'Н/Д')} ГБ ({partition.get('usage_percent', 'Н/Д')}%)",
+                color=partition_usage_color,
+                sort_value=lambda partition: numeric(partition.get('usage_percent')))
+]
+
+class StorageTab(DeferredUpdateMixin, QWidget):
     """Вкладка с информацией о хранилище"""
     
     def __init__(self):
@@ -39,10 +110,7 @@ class StorageTab(QWidget):
         disks_header.setFont(QFont("Segoe UI", 12, QFont.Bold))
         disks_layout.addWidget(disks_header)
         
-        self.disks_table = QTableWidget()
-        self.disks_table.setColumnCount(6)
-        self.disks_table.setHorizontalHeaderLabels(["Диск", "Тип", "Размер", "Модель", "Интерфейс", "Состояние"])
-        self.disks_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.disks_table = SnapshotTable(DISK_COLUMNS, key=lambda disk: disk.get('device'))
         disks_layout.addWidget(self.disks_table)
         
         main_layout.addWidget(disks_frame)
@@ -51,26 +119,29 @@ class StorageTab(QWidget):
         usage_layout = QHBoxLayout()
         
         # График использования дисков
-        self.disk_chart = PerformanceChart("Активность дисков", "МБ/с")
+        self.disk_chart = TimeSeriesChart("Активность дисков", "МБ/с")
         usage_layout.addWidget(self.disk_chart)
         
         # Индикаторы использования дисков
         usage_frame = QFrame()
         usage_frame.setFrameShape(QFrame.StyledPanel)
         usage_frame.setFrameShadow(QFrame.Raised)
+        usage_frame.setStyleSheet(DISK_USAGE_STYLE)
         usage_frame_layout = QVBoxLayout(usage_frame)
+        self.usage_frame_layout = usage_frame_layout
         
         usage_header = QLabel("Использование дисков")
         usage_header.setFont(QFont("Segoe UI", 10, QFont.Bold))
         usage_header.setAlignment(Qt.AlignCenter)
         usage_frame_layout.addWidget(usage_header)
         
-        # Создаем динамические индикаторы для дисков
-        self.disk_usage_widgets = {}
+        # Индикаторы дисков: пары (метка, индикатор), создаются и удаляются
+        # только при изменении числа дисков
+        self.disk_usage_widgets = []
         
-        # Добавим заглушку, которая будет заменена при обновлении
-        placeholder = QLabel("Выполните сканирование для получения информации")
-        usage_frame_layout.addWidget(placeholder)
+        # Заглушка, скрываемая при появлении дисков
+        self.usage_placeholder = QLabel("Выполните сканирование для получения информации")
+        usage_frame_layout.addWidget(self.usage_placeholder)
         
         usage_layout.addWidget(usage_frame)
         
@@ -86,10 +157,9 @@ class StorageTab(QWidget):
         partitions_header.setFont(QFont("Segoe UI", 12, QFont.Bold))
         partitions_layout.addWidget(partitions_header)
         
-        self.partitions_table = QTableWidget()
-        self.partitions_table.setColumnCount(5)
-        self.partitions_table.setHorizontalHeaderLabels(["Раздел", "Точка монтирования", "Файловая система", "Размер", "Использовано"])
-        self.partitions_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.partitions_table = SnapshotTable(PARTITION_COLUMNS,
+                                              key=lambda partition: (partition.get('device'), partition.get('mountpoint')),
+                                              filter_placeholder="Фильтр разделов")
         partitions_layout.addWidget(self.partitions_table)
         
         main_layout.addWidget(partitions_frame)
@@ -115,132 +185,55 @@ class StorageTab(QWidget):
         spacer.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
         main_layout.addWidget(spacer)
         
-    def update_info(self, storage_info):
+    def update_disk_usage(self, disks):
+        """Обновление индикаторов заполненности дисков с повторным использованием виджетов"""
+        while len(self.disk_usage_widgets) < len(disks):
+            disk_label = QLabel()
+            usage_bar = QProgressBar()
+            usage_bar.setRange(0, 100)
+            usage_bar.setTextVisible(True)
+            usage_bar.setProperty('usage_state', 'normal')
+            self.usage_frame_layout.addWidget(disk_label)
+            self.usage_frame_layout.addWidget(usage_bar)
+            self.disk_usage_widgets.append((disk_label, usage_bar))
+        while len(self.disk_usage_widgets) > len(disks):
+            for widget in self.disk_usage_widgets.pop():
+                widget.deleteLater()
+        self.usage_placeholder.setVisible(not disks)
+        
+        for disk, (disk_label, usage_bar) in zip(disks, self.disk_usage_widgets):
+            text = f"{disk.get('device', 'Н/Д')} ({disk.get('model', 'Н/Д')})"
+            if disk_label.text() != text:
+                disk_label.setText(text)
+                
+            usage_percent = disk.get('usage_percent', 0)
+            usage_bar.setValue(int(usage_percent))
+            usage_bar.setFormat(f"{usage_percent}% ({disk.get('used', 'Н/Д')} / {disk.get('size', 'Н/Д')} ГБ)")
+            
+            # Смена цвета - повторное применение стиля только этого индикатора
+            state = disk_usage_state(usage_percent)
+            if usage_bar.property('usage_state') != state:
+                usage_bar.setProperty('usage_state', state)
+                usage_bar.style().unpolish(usage_bar)
+                usage_bar.style().polish(usage_bar)
+                
+    def render_info(self, storage_info):
         """Обновление информации о хранилище"""
         if not storage_info:
             return
             
         # Обновление таблицы дисков
         disks = storage_info.get('disks', [])
-        self.disks_table.setRowCount(len(disks))
-        
-        for i, disk in enumerate(disks):
-            self.disks_table.setItem(i, 0, QTableWidgetItem(disk.get('device', 'Н/Д')))
-            self.disks_table.setItem(i, 1, QTableWidgetItem(disk.get('type', 'Н/Д')))
-            self.disks_table.setItem(i, 2, QTableWidgetItem(f"{disk.get('size', 'Н/Д')} ГБ"))
-            self.disks_table.setItem(i, 3, QTableWidgetItem(disk.get('model', 'Н/Д')))
-            self.disks_table.setItem(i, 4, QTableWidgetItem(disk.get('interface', 'Н/Д')))
-            
-            # Статус диска с цветовой индикацией
-            status_item = QTableWidgetItem(disk.get('status', 'Н/Д'))
-            if disk.get('status') == 'Отлично':
-                status_item.setForeground(QColor('#4CAF50'))  # Зеленый
-            elif disk.get('status') == 'Хорошо':
-                status_item.setForeground(QColor('#8BC34A'))  # Светло-зеленый
-            elif disk.get('status') == 'Удовлетворительно':
-                status_item.setForeground(QColor('#FFC107'))  # Желтый
-            elif disk.get('status') == 'Внимание':
-                status_item.setForeground(QColor('#FF9800'))  # Оранжевый
-            elif disk.get('status') == 'Критично':
-                status_item.setForeground(QColor('#F44336'))  # Красный
-                
-            self.disks_table.setItem(i, 5, status_item)
+        self.disks_table.set_rows(disks)
             
         # Обновление графика активности дисков
         self.disk_chart.update_data(storage_info.get('activity_history', []))
         
         # Обновление индикаторов использования дисков
-        # Сначала очищаем существующие виджеты
-        usage_frame = self.findChild(QFrame, "usage_frame")
-        if usage_frame:
-            layout = usage_frame.layout()
-            # Удаляем все виджеты, кроме заголовка
-            for i in reversed(range(1, layout.count())):
-                layout.itemAt(i).widget().setParent(None)
-                
-            # Добавляем новые индикаторы для каждого диска
-            for disk in disks:
-                device = disk.get('device', 'Н/Д')
-                
-                # Создаем метку с названием диска
-                disk_label = QLabel(f"{device} ({disk.get('model', 'Н/Д')})")
-                layout.addWidget(disk_label)
-                
-                # Создаем индикатор использования
-                usage_bar = QProgressBar()
-                usage_bar.setRange(0, 100)
-                usage_percent = disk.get('usage_percent', 0)
-                usage_bar.setValue(usage_percent)
-                usage_bar.setTextVisible(True)
-                usage_bar.setFormat(f"{usage_percent}% ({disk.get('used', 'Н/Д')} / {disk.get('size', 'Н/Д')} ГБ)")
-                
-                # Цветовая индикация использования
-                if usage_percent >= 90:
-                    usage_bar.setStyleSheet("""
-                        QProgressBar {
-                            border: 1px solid #cccccc;
-                            border-radius: 4px;
-                            text-align: center;
-                        }
-                        QProgressBar::chunk {
-                            background-color: #F44336;
-                            border-radius: 3px;
-                        }
-                    """)
-                elif usage_percent >= 70:
-                    usage_bar.setStyleSheet("""
-                        QProgressBar {
-                            border: 1px solid #cccccc;
-                            border-radius: 4px;
-                            text-align: center;
-                        }
-                        QProgressBar::chunk {
-                            background-color: #FF9800;
-                            border-radius: 3px;
-                        }
-                    """)
-                else:
-                    usage_bar.setStyleSheet("""
-                        QProgressBar {
-                            border: 1px solid #cccccc;
-                            border-radius: 4px;
-                            text-align: center;
-                        }
-                        QProgressBar::chunk {
-                            background-color: #4CAF50;
-                            border-radius: 3px;
-                        }
-                    """)
-                    
-                layout.addWidget(usage_bar)
-                
-                # Сохраняем виджеты для последующего обновления
-                self.disk_usage_widgets[device] = usage_bar
+        self.update_disk_usage(disks)
         
         # Обновление таблицы разделов
-        partitions = storage_info.get('partitions', [])
-        self.partitions_table.setRowCount(len(partitions))
-        
-        for i, partition in enumerate(partitions):
-            self.partitions_table.setItem(i, 0, QTableWidgetItem(partition.get('device', 'Н/Д')))
-            self.partitions_table.setItem(i, 1, QTableWidgetItem(partition.get('mountpoint', 'Н/Д')))
-            self.partitions_table.setItem(i, 2, QTableWidgetItem(partition.get('fstype', 'Н/Д')))
-            self.partitions_table.setItem(i, 3, QTableWidgetItem(f"{partition.get('size', 'Н/Д')} ГБ"))
-            
-            # Использование с процентами
-            usage = f"{partition.get('used', 'Н/Д')} ГБ ({partition.get('usage_percent', 'Н/Д')}%)"
-            usage_item = QTableWidgetItem(usage)
-            
-            # Цветовая индикация использования
-            usage_percent = partition.get('usage_percent', 0)
-            if usage_percent >= 90:
-                usage_item.setForeground(QColor('#F44336'))  # Красный
-            elif usage_percent >= 70:
-                usage_item.setForeground(QColor('#FF9800'))  # Оранжевый
-            else:
-                usage_item.setForeground(QColor('#4CAF50'))  # Зеленый
-                
-            self.partitions_table.setItem(i, 4, usage_item)
+        self.partitions_table.set_rows(storage_info.get('partitions', []))
             
         # Обновление диагностики
         issues = storage_info.get('issues', [])
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Тепловая карта загрузки ядер процессора
+
+Загрузка всех ядер хранится в кольцевом буфере NumPy (ядра x отсчеты,
+uint8), над памятью которого построено индексированное изображение
+QImage с таблицей цветов. Новый отсчет записывает один столбец буфера,
+а отрисовка масштабирует изображение двумя вызовами drawImage (старая
+и новая части кольца), поэтому стоимость обновления не зависит от
+числа виджетов и остается малой при сотнях логических процессоров.
+"""
+
+import numpy as np
+from PyQt5 import sip
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel, QFrame, QToolTip
+from PyQt5.QtGui import QFont, QColor, QPainter, QImage
+from PyQt5.QtCore import Qt, QRectF, QSize, QEvent
+
+# Число хранимых отсчетов
+DEFAULT_HISTORY = 60
+
+# Индекс цвета ячейки без данных
+NO_DATA = 255
+
+# Опорные цвета шкалы загрузки: (процент, цвет)
+COLOR_STOPS = [(0, '#4CAF50'), (60, '#FFC107'), (80, '#FF9800'), (100, '#F44336')]
+
+# Отступы области карты: слева, сверху, справа, снизу
+MAP_MARGINS = (36, 4, 4, 18)
+
+def usage_color_table():
+    """Таблица цветов индексированного изображения: 0-100% и цвет без данных"""
+    stops = [(percent, QColor(color)) for percent, color in COLOR_STOPS]
+    table = []
+    for value in range(101):
+        for (low, low_color), (high, high_color) in zip(stops, stops[1:]):
+            if value <= high:
+                t = (value - low) / (high - low)
+                table.append(QColor.fromRgbF(
+                    low_color.redF() + (high_color.redF() - low_color.redF()) * t,
+                    low_color.greenF() + (high_color.greenF() - low_color.greenF()) * t,
+                    low_color.blueF() + (high_color.blueF() - low_color.blueF()) * t).rgb())
+                break
+    table += [QColor('#eeeeee').rgb()] * (NO_DATA + 1 - len(table))
+    return table
+
+class CoreHeatmapPlot(QWidget):
+    """Область тепловой карты: строки - ядра, столбцы - отсчеты времени"""
+
+    def __init__(self, history=DEFAULT_HISTORY, parent=None):
+        super().__init__(parent)
+        self.history = history
+        self.color_table = usage_color_table()
+        self.buffer = None
+        self.image = None
+        # Позиция следующего отсчета в кольцевом буфере
+        self.head = 0
+        self.setMinimumHeight(120)
+        self.setMouseTracking(True)
+        self.setAttribute(Qt.WA_OpaquePaintEvent)
+
+    def sizeHint(self):
+        return QSize(300, 250)
+
+    def resize_buffer(self, cores):
+        """Создание буфера под новое число ядер"""
+        # Ширина строки QImage выравнивается на 4 байта
+        stride = (self.history + 3) // 4 * 4
+        self.buffer = np.full((cores, stride), NO_DATA, dtype=np.uint8)
+        # Изображение использует память буфера без копирования
+        self.image = QImage(sip.voidptr(self.buffer.ctypes.data), self.history, cores, stride,
+                            QImage.Format_Indexed8)
+        self.image.setColorTable(self.color_table)
+        self.head = 0
+
+    def add_sample(self, core_usage):
+        """Запись отсчета загрузки всех ядер"""
+        if not core_usage:
+            return
+        if self.buffer is None or self.buffer.shape[0] != len(core_usage):
+            self.resize_buffer(len(core_usage))
+        self.buffer[:, self.head] = np.clip(np.asarray(core_usage, dtype=np.float64), 0, 100).round()
+        self.head = (self.head + 1) % self.history
+        self.update()
+
+    def latest(self):
+        """Последний отсчет загрузки ядер"""
+        if self.buffer is None:
+            return None
+        column = self.buffer[:, (self.head - 1) % self.history]
+        return None if column[0] == NO_DATA else column
+
+    def map_rect(self):
+        """Прямоугольник области карты"""
+        left, top, right, bottom = MAP_MARGINS
+        return QRectF(left, top, self.width() - left - right, self.height() - top - bottom)
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), self.palette().window())
+        rect = self.map_rect()
+        if self.image is None or rect.width() <= 0 or rect.height() <= 0:
+            painter.drawText(self.rect(), Qt.AlignCenter, "Нет данных")
+            return
+
+        # Старые отсчеты (от head до конца буфера), затем новые (от начала до head)
+        cores = self.image.height()
+        column_width = rect.width() / self.history
+        older = self.history - self.head
+        painter.drawImage(QRectF(rect.left(), rect.top(), older * column_width, rect.height()),
+                          self.image, QRectF(self.head, 0, older, cores))
+        if self.head:
+            painter.drawImage(QRectF(rect.left() + older * column_width, rect.top(), self.head * column_width,
+                                     rect.height()), self.image, QRectF(0, 0, self.head, cores))
+
+        # Подписи: номера первого и последнего ядра, ось времени
+        painter.setFont(QFont("Segoe UI", 8))
+        painter.setPen(Qt.black)
+        left = MAP_MARGINS[0]
+        painter.drawText(QRectF(0, rect.top(), left - 4, 14), Qt.AlignRight | Qt.AlignTop, "1")
+        painter.drawText(QRectF(0, rect.bottom() - 14, left - 4, 14), Qt.AlignRight | Qt.AlignBottom, str(cores))
+        painter.drawText(QRectF(rect.left(), rect.bottom(), rect.width(), MAP_MARGINS[3]), Qt.AlignCenter, "Время")
+        painter.drawRect(rect)
+
+    def event(self, event):
+        # Подсказка с загрузкой ядра под курсором
+        if event.type() == QEvent.ToolTip:
+            rect = self.map_rect()
+            if self.buffer is not None and rect.contains(event.pos()):
+                core = min(int((event.pos().y() - rect.top()) * self.buffer.shape[0] / rect.height()),
+                           self.buffer.shape[0] - 1)
+                column = int((event.pos().x() - rect.left()) * self.history / rect.width())
+                value = self.buffer[core, (self.head + min(column, self.history - 1)) % self.history]
+                text = f"Ядро {core + 1}: " + ("нет данных" if value == NO_DATA else f"{value}%")
+                QToolTip.showText(event.globalPos(), text, self)
+            else:
+                QToolTip.hideText()
+                event.ignore()
+            return True
+        return super().event(event)
+
+class CoreHeatmap(QFrame):
+    """Тепловая карта загрузки ядер со сводкой по последнему отсчету"""
+
+    def __init__(self, title, history=DEFAULT_HISTORY):
+        super().__init__()
+        self.setFrameShape(QFrame.StyledPanel)
+        self.setFrameShadow(QFrame.Raised)
+
+        layout = QVBoxLayout(self)
+
+        # Заголовок
+        title_label = QLabel(title)
+        title_label.setFont(QFont("Segoe UI", 10, QFont.Bold))
+        title_label.setAlignment(Qt.AlignCenter)
+        layout.addWidget(title_label)
+
+        self.plot = CoreHeatmapPlot(history)
+        layout.addWidget(self.plot)
+
+        self.summary_label = QLabel("Выполните сканирование для получения информации")
+        self.summary_label.setAlignment(Qt.AlignCenter)
+        layout.addWidget(self.summary_label)
+
+    def add_sample(self, core_usage):
+        """Запись отсчета загрузки ядер"""
+        self.plot.add_sample(core_usage)
+
+    def update_summary(self):
+        """Сводка по последнему отсчету: число ядер, средняя и максимальная загрузка"""
+        latest = self.plot.latest()
+        if latest is None:
+            return
+        busiest = int(latest.argmax())
+        self.summary_label.setText(f"Ядер: {len(latest)}, средняя: {latest.mean():.0f}%, "
+                                   f"максимальная: {latest[busiest]}% (ядро {busiest + 1})")
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Отложенное обновление скрытых вкладок
+
+Вкладка сохраняет ссылку на последние данные и флаг устаревания, а
+отрисовывает их, только когда она видна: сразу при поступлении данных
+или при следующем показе. Обновление скрытой вкладки сводится к
+присваиванию двух атрибутов.
+"""
+
+class DeferredUpdateMixin:
+    """Примесь для вкладок QWidget
+
+    Класс вкладки должен определить метод render_info(info), выполняющий
+    отрисовку данных. Примесь указывается в списке базовых классов перед
+    QWidget, чтобы перехватывать showEvent.
+    """
+
+    # Последние полученные данные и признак того, что они не отрисованы
+    pending_info = None
+    info_dirty = False
+
+    def update_info(self, info):
+        """Сохранение данных; отрисовка, если вкладка видна"""
+        self.pending_info = info
+        self.info_dirty = True
+        if self.isVisible():
+            self.flush_info()
+
+    def flush_info(self):
+        """Отрисовка устаревших данных"""
+        if not self.info_dirty:
+            return
+        self.info_dirty = False
+        self.render_info(self.pending_info)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.flush_info()
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Таблица строк снимка состояния на основе модели Qt
+
+Модель ссылается на словари строк из результатов сканирования, а не
+создает элемент таблицы на каждую ячейку. При обновлении строки
+сопоставляются по ключу (имени интерфейса, устройству, слоту): для
+совпавших строк сигнал dataChanged отправляется только по изменившимся
+ячейкам, исчезнувшие строки удаляются, новые добавляются в конец.
+Сортировка и фильтрация выполняются QSortFilterProxyModel, который
+хранит только отображение номеров строк.
+"""
+
+from collections import namedtuple
+
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLineEdit, QTableView, QHeaderView, QAbstractItemView
+from PyQt5.QtGui import QColor
+from PyQt5.QtCore import Qt, QAbstractTableModel, QSortFilterProxyModel, QModelIndex, QVariant
+
+# Роль данных для сортировки: исходное значение вместо текста ячейки
+SORT_ROLE = Qt.UserRole
+
+# Столбец таблицы: заголовок, текст ячейки по строке, цвет текста по строке
+# (или None) и значение для сортировки по строке (или None - сортировка по тексту)
+TableColumn = namedtuple('TableColumn', ['title', 'text', 'color', 'sort_value'], defaults=[None, None])
+
+_colors = {}
+
+def cached_color(name):
+    """QColor по имени без создания объекта при каждом запросе"""
+    color = _colors.get(name)
+    if color is None:
+        color = _colors[name] = QColor(name)
+    return color
+
+def numeric(value):
+    """Числовое значение для сортировки; нечисловые значения идут первыми"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return -1.0
+
+class SnapshotTableModel(QAbstractTableModel):
+    """Модель таблицы над списком словарей из снимка состояния"""
+
+    def __init__(self, columns, key, parent=None):
+        super().__init__(parent)
+        self.columns = columns
+        self.key = key
+        self.rows = []
+        self.texts = []
+        self.keys = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.columns)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.columns[section].title
+        return QVariant()
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return QVariant()
+        row, column = index.row(), self.columns[index.column()]
+        if role == Qt.DisplayRole:
+            return self.texts[row][index.column()]
+        if role == Qt.ForegroundRole and column.color is not None:
+            color = column.color(self.rows[row])
+            return cached_color(color) if color else QVariant()
+        if role == SORT_ROLE:
+            if column.sort_value is not None:
+                return column.sort_value(self.rows[row])
+            return self.texts[row][index.column()]
+        return QVariant()
+
+    def row_texts(self, row):
+        """Тексты ячеек строки"""
+        return [column.text(row) for column in self.columns]
+
+    def set_rows(self, rows):
+        """Обновление модели новым снимком строк"""
+        # Повторяющиеся ключи различаются номером повторения
+        occurrences = {}
+        new_keys = []
+        for row in rows:
+            key = self.key(row)
+            occurrences[key] = occurrences.get(key, 0) + 1
+            new_keys.append((key, occurrences[key]))
+        positions = {key: i for i, key in enumerate(new_keys)}
+
+        # Удаление исчезнувших строк диапазонами с конца
+        removed = [i for i, key in enumerate(self.keys) if key not in positions]
+        while removed:
+            last = first = removed.pop()
+            while removed and removed[-1] == first - 1:
+                first = removed.pop()
+            self.beginRemoveRows(QModelIndex(), first, last)
+            del self.rows[first:last + 1]
+            del self.texts[first:last + 1]
+            del self.keys[first:last + 1]
+            self.endRemoveRows()
+
+        # Обновление оставшихся строк: сигнал только по изменившимся ячейкам
+        for i, key in enumerate(self.keys):
+            row = rows[positions[key]]
+            self.rows[i] = row
+            texts = self.row_texts(row)
+            changed = [c for c, (old, new) in enumerate(zip(self.texts[i], texts)) if old != new]
+            self.texts[i] = texts
+            if changed:
+                self.dataChanged.emit(self.index(i, changed[0]), self.index(i, changed[-1]))
+
+        # Добавление новых строк в конец
+        existing = set(self.keys)
+        added = [i for i, key in enumerate(new_keys) if key not in existing]
+        if added:
+            self.beginInsertRows(QModelIndex(), len(self.rows), len(self.rows) + len(added) - 1)
+            for i in added:
+                self.rows.append(rows[i])
+                self.texts.append(self.row_texts(rows[i]))
+                self.keys.append(new_keys[i])
+            self.endInsertRows()
+
+class SnapshotTable(QWidget):
+    """Таблица с сортировкой по столбцам и необязательным полем фильтра"""
+
+    def __init__(self, columns, key, filter_placeholder=None, parent=None):
+        super().__init__(parent)
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        self.model = SnapshotTableModel(columns, key, self)
+        self.proxy = QSortFilterProxyModel(self)
+        self.proxy.setSourceModel(self.model)
+        self.proxy.setSortRole(SORT_ROLE)
+        self.proxy.setFilterCaseSensitivity(Qt.CaseInsensitive)
+        self.proxy.setFilterKeyColumn(-1)
+
+        if filter_placeholder:
+            self.filter_edit = QLineEdit()
+            self.filter_edit.setPlaceholderText(filter_placeholder)
+            self.filter_edit.setClearButtonEnabled(True)
+            self.filter_edit.textChanged.connect(self.proxy.setFilterFixedString)
+            layout.addWidget(self.filter_edit)
+
+        self.view = QTableView()
+        self.view.setModel(self.proxy)
+        self.view.setSortingEnabled(True)
+        self.view.sortByColumn(-1, Qt.AscendingOrder)
+        self.view.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.view.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.view.verticalHeader().setDefaultSectionSize(22)
+        self.view.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        layout.addWidget(self.view)
+
+    def set_rows(self, rows):
+        """Обновление строк таблицы"""
+        self.model.set_rows(rows)
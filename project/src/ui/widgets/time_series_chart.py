@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Легковесный график временных рядов, отрисовываемый QPainter
+
+Не требует matplotlib: ряды хранятся в массивах NumPy и выводятся
+ломаной QPolygonF. Длинная история прореживается до ширины графика
+в пикселях алгоритмом LTTB с сохранением пиков (см. downsampling.py);
+прореженный ряд кэшируется до изменения данных или масштаба.
+"""
+
+import math
+
+import numpy as np
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel, QFrame
+from PyQt5.QtGui import QFont, QColor, QPainter, QPen, QPolygonF
+from PyQt5.QtCore import Qt, QPointF, QRectF, QSize
+
+from src.utils.downsampling import DownsamplingCache
+
+# Число точек, отображаемых при короткой истории
+DEFAULT_WINDOW = 60
+
+# Нижняя граница верхнего предела оси Y
+MIN_Y_LIMIT = 100
+
+# Цвета рядов по порядку добавления
+SERIES_COLORS = ['#0000ff', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd']
+
+# Число делений оси Y
+Y_TICKS = 5
+
+# Отступы области построения: слева, сверху, справа, снизу
+PLOT_MARGINS = (44, 20, 10, 24)
+
+def nice_ceil(value):
+    """Ближайшее сверху число вида 1, 2, 5 x 10^k"""
+    if value <= 0:
+        return 0
+    magnitude = 10 ** math.floor(math.log10(value))
+    for step in (1, 2, 5, 10):
+        if value <= step * magnitude:
+            return step * magnitude
+    return 10 * magnitude
+
+def polygon_from_arrays(x, y):
+    """QPolygonF из массивов координат без создания QPointF для каждой точки"""
+    count = len(x)
+    polygon = QPolygonF(count)
+    pointer = polygon.data()
+    pointer.setsize(count * 2 * np.dtype(np.float64).itemsize)
+    buffer = np.frombuffer(pointer, dtype=np.float64).reshape(count, 2)
+    buffer[:, 0] = x
+    buffer[:, 1] = y
+    return polygon
+
+class TimeSeriesPlot(QWidget):
+    """Область построения рядов"""
+
+    def __init__(self, unit, window=DEFAULT_WINDOW, min_y_limit=MIN_Y_LIMIT, parent=None):
+        super().__init__(parent)
+        self.unit = unit
+        self.window = window
+        self.min_y_limit = min_y_limit
+        self.y_limit = min_y_limit
+        # Ряды: {имя: (значения, цвет)} в порядке добавления
+        self.series = {}
+        # Номера версий рядов для кэша прореживания
+        self.versions = {}
+        self.downsampling = DownsamplingCache()
+        self.setMinimumHeight(150)
+        self.setAttribute(Qt.WA_OpaquePaintEvent)
+
+    def sizeHint(self):
+        return QSize(500, 250)
+
+    def set_series(self, name, values, color=None):
+        """Замена значений ряда; ось Y масштабируется по всем рядам"""
+        if color is None:
+            color = self.series[name][1] if name in self.series else \
+                QColor(SERIES_COLORS[len(self.series) % len(SERIES_COLORS)])
+        self.series[name] = (np.asarray(values, dtype=np.float64), QColor(color))
+        self.versions[name] = self.versions.get(name, 0) + 1
+
+        # Пропуски (None, NaN) и бесконечности не влияют на масштаб
+        maxima = [values[np.isfinite(values)].max() for values, _ in self.series.values()
+                  if np.isfinite(values).any()]
+        maximum = max(maxima, default=0)
+        self.y_limit = max(self.min_y_limit, nice_ceil(maximum * 1.1))
+        self.update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), Qt.white)
+
+        left, top, right, bottom = PLOT_MARGINS
+        plot = QRectF(left, top, self.width() - left - right, self.height() - top - bottom)
+        if plot.width() <= 0 or plot.height() <= 0:
+            return
+
+        # Сетка и подписи оси Y
+        painter.setFont(QFont("Segoe UI", 8))
+        grid_pen = QPen(QColor('#b0b0b0'), 1, Qt.DashLine)
+        for tick in range(Y_TICKS + 1):
+            value = self.y_limit * tick / Y_TICKS
+            y = plot.bottom() - plot.height() * tick / Y_TICKS
+            painter.setPen(grid_pen)
+            painter.drawLine(QPointF(plot.left(), y), QPointF(plot.right(), y))
+            painter.setPen(Qt.black)
+            painter.drawText(QRectF(0, y - 8, left - 4, 16), Qt.AlignRight | Qt.AlignVCenter, f"{value:g}")
+        painter.drawRect(plot)
+        painter.drawText(QRectF(0, 0, left + 40, top - 6), Qt.AlignLeft | Qt.AlignVCenter, self.unit)
+        painter.drawText(QRectF(plot.left(), plot.bottom(), plot.width(), bottom), Qt.AlignCenter, "Время")
+
+        # Ряды: новые значения у правого края, общий масштаб времени
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setClipRect(plot)
+        columns = max(1, int(plot.width()))
+        span = max([self.window] + [len(values) for values, _ in self.series.values()]) - 1 or 1
+        for name, (values, color) in self.series.items():
+            if len(values) == 0:
+                continue
+            indices, decimated = self.downsampling.downsample(
+                name, np.arange(len(values), dtype=np.float64), values, columns, version=self.versions[name])
+            x = plot.right() - (len(values) - 1 - indices) * plot.width() / span
+            y = plot.bottom() - np.clip(decimated, 0, self.y_limit) * plot.height() / self.y_limit
+            # Толстое перо со сглаживанием строится через QPainterPathStroker
+            # и на порядки медленнее; косметическое перо толщиной 1 рисуется напрямую
+            pen = QPen(color, 1)
+            pen.setCosmetic(True)
+            painter.setPen(pen)
+            # Линия прерывается на пропусках значений
+            finite = np.isfinite(y)
+            if finite.all():
+                painter.drawPolyline(polygon_from_arrays(x, y))
+                continue
+            edges = np.flatnonzero(np.diff(np.concatenate(([False], finite, [False])).astype(np.int8)))
+            for start, end in zip(edges[0::2], edges[1::2]):
+                painter.drawPolyline(polygon_from_arrays(x[start:end], y[start:end]))
+
+        # Легенда при нескольких рядах
+        if len(self.series) > 1:
+            painter.setClipping(False)
+            x = plot.left() + 6
+            for name, (_, color) in self.series.items():
+                painter.setPen(QPen(color, 2))
+                painter.drawLine(QPointF(x, plot.top() + 9), QPointF(x + 14, plot.top() + 9))
+                painter.setPen(Qt.black)
+                width = painter.fontMetrics().horizontalAdvance(name)
+                painter.drawText(QPointF(x + 18, plot.top() + 13), name)
+                x += width + 30
+
+class TimeSeriesChart(QFrame):
+    """График показателя компонента на QPainter
+
+    update_data() задает основной ряд, set_series() добавляет или
+    обновляет дополнительные ряды.
+    """
+
+    def __init__(self, title, unit, window=DEFAULT_WINDOW, min_y_limit=MIN_Y_LIMIT):
+        super().__init__()
+        self.title = title
+        self.unit = unit
+        self.setFrameShape(QFrame.StyledPanel)
+        self.setFrameShadow(QFrame.Raised)
+
+        layout = QVBoxLayout(self)
+
+        # Заголовок
+        title_label = QLabel(self.title)
+        title_label.setFont(QFont("Segoe UI", 10, QFont.Bold))
+        title_label.setAlignment(Qt.AlignCenter)
+        layout.addWidget(title_label)
+
+        self.plot = TimeSeriesPlot(unit, window, min_y_limit)
+        layout.addWidget(self.plot)
+
+    def update_data(self, data):
+        """Обновление основного ряда"""
+        if data is None or len(data) == 0:
+            return
+        self.plot.set_series(self.title, data)
+
+    def set_series(self, name, data, color=None):
+        """Обновление ряда с заданным именем"""
+        self.plot.set_series(name, data, color)
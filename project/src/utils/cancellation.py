@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Модуль для кооперативной отмены длительных операций
+"""
+
+import threading
+
+class OperationCancelledError(Exception):
+    """Операция была отменена"""
+
+class CancellationToken:
+    """Признак отмены, передаваемый в сканирование и диагностику
+
+    Операция проверяет токен между своими этапами и при переборе устройств
+    и завершается при его установке; отдельный системный вызов (например,
+    опрос раздела диска) не прерывается.
+    Метод is_set() совместим с threading.Event, поэтому токен можно передавать
+    туда, где ожидается событие отмены (например, InferenceClient.generate).
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        """Запрос отмены операции"""
+        self._event.set()
+
+    def is_set(self):
+        """Проверка, запрошена ли отмена"""
+        return self._event.is_set()
+
+    def raise_if_cancelled(self):
+        """Возбуждение OperationCancelledError при запрошенной отмене"""
+        if self._event.is_set():
+            raise OperationCancelledError("Операция отменена")
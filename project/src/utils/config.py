@@ -9,6 +9,10 @@ import os
 import json
 import logging
 
+# Модульный логгер: вызовы logging.warning() до setup_logger() добавили бы
+# обработчик корневому логгеру через basicConfig
+logger = logging.getLogger('config')
+
 def load_config(config_path):
     """Загрузка конфигурации из файла"""
     try:
@@ -16,10 +20,10 @@ def load_config(config_path):
             config = json.load(f)
         return config
     except FileNotFoundError:
-        logging.warning(f"Файл конфигурации не найден: {config_path}")
+        logger.warning("Файл конфигурации не найден: %s", config_path)
         return {}
     except json.JSONDecodeError:
-        logging.error(f"Ошибка при чтении файла конфигурации: {config_path}")
+        logger.error("Ошибка при чтении файла конфигурации: %s", config_path)
         return {}
 
 def save_config(config, config_path):
@@ -32,7 +36,7 @@ def save_config(config, config_path):
             json.dump(config, f, ensure_ascii=False, indent=4)
         return True
     except Exception as e:
-        logging.error(f"Ошибка при сохранении файла конфигурации: {str(e)}")
+        logger.error("Ошибка при сохранении файла конфигурации: %s", e)
         return False
 
 def create_default_config(config_path):
@@ -42,11 +46,36 @@ def create_default_config(config_path):
         "auto_scan_interval": 5,
         "diagnostics_detail_level": "Стандартный",
         "auto_diagnostics": True,
+        "ai_inference_mode": "fp32",
+        "ai_intra_op_threads": 0,
+        "ai_inter_op_threads": 1,
+        "ai_worker_address": "",
+        "ai_worker_autostart": True,
+        "ai_latency_budget_ms": 2000,
+        "ai_deadline_fallback": "partial",
+        "ai_issue_mode": "classify",
+        "ai_prefix_cache": True,
+        "ai_model_path": "",
+        "ai_model_sha256": "",
+        "anomaly_z_threshold": 3.5,
+        "anomaly_ewma_alpha": 0.1,
+        "multivariate_anomaly_enabled": True,
+        "anomaly_retrain_interval_min": 60,
+        "history_db_path": "",
+        "forecast_warning_days": 7,
+        "forecast_critical_hours": 24,
+        "recommendation_mode": "retrieval",
+        "recommendation_top_k": 5,
         "ui_theme": "Светлая",
         "font_size": "Средний",
+        "ui_max_fps": 20,
         "reports_path": os.path.expanduser('~/Documents'),
         "report_format": "HTML",
-        "auto_save_reports": False
+        "auto_save_reports": False,
+        "log_level": "INFO",
+        "log_max_bytes": 10485760,
+        "log_max_age_days": 7,
+        "log_backup_count": 5
     }
     
     return save_config(default_config, config_path)
\ No newline at end of file
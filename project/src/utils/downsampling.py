@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Модуль для прореживания длинных рядов перед отображением
+
+Ряд сокращается примерно до ширины графика в пикселях алгоритмом
+Largest-Triangle-Three-Buckets (LTTB): точки делятся на корзины, и из
+каждой выбирается точка, образующая наибольший треугольник с выбранной
+точкой предыдущей корзины и средним следующей. Так сохраняются пики и
+провалы, которые теряются при усреднении.
+
+Результат кэшируется для каждого уровня детализации (степени двойки
+числа отсчетов на пиксель) по всему ряду, поэтому сдвиг видимого окна
+без изменения масштаба сводится к двоичному поиску границ окна.
+"""
+
+import math
+from collections import OrderedDict
+
+import numpy as np
+
+# Минимальное число точек результата: первая, последняя и одна корзина
+MIN_THRESHOLD = 3
+
+# Размер корзины, начиная с которого корзины обрабатываются по очереди:
+# при крупных корзинах цикл короткий, а каждый проход по всем корзинам
+# обходит весь ряд
+SEQUENTIAL_BUCKET_SIZE = 256
+
+# Число хранимых в кэше прореженных рядов
+DEFAULT_CACHE_SIZE = 32
+
+def lttb_indices(x, y, threshold):
+    """Индексы точек ряда, выбранных LTTB
+
+    Пропуски (NaN и бесконечности в x или y) не участвуют в выборе:
+    каждый непрерывный участок конечных значений прореживается отдельно,
+    получая долю threshold по своей длине, а от каждого пропуска
+    сохраняется первый отсчет, чтобы линия графика по-прежнему
+    прерывалась на нем. Ряд из множества коротких участков поэтому
+    может сократиться меньше, чем до threshold точек.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    threshold = max(int(threshold), MIN_THRESHOLD)
+    if n <= threshold:
+        return np.arange(n)
+    finite = np.isfinite(x) & np.isfinite(y)
+    if finite.all():
+        return lttb_finite_indices(x, y, threshold)
+
+    # Границы участков конечных значений и первые отсчеты пропусков
+    edges = np.flatnonzero(np.diff(np.concatenate(([False], finite, [False])).astype(np.int8)))
+    gaps = np.flatnonzero(~finite & np.concatenate(([True], finite[:-1])))
+    budget = max(threshold - len(gaps), 0)
+    total = len(y) - np.count_nonzero(~finite)
+    parts = [gaps]
+    for start, end in zip(edges[0::2], edges[1::2]):
+        points = max(round(budget * (end - start) / total), MIN_THRESHOLD)
+        if end - start <= points:
+            parts.append(np.arange(start, end))
+        else:
+            parts.append(start + lttb_finite_indices(x[start:end], y[start:end], points))
+    return np.sort(np.concatenate(parts))
+
+def lttb_finite_indices(x, y, threshold):
+    """Индексы точек ряда без пропусков, выбранных LTTB
+
+    Точное LTTB выбирает точки последовательно: вершина треугольника -
+    точка, выбранная в предыдущей корзине. При мелких корзинах все они
+    обрабатываются одновременно: первый проход берет вершиной среднее
+    предыдущей корзины, следующие пересчитывают только корзины, у
+    которых изменилась выбранная точка предыдущей. Проходы повторяются,
+    пока выбор не перестанет меняться, и результат совпадает с
+    последовательным алгоритмом. Крупные корзины (от
+    SEQUENTIAL_BUCKET_SIZE отсчетов) обрабатываются по очереди.
+    """
+    n = len(y)
+    if n <= threshold:
+        return np.arange(n)
+
+    # Корзины по отсчетам 1..n-2; первый и последний отсчеты сохраняются всегда
+    buckets = threshold - 2
+    edges = np.linspace(1, n - 1, buckets + 1).astype(np.int64)
+    starts, ends = edges[:-1], edges[1:]
+    sizes = ends - starts
+
+    # Средние корзин; для последней корзины следующая точка - последний отсчет
+    mean_x = np.add.reduceat(x[1:n - 1], starts - 1) / sizes
+    mean_y = np.add.reduceat(y[1:n - 1], starts - 1) / sizes
+    next_x = np.append(mean_x[1:], x[n - 1])
+    next_y = np.append(mean_y[1:], y[n - 1])
+
+    if (n - 2) / buckets >= SEQUENTIAL_BUCKET_SIZE:
+        selected = np.empty(buckets, dtype=np.int64)
+        anchor = 0
+        for i in range(buckets):
+            start, end = starts[i], ends[i]
+            area = np.abs((x[anchor] - next_x[i]) * (y[start:end] - y[anchor])
+                          - (x[anchor] - x[start:end]) * (next_y[i] - y[anchor]))
+            anchor = selected[i] = start + area.argmax()
+        return np.concatenate(([0], selected, [n - 1]))
+
+    # Матрица индексов корзин, дополненная до размера наибольшей корзины
+    offsets = np.arange(sizes.max())
+    indices = starts[:, None] + offsets
+    padding = offsets >= sizes[:, None]
+    indices[padding] = np.broadcast_to(starts[:, None], indices.shape)[padding]
+    px, py = x[indices], y[indices]
+
+    def select(rows, anchor_x, anchor_y):
+        # Удвоенная площадь треугольника (вершина, точка корзины, среднее
+        # следующей) как линейная функция координат точки: |a*py + b*px + c|
+        a = anchor_x - next_x[rows]
+        b = next_y[rows] - anchor_y
+        c = -a * anchor_y - b * anchor_x
+        area = np.abs(a[:, None] * py[rows] + b[:, None] * px[rows] + c[:, None])
+        area[padding[rows]] = -1.0
+        return indices[rows, area.argmax(axis=1)]
+
+    rows = np.arange(buckets)
+    selected = select(rows, np.append(x[0], mean_x[:-1]), np.append(y[0], mean_y[:-1]))
+    while True:
+        # Корзины, следующие за корзинами с изменившимся выбором
+        rows = rows[rows < buckets - 1] + 1
+        if not len(rows):
+            break
+        anchors = selected[rows - 1]
+        update = select(rows, x[anchors], y[anchors])
+        changed = update != selected[rows]
+        selected[rows] = update
+        rows = rows[changed]
+    return np.concatenate(([0], selected, [n - 1]))
+
+def lttb(x, y, threshold):
+    """Прореживание ряда LTTB до threshold точек; возвращает пару массивов (x, y)"""
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    indices = lttb_indices(x, y, threshold)
+    return x[indices], y[indices]
+
+class DownsamplingCache:
+    """Кэш прореженных рядов по уровням детализации
+
+    Уровень L соответствует 2^L отсчетам ряда на точку результата. Ряд
+    прореживается целиком, а видимое окно вырезается из результата,
+    поэтому при сдвиге окна прореживание не повторяется. Запись кэша
+    сбрасывается, если изменилась версия ряда, его длина или граничные
+    значения.
+    """
+
+    def __init__(self, max_entries=DEFAULT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def level(visible_count, width):
+        """Уровень детализации для visible_count отсчетов на width пикселей"""
+        if width <= 0 or visible_count <= width:
+            return 0
+        return math.ceil(math.log2(visible_count / width))
+
+    @staticmethod
+    def signature(x, y, version=None):
+        """Признак версии ряда: номер версии, длина и граничные значения
+
+        Пропуск на границе записывается как None: NaN не равен самому себе,
+        и запись кэша с ним никогда бы не совпала.
+        """
+        bounds = (float(x[0]), float(x[-1]), float(y[0]), float(y[-1]))
+        return (version, len(y)) + tuple(value if math.isfinite(value) else None for value in bounds)
+
+    def downsample(self, key, x, y, width, start=None, end=None, version=None):
+        """Прореженная часть ряда key между start и end по оси X
+
+        width - ширина области построения в пикселях. version - номер
+        версии ряда, который владелец ряда меняет при замене данных.
+        Возвращает пару массивов (x, y), включая по одной точке за
+        границами окна, чтобы линия доходила до краев.
+        """
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        if len(y) == 0:
+            return x, y
+        start = x[0] if start is None else start
+        end = x[-1] if end is None else end
+        first, last = np.searchsorted(x, [start, end])
+        level = self.level(last - first, width)
+        if level == 0:
+            window = slice(max(first - 1, 0), min(last + 1, len(y)))
+            return x[window], y[window]
+
+        cache_key = (key, level)
+        signature = self.signature(x, y, version)
+        entry = self.entries.get(cache_key)
+        if entry is not None and entry[0] == signature:
+            self.hits += 1
+            self.entries.move_to_end(cache_key)
+            reduced_x, reduced_y = entry[1], entry[2]
+        else:
+            self.misses += 1
+            reduced_x, reduced_y = lttb(x, y, math.ceil(len(y) / 2 ** level) + 2)
+            self.entries[cache_key] = (signature, reduced_x, reduced_y)
+            self.entries.move_to_end(cache_key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+        first, last = np.searchsorted(reduced_x, [start, end])
+        window = slice(max(first - 1, 0), min(last + 1, len(reduced_y)))
+        return reduced_x[window], reduced_y[window]
+
+    def clear(self, key=None):
+        """Сброс кэша ряда key или всего кэша"""
+        if key is None:
+            self.entries.clear()
+            return
+        for cache_key in [cache_key for cache_key in self.entries if cache_key[0] == key]:
+            del self.entries[cache_key]
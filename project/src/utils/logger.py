@@ -3,41 +3,147 @@
 
 """
 Модуль для настройки логирования
+
+Обработчики устанавливаются один раз на корневой логгер. Потоки приложения
+(интерфейс, сканер, диагностика) только помещают записи в очередь, а запись
+в файл и консоль выполняет фоновый поток QueueListener. Файл лога
+ротируется по размеру и по возрасту.
+
+Сообщения передаются в формате %-подстановок (logger.debug("... %s", x)):
+строка формируется только для записей, прошедших фильтр уровня, и, если
+аргументы неизменяемые, уже в фоновом потоке.
 """
 
 import os
+import copy
+import time
+import queue
+import atexit
 import logging
-from datetime import datetime
-
-def setup_logger():
-    """Настройка логирования"""
-    # Создание директории для логов, если она не существует
-    logs_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'logs')
-    if not os.path.exists(logs_dir):
-        os.makedirs(logs_dir)
-        
-    # Имя файла лога с датой и временем
-    log_file = os.path.join(logs_dir, f"app_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log")
-    
-    # Настройка логирования
-    logger = logging.getLogger('pc_hardware_diagnostics')
-    logger.setLevel(logging.INFO)
-    
-    # Обработчик для записи в файл
-    file_handler = logging.FileHandler(log_file)
-    file_handler.setLevel(logging.INFO)
-    
-    # Обработчик для вывода в консоль
-    console_handler = logging.StreamHandler()
-    console_handler.setLevel(logging.INFO)
-    
-    # Формат сообщений
-    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-    file_handler.setFormatter(formatter)
-    console_handler.setFormatter(formatter)
-    
-    # Добавление обработчиков
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
-    
-    return logger
\ No newline at end of file
+import threading
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+# Имя логгера приложения
+APP_LOGGER_NAME = 'pc_hardware_diagnostics'
+
+# Формат сообщений
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(threadName)s - %(message)s'
+
+# Параметры ротации по умолчанию
+DEFAULT_LOG_MAX_BYTES = 10 * 1024 * 1024
+DEFAULT_LOG_MAX_AGE_DAYS = 7
+DEFAULT_LOG_BACKUP_COUNT = 5
+
+# Типы аргументов сообщения, которые можно форматировать в другом потоке
+IMMUTABLE_ARG_TYPES = (str, int, float, bool, bytes, type(None))
+
+_listener = None
+_queue_handler = None
+_lock = threading.Lock()
+
+def logs_dir():
+    """Каталог логов приложения"""
+    return os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'logs')
+
+class SizeAndAgeRotatingFileHandler(RotatingFileHandler):
+    """Файл лога, ротируемый при превышении размера или возраста"""
+
+    def __init__(self, filename, max_bytes=DEFAULT_LOG_MAX_BYTES, max_age_seconds=DEFAULT_LOG_MAX_AGE_DAYS * 86400,
+                 backup_count=DEFAULT_LOG_BACKUP_COUNT):
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8')
+        self.max_age_seconds = max_age_seconds
+        self.opened_at = self.first_record_time()
+
+    def first_record_time(self):
+        """Время первой записи файла, в том числе сделанной в прошлом запуске"""
+        try:
+            with open(self.baseFilename, 'r', encoding='utf-8') as f:
+                return time.mktime(time.strptime(f.readline()[:19], '%Y-%m-%d %H:%M:%S'))
+        except (OSError, ValueError):
+            return time.time()
+
+    def shouldRollover(self, record):
+        """Ротация по размеру или по возрасту файла"""
+        if self.max_age_seconds and time.time() - self.opened_at >= self.max_age_seconds:
+            return True
+        return super().shouldRollover(record)
+
+    def doRollover(self):
+        """Ротация с обновлением времени создания файла"""
+        super().doRollover()
+        self.opened_at = time.time()
+
+class DeferredQueueHandler(QueueHandler):
+    """Передача записей в очередь без форматирования в вызывающем потоке
+
+    Стандартный QueueHandler формирует текст сообщения до помещения в
+    очередь. Здесь очередь не покидает процесс, поэтому запись передается
+    как есть, а сообщение формирует поток QueueListener. Если среди
+    аргументов есть изменяемые объекты (списки, словари), сообщение
+    формируется сразу: вызывающий поток может изменить их до форматирования.
+    """
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        args = record.args if isinstance(record.args, tuple) else (record.args,)
+        if not all(isinstance(arg, IMMUTABLE_ARG_TYPES) for arg in args):
+            record.msg = record.getMessage()
+            record.args = None
+        return record
+
+def setup_logger(config=None, filename='app.log'):
+    """Настройка логирования приложения
+
+    Повторные вызовы не добавляют обработчиков и возвращают логгер
+    приложения. config - необязательные настройки (log_level,
+    log_max_bytes, log_max_age_days, log_backup_count). filename - имя файла
+    в каталоге логов; отдельные процессы (например, процесс инференса)
+    используют собственный файл, чтобы не ротировать чужой.
+    """
+    global _listener, _queue_handler
+
+    config = config or {}
+    with _lock:
+        if _listener is None:
+            os.makedirs(logs_dir(), exist_ok=True)
+            formatter = logging.Formatter(LOG_FORMAT)
+
+            # Обработчик для записи в файл
+            file_handler = SizeAndAgeRotatingFileHandler(
+                os.path.join(logs_dir(), filename),
+                max_bytes=config.get('log_max_bytes', DEFAULT_LOG_MAX_BYTES),
+                max_age_seconds=config.get('log_max_age_days', DEFAULT_LOG_MAX_AGE_DAYS) * 86400,
+                backup_count=config.get('log_backup_count', DEFAULT_LOG_BACKUP_COUNT)
+            )
+            file_handler.setFormatter(formatter)
+
+            # Обработчик для вывода в консоль
+            console_handler = logging.StreamHandler()
+            console_handler.setLevel(logging.INFO)
+            console_handler.setFormatter(formatter)
+
+            # Вызывающие потоки только помещают запись в очередь
+            log_queue = queue.SimpleQueue()
+            root = logging.getLogger()
+            root.setLevel(config.get('log_level', 'INFO'))
+            _queue_handler = DeferredQueueHandler(log_queue)
+            root.addHandler(_queue_handler)
+
+            _listener = QueueListener(log_queue, file_handler, console_handler, respect_handler_level=True)
+            _listener.start()
+            atexit.register(shutdown_logger)
+
+    return logging.getLogger(APP_LOGGER_NAME)
+
+def shutdown_logger():
+    """Запись оставшихся в очереди сообщений и остановка фонового потока"""
+    global _listener, _queue_handler
+
+    with _lock:
+        if _listener is not None:
+            logging.getLogger().removeHandler(_queue_handler)
+            _listener.stop()
+            for handler in _listener.handlers:
+                handler.close()
+            _listener = None
+            _queue_handler = None
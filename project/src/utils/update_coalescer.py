@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Модуль для объединения частых обновлений интерфейса
+
+Снимки состояния могут поступать чаще, чем интерфейс успевает их
+отрисовать. UpdateCoalescer хранит только последний полученный снимок
+и применяет его не чаще заданной частоты кадров; промежуточные снимки
+отбрасываются. Если применение снимка длится дольше кадра или цикл
+событий запаздывает, следующий кадр переносится, а пропущенные кадры
+учитываются в счетчиках.
+"""
+
+import time
+
+from PyQt5.QtCore import QObject, QTimer, pyqtSlot
+
+# Частота кадров по умолчанию и допустимые границы
+DEFAULT_MAX_FPS = 20
+MIN_FPS = 1
+MAX_FPS = 60
+
+class UpdateCoalescer(QObject):
+    """Применение последнего снимка состояния с ограничением частоты кадров
+
+    submit() вызывается в потоке интерфейса; сигнал фонового потока можно
+    подключить к нему напрямую (соединение будет поставлено в очередь).
+    """
+
+    def __init__(self, apply_callback, max_fps=DEFAULT_MAX_FPS, parent=None):
+        super().__init__(parent)
+        self.apply_callback = apply_callback
+        self.frame_interval = 1.0 / max(MIN_FPS, min(MAX_FPS, max_fps))
+
+        self.pending = None
+        self.has_pending = False
+        # Время, раньше которого следующий кадр не применяется
+        self.next_frame_at = 0.0
+        # Время, на которое был запланирован текущий кадр
+        self.scheduled_at = None
+
+        # Счетчики: получено, применено, объединено (отброшено) снимков,
+        # пропущено кадров из-за запаздывания
+        self.received = 0
+        self.applied = 0
+        self.coalesced = 0
+        self.skipped_frames = 0
+
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.flush)
+
+    @pyqtSlot(object)
+    def submit(self, snapshot):
+        """Прием снимка; применяется только последний снимок кадра"""
+        self.received += 1
+        if self.has_pending:
+            self.coalesced += 1
+        self.pending = snapshot
+        self.has_pending = True
+
+        if not self.timer.isActive():
+            now = time.monotonic()
+            self.scheduled_at = max(now, self.next_frame_at)
+            self.timer.start(int((self.scheduled_at - now) * 1000))
+
+    def flush(self):
+        """Применение ожидающего снимка"""
+        if not self.has_pending:
+            return
+        snapshot = self.pending
+        self.pending = None
+        self.has_pending = False
+
+        # Кадры, пропущенные из-за запаздывания цикла событий
+        start = time.monotonic()
+        if self.scheduled_at is not None:
+            self.skipped_frames += int((start - self.scheduled_at) / self.frame_interval)
+            self.scheduled_at = None
+
+        self.apply_callback(snapshot)
+        self.applied += 1
+
+        # Применение дольше кадра сдвигает следующий кадр; перекрытые кадры пропускаются
+        duration = time.monotonic() - start
+        self.skipped_frames += int(duration / self.frame_interval)
+        self.next_frame_at = start + max(self.frame_interval, duration)
+
+    def stats(self):
+        """Счетчики обновлений"""
+        return {
+            'received': self.received,
+            'applied': self.applied,
+            'coalesced': self.coalesced,
+            'skipped_frames': self.skipped_frames
+        }